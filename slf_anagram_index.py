@@ -0,0 +1,109 @@
+"""
+Sub-anagram index for decoding up/down letter pools.
+
+Words are grouped by their sorted-letter key (the letter multiset) and the
+keys are stored in a trie. Walking the trie with the remaining letter counts
+of a pool skips every branch that needs a letter the pool no longer has, so
+only spellable keys are ever visited.
+"""
+
+from __future__ import annotations
+from collections import Counter
+
+
+class AnagramIndex:
+    def __init__(self, words: list[str], min_len: int = 1):
+        self.source = words
+        self.min_len = min_len
+        self.groups: dict[str, list[str]] = {}
+        for w in words:
+            if len(w) < min_len or not w.isalpha():
+                continue
+            self.groups.setdefault("".join(sorted(w)), []).append(w)
+        self.trie: dict = {}
+        for key in self.groups:
+            node = self.trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[None] = key
+
+    def _walk(self, node: dict, counts: Counter, out: list[str]):
+        for ch, child in node.items():
+            if ch is None:
+                out.append(child)
+            elif counts[ch] > 0:
+                counts[ch] -= 1
+                self._walk(child, counts, out)
+                counts[ch] += 1
+
+    def sub_keys(self, pool: str) -> list[str]:
+        """All multiset keys spellable from pool, longest first."""
+        out: list[str] = []
+        self._walk(self.trie, Counter(c for c in pool.lower() if c.isalpha()), out)
+        out.sort(key=lambda k: (-len(k), k))
+        return out
+
+    def words(self, pool: str, limit: int | None = None) -> list[str]:
+        """Every indexed word spellable from the letters of pool."""
+        found: list[str] = []
+        for key in self.sub_keys(pool):
+            found.extend(self.groups[key])
+            if limit and len(found) >= limit:
+                return found[:limit]
+        return found
+
+    def phrases(self, pool: str, max_words: int = 3, limit: int = 100) -> list[list[str]]:
+        """Multi-word phrases using every letter of pool exactly once.
+
+        Keys are combined in non-increasing order so each phrase is produced
+        once, and the candidate key list shrinks at each level to the keys that
+        still fit the remaining letters.
+        """
+        letters = Counter(c for c in pool.lower() if c.isalpha())
+        keys = self.sub_keys(pool)
+        need = {k: Counter(k) for k in keys}
+        rank = {k: i for i, k in enumerate(keys)}
+        results: list[list[str]] = []
+        if not letters:
+            return results
+
+        def fits(key: str, counts: Counter) -> bool:
+            return all(counts[c] >= n for c, n in need[key].items())
+
+        def expand(chosen: list[str]) -> list[list[str]]:
+            combos: list[list[str]] = [[]]
+            for key in chosen:
+                combos = [c + [w] for c in combos for w in self.groups[key]]
+            return combos
+
+        def search(cands: list[str], counts: Counter, remaining: int, chosen: list[str]):
+            if remaining == 0:
+                for phrase in expand(chosen):
+                    results.append(phrase)
+                    if len(results) >= limit:
+                        return
+                return
+            slots = max_words - len(chosen)
+            if slots <= 0:
+                return
+            if slots == 1:
+                # The last word must consume everything that is left
+                key = "".join(sorted(counts.elements()))
+                if key in rank and (not chosen or rank[key] >= rank[chosen[-1]]):
+                    search([], counts, 0, chosen + [key])
+                return
+            for i, key in enumerate(cands):
+                # Keys are longest first: once the remaining slots cannot hold
+                # the remaining letters, no later key can either
+                if len(key) * slots < remaining:
+                    break
+                counts.subtract(need[key])
+                left = remaining - len(key)
+                narrowed = [k for k in cands[i:] if len(k) <= left and fits(k, counts)]
+                search(narrowed, counts, left, chosen + [key])
+                counts.update(need[key])
+                if len(results) >= limit:
+                    return
+
+        search(keys, letters, sum(letters.values()), [])
+        return results
@@ -0,0 +1,73 @@
+"""
+Engine state checkpoints for resuming SLF sessions.
+
+A checkpoint is a small JSON snapshot of everything the engine keeps in
+memory between commands: session and author, current node, id counter,
+working/up/down seeds, step, branch and the pending description. Restoring
+one does not touch the node log, so resuming costs the same regardless of
+how large the tree has grown.
+
+Checkpoints live in <dir>/<session>.json, with <dir>/latest.json pointing
+at the most recently saved session. Writes go through a temp file and
+os.replace so a crash never leaves a torn snapshot.
+"""
+
+from __future__ import annotations
+import json
+import os
+import pathlib
+import re
+import time
+
+CHECKPOINT_DIR = ".slf_checkpoints"
+CHECKPOINT_INTERVAL = 30.0  # seconds between periodic snapshots
+STATE_FIELDS = (
+    "session_id", "author", "branch", "description",
+    "id_base", "id_count", "current_node_id", "parent_id",
+    "prev_working_seed", "up_seed", "down_seed", "step", "last_action_method",
+)
+
+
+def _session_file(root: pathlib.Path, session_id: str) -> pathlib.Path:
+    return root / (re.sub(r"[^A-Za-z0-9._-]", "_", session_id) + ".json")
+
+
+def _write_atomic(fp: pathlib.Path, data: str):
+    tmp = fp.with_suffix(".tmp")
+    tmp.write_text(data, encoding="utf-8")
+    os.replace(tmp, fp)
+
+
+def snapshot(engine) -> dict:
+    state = {k: getattr(engine, k, None) for k in STATE_FIELDS}
+    state["working_seed"] = engine.working_seed
+    state["log_path"] = str(engine.tree_log)
+    state["saved_at"] = time.time()
+    return state
+
+
+def save_checkpoint(engine, root: str | pathlib.Path = CHECKPOINT_DIR) -> pathlib.Path:
+    root = pathlib.Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(snapshot(engine), ensure_ascii=False)
+    fp = _session_file(root, engine.session_id)
+    _write_atomic(fp, data)
+    _write_atomic(root / "latest.json", data)
+    return fp
+
+
+def load_checkpoint(root: str | pathlib.Path = CHECKPOINT_DIR, session_id: str = "latest") -> dict | None:
+    root = pathlib.Path(root)
+    fp = root / "latest.json" if session_id == "latest" else _session_file(root, session_id)
+    if not fp.exists():
+        return None
+    return json.loads(fp.read_text(encoding="utf-8"))
+
+
+def restore(engine, state: dict):
+    for k in STATE_FIELDS:
+        setattr(engine, k, state.get(k))
+    engine.working_seed = state.get("working_seed", "")
+    engine.description = engine.description or ""
+    engine.branch = engine.branch or "main"
+    engine.step = engine.step or 1
@@ -0,0 +1,231 @@
+"""
+Prompt completion for SLF: node ids, seeds (words and transform targets)
+and branch names.
+
+RadixTrie is a path-compressed prefix trie: each edge carries a whole
+substring, so session node ids ("<uuid>-10", "<uuid>-11", ...) share one
+edge for their common prefix instead of one node per character. It is
+maintained incrementally: the engine adds each node as it is logged, and
+metadata targets are added when a snapshot is swapped in.
+
+CompletionIndex fills the tries from the node log on a background thread,
+so a large log never delays startup; until it finishes, completions come
+from whatever has been loaded so far. Words come straight from the
+wordlist's sorted prefix ranges and are not copied into a trie.
+
+The completers are wrapped in prompt_toolkit's ThreadedCompleter, so
+suggestions are computed off the input thread and typing never waits on
+a lookup.
+"""
+
+from __future__ import annotations
+import bisect
+import logging
+import threading
+from prompt_toolkit.completion import Completer, Completion, ThreadedCompleter
+
+logger = logging.getLogger("SLF-Completion")
+
+COMPLETION_LIMIT = 50
+
+
+class _Node:
+    __slots__ = ("edges", "terminal", "value")
+
+    def __init__(self):
+        # None until the node gets a child: most nodes are leaves
+        self.edges: dict[str, tuple[str, _Node]] | None = None
+        self.terminal = False
+        self.value = None
+
+
+def _common(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class RadixTrie:
+    def __init__(self, keys=()):
+        self.root = _Node()
+        self.size = 0
+        for k in keys:
+            self.insert(k)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def insert(self, key: str, value=None) -> bool:
+        """Add key (or update its value); True if it was new."""
+        node, rest = self.root, key
+        while rest:
+            edge = node.edges.get(rest[0]) if node.edges else None
+            if edge is None:
+                leaf = _Node()
+                if node.edges is None:
+                    node.edges = {}
+                node.edges[rest[0]] = (rest, leaf)
+                node = leaf
+                rest = ""
+                break
+            label, child = edge
+            k = _common(label, rest)
+            if k < len(label):
+                # Split the edge at the point where key diverges
+                mid = _Node()
+                mid.edges = {label[k]: (label[k:], child)}
+                node.edges[rest[0]] = (label[:k], mid)
+                child = mid
+            node, rest = child, rest[k:]
+        new = not node.terminal
+        node.terminal = True
+        node.value = value
+        self.size += new
+        return new
+
+    def _locate(self, prefix: str) -> tuple[_Node | None, str]:
+        """Node whose subtree holds every key with prefix, and the key text leading to it."""
+        node, rest, path = self.root, prefix, ""
+        while rest:
+            edge = node.edges.get(rest[0]) if node.edges else None
+            if edge is None:
+                return None, ""
+            label, child = edge
+            k = _common(label, rest)
+            if k == len(rest):
+                return child, path + label
+            if k < len(label):
+                return None, ""
+            node, rest, path = child, rest[k:], path + label
+        return node, path
+
+    def __contains__(self, key: str) -> bool:
+        node, path = self._locate(key)
+        return node is not None and path == key and node.terminal
+
+    def get(self, key: str, default=None):
+        node, path = self._locate(key)
+        return node.value if node is not None and path == key and node.terminal else default
+
+    def items(self, prefix: str = "", limit: int | None = COMPLETION_LIMIT) -> list[tuple[str, object]]:
+        """(key, value) for keys starting with prefix, in sorted order, at most limit."""
+        node, path = self._locate(prefix)
+        out: list[tuple[str, object]] = []
+        if node is None:
+            return out
+        stack = [(path, node)]
+        while stack and (limit is None or len(out) < limit):
+            key, n = stack.pop()
+            if n.terminal:
+                out.append((key, n.value))
+            if n.edges:
+                for first in sorted(n.edges, reverse=True):
+                    label, child = n.edges[first]
+                    stack.append((key + label, child))
+        return out
+
+    def keys(self, prefix: str = "", limit: int | None = COMPLETION_LIMIT) -> list[str]:
+        return [k for k, _ in self.items(prefix, limit)]
+
+
+def _node_meta(node: dict) -> str:
+    return f"{node.get('source', '')}→{node.get('target', '')} step={node.get('step', '')} [{node.get('branch', '')}]"
+
+
+class CompletionIndex:
+    def __init__(self, words=()):
+        self.words = words
+        self.nodes = RadixTrie()
+        self.targets = RadixTrie()
+        self.branches = RadixTrie()
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+
+    # --- maintenance ---
+    def add_node(self, node: dict):
+        with self.lock:
+            if node.get("id"):
+                self.nodes.insert(node["id"], _node_meta(node))
+            if node.get("target"):
+                self.targets.insert(node["target"])
+            if node.get("branch"):
+                self.branches.insert(node["branch"])
+
+    def add_targets(self, targets):
+        with self.lock:
+            for t in targets:
+                if isinstance(t, str) and t:
+                    self.targets.insert(t)
+
+    def start(self, iter_nodes, targets=()) -> threading.Thread:
+        """Load the existing log (and metadata targets) in the background."""
+        def load():
+            try:
+                self.add_targets(targets)
+                for n in iter_nodes():
+                    self.add_node(n)
+            except Exception as e:
+                logger.warning(f"Completion index incomplete: {e}")
+            finally:
+                self.ready.set()
+
+        t = threading.Thread(target=load, daemon=True, name="slf-completion-index")
+        t.start()
+        return t
+
+    # --- lookups ---
+    def node_ids(self, prefix: str, limit: int | None = COMPLETION_LIMIT) -> list[tuple[str, str]]:
+        with self.lock:
+            return self.nodes.items(prefix, limit)
+
+    def branch_names(self, prefix: str, limit: int | None = COMPLETION_LIMIT) -> list[tuple[str, str]]:
+        with self.lock:
+            return [(b, "branch") for b in self.branches.keys(prefix, limit)]
+
+    def _words(self, prefix: str, limit: int) -> list[str]:
+        words = self.words
+        if hasattr(words, "prefix_range"):
+            ids = words.prefix_range(prefix)
+            return [words[i] for i in ids[:limit]]
+        lo = bisect.bisect_left(words, prefix)
+        out = []
+        for w in words[lo:lo + limit]:
+            if not w.startswith(prefix):
+                break
+            out.append(w)
+        return out
+
+    def seeds(self, prefix: str, limit: int | None = COMPLETION_LIMIT) -> list[tuple[str, str]]:
+        """Transform targets and logged seeds first, then dictionary words."""
+        limit = limit or COMPLETION_LIMIT
+        with self.lock:
+            out = [(t, "target") for t in self.targets.keys(prefix, limit)]
+        seen = {t for t, _ in out}
+        for w in self._words(prefix, limit):
+            if len(out) >= limit:
+                break
+            if w not in seen:
+                out.append((w, "word"))
+        return out
+
+
+class IndexCompleter(Completer):
+    """Completes the whole input against lookup(prefix, limit) -> [(text, meta)]."""
+
+    def __init__(self, lookup, limit: int = COMPLETION_LIMIT):
+        self.lookup = lookup
+        self.limit = limit
+
+    def get_completions(self, document, complete_event):
+        text = document.text_before_cursor.strip()
+        if not text and not complete_event.completion_requested:
+            return
+        for value, meta in self.lookup(text, self.limit):
+            if value != text:
+                yield Completion(value, start_position=-len(document.text_before_cursor), display_meta=meta)
+
+
+def threaded_completer(lookup, limit: int = COMPLETION_LIMIT) -> ThreadedCompleter:
+    return ThreadedCompleter(IndexCompleter(lookup, limit))
@@ -0,0 +1,211 @@
+"""
+Bounded duplicate-output suppression for SLF sessions.
+
+Outputs are never kept themselves, only a 64-bit BLAKE2b digest of each,
+so a full tree dump costs the same 8 bytes as a one-line status.
+
+    OutputDeduper   exact digests in an LRU of at most `capacity` entries,
+                    optionally also forgetting entries older than `window`
+                    seconds; a repeat refreshes its entry
+    BloomDeduper    fixed-size Bloom filter sized for `capacity` entries at
+                    `error_rate` false positives, for multi-million-entry
+                    histories; never forgets, may rarely report a new
+                    output as seen
+
+Both persist to `path` when given: loaded when opened and rewritten
+atomically (tmp file + os.replace) on close(), so duplicates are
+recognised across sessions. The LRU history is small enough to also be
+saved every SAVE_EVERY new entries; a Bloom filter is megabytes, so only
+close() writes it.
+"""
+
+from __future__ import annotations
+import hashlib
+import logging
+import math
+import os
+import pathlib
+import struct
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("SLF-Dedupe")
+
+DEFAULT_CAPACITY = 10_000
+BLOOM_CAPACITY = 5_000_000
+BLOOM_ERROR_RATE = 0.001
+SAVE_EVERY = 50
+MODES = ("lru", "bloom", "off")
+
+_MAGIC_LRU = b"SLFDDLR1"
+_MAGIC_BLOOM = b"SLFDDBL1"
+_ENTRY = struct.Struct("<Qd")
+_BLOOM_HEADER = struct.Struct("<8sQI")
+
+
+def digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _write_atomic(path: pathlib.Path, data: bytes):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Cannot save dedupe history {path}: {e}")
+        tmp.unlink(missing_ok=True)
+
+
+class OutputDeduper:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, window: float | None = None, path: str | pathlib.Path | None = None):
+        self.capacity = capacity
+        self.window = window
+        self.path = pathlib.Path(path) if path else None
+        self.entries: OrderedDict[int, float] = OrderedDict()
+        self._unsaved = 0
+        if self.path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _expire(self, now: float):
+        if self.window is None:
+            return
+        cutoff = now - self.window
+        while self.entries:
+            key, ts = next(iter(self.entries.items()))
+            if ts >= cutoff:
+                break
+            self.entries.popitem(last=False)
+
+    def seen(self, text: str) -> bool:
+        """True if text was output within the bounds; records it either way."""
+        now = time.time()
+        self._expire(now)
+        key = digest(text)
+        hit = key in self.entries
+        self.entries[key] = now
+        self.entries.move_to_end(key)
+        if not hit:
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+            self._note_added()
+        return hit
+
+    def _note_added(self):
+        self._unsaved += 1
+        if self.path and self._unsaved >= SAVE_EVERY:
+            self.save()
+
+    def _load(self):
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Cannot read dedupe history {self.path}: {e}")
+            return
+        if data[:8] != _MAGIC_LRU:
+            logger.warning(f"{self.path} is not an LRU dedupe history; starting empty.")
+            return
+        body = data[8:len(data) - (len(data) - 8) % _ENTRY.size]
+        for key, ts in _ENTRY.iter_unpack(body):
+            self.entries[key] = ts
+        self._expire(time.time())
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        if self.path:
+            _write_atomic(self.path, _MAGIC_LRU + b"".join(_ENTRY.pack(k, ts) for k, ts in self.entries.items()))
+        self._unsaved = 0
+
+    def close(self):
+        if self._unsaved:
+            self.save()
+
+
+class BloomDeduper:
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE, path: str | pathlib.Path | None = None):
+        self.path = pathlib.Path(path) if path else None
+        self.nbits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.nbits / capacity * math.log(2)))
+        self.bits = bytearray((self.nbits + 7) // 8)
+        self.count = 0
+        self._unsaved = 0
+        if self.path:
+            self._load()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, key: int):
+        # Kirsch-Mitzenmacher double hashing from the two halves of the digest
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        return ((h1 + i * h2) % self.nbits for i in range(self.k))
+
+    def seen(self, text: str) -> bool:
+        hit = True
+        for p in self._positions(digest(text)):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not self.bits[byte] & mask:
+                hit = False
+                self.bits[byte] |= mask
+        if not hit:
+            self.count += 1
+            self._unsaved += 1
+        return hit
+
+    def _load(self):
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Cannot read dedupe history {self.path}: {e}")
+            return
+        try:
+            magic, nbits, k = _BLOOM_HEADER.unpack_from(data)
+        except struct.error:
+            magic = None
+        if magic != _MAGIC_BLOOM or nbits != self.nbits or k != self.k:
+            # A filter sized differently cannot be merged; it is replaced on the next save
+            logger.warning(f"{self.path} does not match this Bloom filter's size; starting empty.")
+            return
+        body = data[_BLOOM_HEADER.size:]
+        self.count = int.from_bytes(body[:8], "little")
+        self.bits[:] = body[8:8 + len(self.bits)]
+
+    def save(self):
+        if self.path:
+            _write_atomic(self.path, _BLOOM_HEADER.pack(_MAGIC_BLOOM, self.nbits, self.k)
+                          + self.count.to_bytes(8, "little") + bytes(self.bits))
+        self._unsaved = 0
+
+    def close(self):
+        if self._unsaved:
+            self.save()
+
+
+class NoDedupe:
+    def __len__(self) -> int:
+        return 0
+
+    def seen(self, text: str) -> bool:
+        return False
+
+    def close(self):
+        pass
+
+
+def open_deduper(mode: str = "lru", capacity: int | None = None, window: float | None = None,
+                 path: str | pathlib.Path | None = None):
+    if mode == "lru":
+        return OutputDeduper(capacity or DEFAULT_CAPACITY, window, path)
+    if mode == "bloom":
+        return BloomDeduper(capacity or BLOOM_CAPACITY, path=path)
+    if mode == "off":
+        return NoDedupe()
+    raise ValueError(f"Unknown dedupe mode: {mode} (expected one of {', '.join(MODES)})")
@@ -0,0 +1,78 @@
+"""
+Embedded-word detection for SLF.
+
+WordAutomaton is an Aho-Corasick automaton over the wordlist: one left to
+right pass over a seed reports every dictionary word that occurs in it as a
+contiguous substring ("too" and "tool" in "toolbox"), in time linear in
+the seed length plus the number of matches, independent of the wordlist
+size.
+
+States are trie nodes held in flat lists (goto dicts, failure links,
+output word ids and dictionary-suffix links) rather than node objects, so
+the automaton stays compact for large wordlists.
+"""
+
+from __future__ import annotations
+from collections import deque
+
+EMBED_MIN_LEN = 3  # shortest word shown as "found" in the status panel
+
+
+class WordAutomaton:
+    def __init__(self, words, min_len: int = 1):
+        self.source = words
+        goto: list[dict[str, int]] = [{}]
+        out: list[int] = [-1]
+        for wi, w in enumerate(words):
+            if len(w) < min_len:
+                continue
+            node = 0
+            for ch in w:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append(-1)
+                node = nxt
+            out[node] = wi
+        fail = [0] * len(goto)
+        # Nearest proper suffix state that ends a word, or 0
+        dict_link = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            u = queue.popleft()
+            for ch, v in goto[u].items():
+                f = fail[u]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                nxt = goto[f].get(ch, 0)
+                fail[v] = nxt if nxt != v else 0
+                dict_link[v] = fail[v] if out[fail[v]] >= 0 else dict_link[fail[v]]
+                queue.append(v)
+        self.goto, self.fail, self.out, self.dict_link = goto, fail, out, dict_link
+        self.lengths = [len(words[wi]) if wi >= 0 else 0 for wi in out]
+
+    def find(self, text: str) -> list[tuple[int, str]]:
+        """(start, word) for every dictionary word occurring in text, by start then longest first."""
+        goto, fail, out, link, lengths = self.goto, self.fail, self.out, self.dict_link, self.lengths
+        hits = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            m = node if out[node] >= 0 else link[node]
+            while m:
+                hits.append((i - lengths[m] + 1, -lengths[m], out[m]))
+                m = link[m]
+        hits.sort()
+        return [(start, self.source[wi]) for start, _, wi in hits]
+
+    def found_words(self, text: str, min_len: int = EMBED_MIN_LEN) -> list[str]:
+        """Distinct embedded words of at least min_len letters, in order of first occurrence."""
+        seen: dict[str, None] = {}
+        for _, w in self.find(text):
+            if len(w) >= min_len:
+                seen.setdefault(w)
+        return list(seen)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Incremental Parquet export of the node log and the SQLite transform log.
+
+seed_tree.jsonl is exported to <out>/seed_tree/ partitioned by session_id
+and branch, transform_log to <out>/transform_log/ partitioned by branch.
+String columns are dictionary encoded and rows are written in bounded
+batches and row groups, so neither store is ever loaded whole.
+
+A watermark file in <out> records how far each store has been exported
+(byte offset of the last complete JSONL line, or the node count of a
+segmented seed_tree.d log, and the last transform_log id); each run only
+appends the records added since, as new files in the partitions.
+
+Usage:
+    python slf_export.py --out export/
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import uuid
+from itertools import islice
+import pyarrow as pa
+import pyarrow.dataset as ds
+from slf_segment_log import JsonlNodeLog, open_node_log
+
+logger = logging.getLogger("SLF-Export")
+
+BATCH_ROWS = 50_000
+ROW_GROUP_ROWS = 64 * 1024
+WATERMARK = "export_watermark.json"
+
+NODE_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("parent_id", pa.string()),
+    ("session_id", pa.string()),
+    ("branch", pa.string()),
+    ("author", pa.string()),
+    ("timestamp", pa.string()),
+    ("duration", pa.string()),
+    ("step", pa.int64()),
+    ("source", pa.string()),
+    ("target", pa.string()),
+    ("up_seed", pa.string()),
+    ("down_seed", pa.string()),
+    ("method", pa.string()),
+    ("diff", pa.string()),
+    ("description", pa.string()),
+])
+
+LOG_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("timestamp", pa.string()),
+    ("source", pa.string()),
+    ("target", pa.string()),
+    ("reversal", pa.bool_()),
+    ("identical", pa.bool_()),
+    ("branch", pa.string()),
+    ("received_up", pa.bool_()),
+    ("received_down", pa.bool_()),
+])
+
+
+def load_watermark(out: pathlib.Path) -> dict:
+    fp = out / WATERMARK
+    if fp.exists():
+        return json.loads(fp.read_text(encoding="utf-8"))
+    return {"seed_tree_offset": 0, "transform_log_id": 0}
+
+
+def save_watermark(out: pathlib.Path, mark: dict):
+    fp = out / WATERMARK
+    tmp = fp.with_suffix(".tmp")
+    tmp.write_text(json.dumps(mark), encoding="utf-8")
+    os.replace(tmp, fp)
+
+
+def _write(batches, schema: pa.Schema, dest: pathlib.Path, partitions: list[str]) -> None:
+    fmt = ds.ParquetFileFormat()
+    ds.write_dataset(
+        batches,
+        dest,
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([schema.field(p) for p in partitions]), flavor="hive"),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=fmt.make_write_options(use_dictionary=True, compression="zstd"),
+        min_rows_per_group=min(ROW_GROUP_ROWS, BATCH_ROWS),
+        max_rows_per_group=ROW_GROUP_ROWS,
+    )
+
+
+def _node_batches(nodes):
+    names = NODE_SCHEMA.names
+    rows: list[dict] = []
+    for n in nodes:
+        rows.append({k: n.get(k) for k in names})
+        if len(rows) >= BATCH_ROWS:
+            yield pa.RecordBatch.from_pylist(rows, schema=NODE_SCHEMA)
+            rows = []
+    if rows:
+        yield pa.RecordBatch.from_pylist(rows, schema=NODE_SCHEMA)
+
+
+def _jsonl_nodes(tree_log: pathlib.Path, offset: int, state: dict):
+    with tree_log.open("rb") as f:
+        f.seek(offset)
+        pos = offset
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # partial line still being written; pick it up next run
+            pos += len(raw)
+            state["offset"] = pos
+            if not raw.strip():
+                continue
+            try:
+                yield json.loads(raw)
+            except ValueError as e:
+                logger.warning(f"Skipping invalid log line: {e}")
+
+
+def iter_node_batches(tree_log: pathlib.Path, offset: int, state: dict):
+    """Record batches of nodes after offset; state['offset'] tracks the last complete line."""
+    yield from _node_batches(_jsonl_nodes(tree_log, offset, state))
+
+
+def _segmented_nodes(log, skip: int, state: dict):
+    for n in islice(log.iter_nodes(), skip, None):
+        state["count"] += 1
+        yield n
+
+
+def export_segmented_tree(log, out: pathlib.Path, mark: dict) -> int:
+    """Export a segmented seed_tree.d log; its watermark is the number of nodes already exported."""
+    state = {"count": mark.get("seed_tree_nodes", 0)}
+    start = state["count"]
+    _write(_node_batches(_segmented_nodes(log, start, state)), NODE_SCHEMA, out / "seed_tree", ["session_id", "branch"])
+    mark["seed_tree_nodes"] = state["count"]
+    return state["count"] - start
+
+
+def export_seed_tree(tree_log: pathlib.Path, out: pathlib.Path, mark: dict) -> int:
+    if not tree_log.exists():
+        return 0
+    log = open_node_log(tree_log, background=False)
+    if not isinstance(log, JsonlNodeLog):
+        try:
+            return export_segmented_tree(log, out, mark)
+        finally:
+            log.close()
+    offset = mark.get("seed_tree_offset", 0)
+    if tree_log.stat().st_size < offset:
+        logger.warning(f"{tree_log} is smaller than the export watermark; exporting from the start.")
+        offset = 0
+    state = {"offset": offset}
+    count = 0
+
+    def counted():
+        nonlocal count
+        for b in iter_node_batches(tree_log, offset, state):
+            count += b.num_rows
+            yield b
+
+    _write(counted(), NODE_SCHEMA, out / "seed_tree", ["session_id", "branch"])
+    mark["seed_tree_offset"] = state["offset"]
+    return count
+
+
+def export_transform_log(db_path: pathlib.Path, out: pathlib.Path, mark: dict) -> int:
+    if not db_path.exists():
+        return 0
+    last_id = mark.get("transform_log_id", 0)
+    # write_dataset pulls batches from its own thread
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    count = 0
+
+    def batches():
+        nonlocal last_id, count
+        cur = conn.execute(f"SELECT {', '.join(LOG_SCHEMA.names)} FROM transform_log WHERE id > ? ORDER BY id", (last_id,))
+        while True:
+            rows = cur.fetchmany(BATCH_ROWS)
+            if not rows:
+                break
+            cols = list(zip(*rows))
+            arrays = [pa.array([None if v is None else bool(v) for v in col], type=f.type) if f.type == pa.bool_()
+                      else pa.array(col, type=f.type) for col, f in zip(cols, LOG_SCHEMA)]
+            last_id = rows[-1][0]
+            count += len(rows)
+            yield pa.RecordBatch.from_arrays(arrays, schema=LOG_SCHEMA)
+
+    try:
+        _write(batches(), LOG_SCHEMA, out / "transform_log", ["branch"])
+    finally:
+        conn.close()
+    mark["transform_log_id"] = last_id
+    return count
+
+
+def export_all(out: str | pathlib.Path, tree_log="seed_tree.jsonl", db_path="transform_history.db") -> dict:
+    out = pathlib.Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    mark = load_watermark(out)
+    # Persist each store's progress as soon as its files are written, so a failure
+    # in the next store cannot make a rerun export the same records twice
+    nodes = export_seed_tree(pathlib.Path(tree_log), out, mark)
+    save_watermark(out, mark)
+    logs = export_transform_log(pathlib.Path(db_path), out, mark)
+    save_watermark(out, mark)
+    return {"nodes": nodes, "transform_log": logs}
+
+
+def read_dataset(path: str | pathlib.Path) -> pa.Table:
+    """Convenience reader with the hive partitions restored as columns."""
+    return ds.dataset(path, format="parquet", partitioning="hive").to_table()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Export seed_tree.jsonl and transform_log to partitioned Parquet.")
+    ap.add_argument('--out', default='export', help='Output directory')
+    ap.add_argument('--tree', default='seed_tree.jsonl', help='Node log: a JSONL file or a segmented log directory')
+    ap.add_argument('--db', default='transform_history.db')
+    args = ap.parse_args()
+    counts = export_all(args.out, args.tree, args.db)
+    logger.info(f"Exported {counts['nodes']} nodes and {counts['transform_log']} transform_log rows to {args.out}")
@@ -0,0 +1,109 @@
+"""
+Letter-histogram kernel for SLF.
+
+Seeds and wordlist entries are normalized to lowercase ASCII, so a letter
+multiset fits in a fixed-size count array indexed by code point. The scalar
+helpers replace the Counter arithmetic in calc_diff / smart_dict_scan, and
+WordHistograms holds one row per word so a fragment can be compared against
+a whole set of words in a single vector operation. The dictionary scan
+finds its matches through the subsequence index and then takes the up/down
+letters of all of them from one WordHistograms built over the matched words.
+"""
+
+from __future__ import annotations
+from collections import Counter
+import numpy as np
+
+ALPHABET_SIZE = 128
+
+
+def histogram(text: str) -> np.ndarray:
+    """Count array of length ALPHABET_SIZE for an ASCII string."""
+    if not text:
+        return np.zeros(ALPHABET_SIZE, dtype=np.int32)
+    codes = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    return np.bincount(codes, minlength=ALPHABET_SIZE).astype(np.int32)
+
+
+def _ordered_excess(text: str, excess: np.ndarray, columns: np.ndarray | None = None) -> str:
+    # Emit letters in order of first appearance, matching Counter.elements();
+    # columns maps code points to positions in excess when it is a matrix row
+    out = []
+    for ch in dict.fromkeys(text):
+        n = excess[ord(ch) if columns is None else columns[ord(ch)]]
+        if n > 0:
+            out.append(ch * int(n))
+    return "".join(out)
+
+
+def letter_diff(src: str, tgt: str) -> tuple[str, str]:
+    """Return (added, removed) letters going from src to tgt."""
+    if not (src.isascii() and tgt.isascii()):
+        src_c, tgt_c = Counter(src), Counter(tgt)
+        return ''.join((tgt_c - src_c).elements()), ''.join((src_c - tgt_c).elements())
+    delta = histogram(tgt) - histogram(src)
+    return _ordered_excess(tgt, delta), _ordered_excess(src, -delta)
+
+
+def calc_diff(src, tgt):
+    add, rem = letter_diff(src, tgt)
+    s = []
+    if add: s.append(f"+{add}")
+    if rem: s.append(f"-{rem}")
+    return " ".join(s)
+
+
+class WordHistograms:
+    """Dense (words x letters) count matrix over the alphabet of a word set."""
+
+    def __init__(self, words: list[str]):
+        self.words = words
+        letters = sorted({ch for w in words for ch in w if ch.isascii()})
+        self.columns = np.full(ALPHABET_SIZE, -1, dtype=np.int32)
+        self.columns[[ord(ch) for ch in letters]] = np.arange(len(letters), dtype=np.int32)
+        self.lengths = np.fromiter((len(w) for w in words), dtype=np.int32, count=len(words))
+        # Non-ASCII words keep an all-zero row; the exact subsequence check rejects them
+        ascii_words = [w if w.isascii() else "" for w in words]
+        codes = np.frombuffer("".join(ascii_words).encode("ascii"), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(words)), [len(w) for w in ascii_words])
+        self.matrix = np.zeros((len(words), len(letters)), dtype=np.int16)
+        np.add.at(self.matrix.reshape(-1), rows * len(letters) + self.columns[codes], 1)
+
+    def _project(self, frag: str) -> tuple[np.ndarray, int]:
+        counts = histogram(frag)
+        known = self.columns >= 0
+        row = np.zeros(self.matrix.shape[1], dtype=np.int16)
+        row[self.columns[known]] = counts[known]
+        return row, int(counts[~known].sum())
+
+    def up_down_counts(self, frag: str) -> tuple[np.ndarray, np.ndarray]:
+        """Per-word counts of letters to add (up) and remove (down) to turn frag into each word."""
+        row, outside = self._project(frag)
+        delta = self.matrix - row
+        up = np.clip(delta, 0, None).sum(axis=1)
+        down = np.clip(-delta, 0, None).sum(axis=1) + outside
+        return up, down
+
+    def candidates(self, frag: str, max_up: int, max_down: int) -> np.ndarray:
+        """Indices of words that may be subsequence matches of frag within the up/down limits."""
+        up, down = self.up_down_counts(frag)
+        mask = ((down == 0) & (up <= max_up)) | ((up == 0) & (down <= max_down))
+        return np.nonzero(mask)[0]
+
+    def letter_diffs(self, frag: str, rows) -> list[tuple[str, str]]:
+        """letter_diff(frag, word) for every word in rows, from one matrix subtraction."""
+        rows = np.asarray(rows, dtype=np.intp)
+        if not frag.isascii():
+            return [letter_diff(frag, self.words[i]) for i in rows.tolist()]
+        row, outside = self._project(frag)
+        if outside:
+            return [letter_diff(frag, self.words[i]) for i in rows.tolist()]
+        delta = self.matrix[rows] - row
+        out = []
+        for i, d in zip(rows.tolist(), delta):
+            w = self.words[i]
+            if not w.isascii():
+                out.append(letter_diff(frag, w))
+                continue
+            out.append((_ordered_excess(w, d, self.columns), _ordered_excess(frag, -d, self.columns)))
+        return out
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Materialized-path lineage index for the SLF node log.
+
+Every node gets a row in the node_lineage table of transform_history.db
+with its path from the root: the zero-padded sequence numbers of its
+ancestors and itself, e.g. '00000001.00000004.00000009.'. With an index on
+path:
+
+    ancestors(id)   parses the path and fetches O(depth) rows by key
+    subtree(id)     is a single range scan, path >= p AND path < p',
+                    returned in depth-first order
+
+The engine adds rows as it logs nodes; sync() catches up with nodes
+written by other tools (byte offset for a JSONL log, node count for the
+segmented log). Nodes whose parent is unknown, or is the node itself, are
+indexed as roots.
+
+Usage:
+    python slf_lineage.py build
+    python slf_lineage.py ancestors NODE_ID
+    python slf_lineage.py subtree NODE_ID --depth 3 --branch main
+"""
+
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import logging
+import sqlite3
+from slf_segment_log import JsonlNodeLog, open_node_log
+
+logger = logging.getLogger("SLF-Lineage")
+
+SEP = "."
+SEQ_WIDTH = 8
+
+
+def _upper(prefix: str) -> str:
+    # Smallest string greater than every path that starts with prefix
+    return prefix[:-1] + chr(ord(SEP) + 1)
+
+
+class LineageIndex:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        c = conn.cursor()
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS node_lineage (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT UNIQUE NOT NULL,
+                parent_id TEXT,
+                path TEXT NOT NULL DEFAULT '',
+                depth INTEGER NOT NULL,
+                branch TEXT,
+                node TEXT NOT NULL
+            )
+        ''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_lineage_path ON node_lineage(path)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_lineage_parent ON node_lineage(parent_id)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_lineage_depth ON node_lineage(depth)')
+        c.execute('CREATE TABLE IF NOT EXISTS lineage_meta (key TEXT PRIMARY KEY, value INTEGER)')
+        conn.commit()
+
+    @classmethod
+    def open(cls, db_path: str = "transform_history.db") -> "LineageIndex":
+        return cls(sqlite3.connect(db_path))
+
+    # --- writes ---
+    def _insert(self, node: dict) -> bool:
+        nid, pid = node.get("id"), node.get("parent_id")
+        if not nid:
+            return False
+        c = self.conn.cursor()
+        parent = None
+        if pid and pid != nid:
+            parent = c.execute('SELECT path, depth FROM node_lineage WHERE id = ?', (pid,)).fetchone()
+        c.execute('INSERT OR IGNORE INTO node_lineage (id, parent_id, depth, branch, node) VALUES (?, ?, ?, ?, ?)',
+                  (nid, pid, parent[1] + 1 if parent else 0, node.get("branch"), json.dumps(node, ensure_ascii=False)))
+        if c.rowcount == 0:
+            return False  # first record of a repeated id wins; descendants already point at it
+        seq = c.lastrowid
+        path = (parent[0] if parent else "") + f"{seq:0{SEQ_WIDTH}x}{SEP}"
+        c.execute('UPDATE node_lineage SET path = ? WHERE seq = ?', (path, seq))
+        return True
+
+    def _meta(self, key: str) -> int:
+        row = self.conn.execute('SELECT value FROM lineage_meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_meta(self, key: str, value: int):
+        self.conn.execute('INSERT OR REPLACE INTO lineage_meta (key, value) VALUES (?, ?)', (key, value))
+
+    def clear(self):
+        self.conn.execute('DELETE FROM node_lineage')
+        self.conn.execute('DELETE FROM lineage_meta')
+        self.conn.commit()
+
+    def sync(self, node_log) -> int:
+        """Index nodes appended to node_log since the last sync; returns how many were added."""
+        added = 0
+        if isinstance(node_log, JsonlNodeLog):
+            path = node_log.path
+            size = path.stat().st_size if path.exists() else 0
+            offset = self._meta("jsonl_offset")
+            if size < offset:
+                logger.warning(f"{path} shrank; rebuilding the lineage index.")
+                self.clear()
+                offset = 0
+            if size == offset:
+                return 0
+            with path.open("rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    offset += len(raw)
+                    if raw.strip():
+                        try:
+                            added += self._insert(json.loads(raw))
+                        except ValueError as e:
+                            logger.warning(f"Skipping invalid log line: {e}")
+            self._set_meta("jsonl_offset", offset)
+        else:
+            segments = node_log._segments()
+            total = sum(seg.count for seg in segments)
+            seen = self._meta("segment_nodes")
+            if total < seen:
+                self.clear()
+                seen = 0
+            # Skip whole segments that are already indexed instead of re-reading them
+            skip = seen
+            for seg in segments:
+                if skip >= seg.count:
+                    skip -= seg.count
+                    continue
+                for node in itertools.islice(node_log.iter_segment(seg), skip, None):
+                    added += self._insert(node)
+                skip = 0
+            self._set_meta("segment_nodes", total)
+        self.conn.commit()
+        return added
+
+    def note_appended(self, node_log, node: dict):
+        """Index a node the caller just appended.
+
+        Runs a sync rather than moving the watermark to the end of the log,
+        so nodes other writers (v0.0.1, v0.0.3, a session that crashed after
+        appending) added since the last sync are indexed too, not skipped.
+        """
+        self.sync(node_log)
+
+    # --- reads ---
+    def _path(self, node_id: str) -> str | None:
+        row = self.conn.execute('SELECT path FROM node_lineage WHERE id = ?', (node_id,)).fetchone()
+        return row[0] if row else None
+
+    def ancestors(self, node_id: str) -> list[dict]:
+        """Chain of nodes from the root down to node_id (inclusive); [] if unknown."""
+        path = self._path(node_id)
+        if path is None:
+            return []
+        seqs = [int(p, 16) for p in path.split(SEP) if p]
+        rows = self.conn.execute(
+            f'SELECT node FROM node_lineage WHERE seq IN ({",".join("?" * len(seqs))}) ORDER BY depth', seqs)
+        return [json.loads(r[0]) for r in rows]
+
+    def get(self, node_id: str) -> dict | None:
+        row = self.conn.execute('SELECT node FROM node_lineage WHERE id = ?', (node_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def roots(self) -> list[dict]:
+        return [json.loads(r[0]) for r in self.conn.execute('SELECT node FROM node_lineage WHERE depth = 0 ORDER BY seq')]
+
+    def children(self, node_id: str) -> list[dict]:
+        rows = self.conn.execute('SELECT node FROM node_lineage WHERE parent_id = ? AND id != ? ORDER BY seq', (node_id, node_id))
+        return [json.loads(r[0]) for r in rows]
+
+    def subtree(self, node_id: str, max_depth: int | None = None, branch: str | None = None) -> list[tuple[int, dict]]:
+        """(relative depth, node) for node_id and all its descendants, depth first."""
+        path = self._path(node_id)
+        if path is None:
+            return []
+        base = path.count(SEP) - 1
+        sql = 'SELECT depth, node FROM node_lineage WHERE path >= ? AND path < ?'
+        args: list = [path, _upper(path)]
+        if max_depth is not None:
+            sql += ' AND depth <= ?'
+            args.append(base + max_depth)
+        if branch:
+            sql += ' AND branch = ?'
+            args.append(branch)
+        sql += ' ORDER BY path'
+        return [(d - base, json.loads(n)) for d, n in self.conn.execute(sql, args)]
+
+    def close(self):
+        self.conn.close()
+
+
+def format_node(n: dict) -> str:
+    return f"{n['id']}: {n.get('source')} → {n.get('target')} [{n.get('branch', '')}] {n.get('method', '')}"
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Query node ancestry and subtrees.")
+    ap.add_argument('command', choices=['build', 'ancestors', 'subtree'])
+    ap.add_argument('node_id', nargs='?')
+    ap.add_argument('--log', default='seed_tree.jsonl')
+    ap.add_argument('--db', default='transform_history.db')
+    ap.add_argument('--depth', type=int, default=None, help='Subtree depth limit')
+    ap.add_argument('--branch', default=None, help='Only subtree nodes on this branch')
+    ap.add_argument('--rebuild', action='store_true', help='Drop and re-index the whole log')
+    args = ap.parse_args()
+
+    index = LineageIndex.open(args.db)
+    log = open_node_log(args.log)
+    if args.rebuild:
+        index.clear()
+    added = index.sync(log)
+    if args.command == 'build':
+        logger.info(f"Indexed {added} new nodes")
+    elif not args.node_id:
+        raise SystemExit(f"{args.command} needs a node id")
+    elif args.command == 'ancestors':
+        for depth, n in enumerate(index.ancestors(args.node_id)):
+            print("  " * depth + format_node(n))
+    else:
+        for depth, n in index.subtree(args.node_id, args.depth, args.branch):
+            print("  " * depth + format_node(n))
+    log.close()
+    index.close()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Local log server for concurrent SLF sessions.
+
+One daemon owns the node log and transform_history.db; any number of
+interactive sessions talk to it over a Unix domain socket instead of
+appending to the files themselves. Writes are queued and group-committed:
+the writer drains everything that arrived while the previous batch was
+being written, appends the nodes in one file write and inserts the
+transform_log rows in one SQLite transaction, then acknowledges each
+request. Reads (nodes, children, ancestors, subtrees, the jump map) are
+answered from in-memory indexes built at startup and kept current by the
+writer.
+
+The protocol is one JSON object per line in each direction:
+
+    -> {"op": "append_node", "node": {...}}
+    <- {"ok": true, "result": null}
+
+RemoteNodeLog and RemoteLineage wrap a LogClient in the interfaces the
+engine already uses for its local stores, so a session started with
+--server needs no other changes.
+
+Usage:
+    python slf_log_server.py --socket slf.sock --log seed_tree.jsonl
+    python slf_transform_combined.py --server slf.sock
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from slf_segment_log import open_node_log
+
+logger = logging.getLogger("SLF-LogServer")
+
+SOCKET_PATH = "slf.sock"
+MAX_LINE = 16 << 20
+MAX_BATCH = 1000
+
+
+class LogServer:
+    def __init__(self, log_path: str = "seed_tree.jsonl", db_path: str = "transform_history.db"):
+        from slf_transform_combined import TRANSFORM_COLUMNS, init_db
+        self.columns = TRANSFORM_COLUMNS
+        self.node_log = open_node_log(log_path)
+        # Only the writer thread touches the connection after startup
+        self.conn = init_db(db_path, check_same_thread=False)
+        self.writer = ThreadPoolExecutor(max_workers=1)
+        self.queue: asyncio.Queue | None = None
+        self.nodes: dict[str, dict] = {}
+        self.kids: dict[str | None, list[str]] = defaultdict(list)
+        # parent id never logged (yet) -> nodes filed as roots meanwhile
+        self.orphans: dict[str, list[str]] = defaultdict(list)
+        self.transforms: dict[tuple, list] = {}
+        self._load()
+
+    # --- in-memory indexes ---
+    def _index_node(self, n: dict):
+        nid = n.get("id")
+        if not nid:
+            return
+        known = nid in self.nodes
+        self.nodes[nid] = n
+        if known:
+            return
+        pid = n.get("parent_id")
+        if not pid or pid == nid:
+            self.kids[None].append(nid)
+        elif pid not in self.nodes:
+            # Like LineageIndex, a node whose parent is unknown is a root (a session
+            # started on a non-empty log points at an id it never logs)
+            self.kids[None].append(nid)
+            self.orphans[pid].append(nid)
+        else:
+            self.kids[pid].append(nid)
+        self._adopt(nid)
+
+    def _adopt(self, nid: str):
+        """Move roots that were waiting for nid under it, unless that would close a cycle."""
+        waiting = self.orphans.pop(nid, None)
+        if not waiting:
+            return
+        above = {a["id"] for a in self.ancestors(nid)}
+        adopted = [c for c in waiting if c not in above]
+        if adopted:
+            moved = set(adopted)
+            self.kids[None] = [c for c in self.kids[None] if c not in moved]
+            self.kids[nid].extend(adopted)
+
+    def _index_row(self, row):
+        source, target, branch, reversal, identical, up, down = row
+        key = (source, target, branch)
+        prev = self.transforms.get(key)
+        if prev is None:
+            self.transforms[key] = [source, target, branch, reversal, identical, up, down]
+        else:
+            prev[5], prev[6] = prev[5] or up, prev[6] or down
+
+    def _load(self):
+        for n in self.node_log.iter_nodes():
+            self._index_node(n)
+        for row in self.conn.execute('SELECT source, target, branch, reversal, identical, received_up, received_down '
+                                     'FROM transform_log ORDER BY id'):
+            self._index_row(row)
+        logger.info(f"Loaded {len(self.nodes)} nodes and {len(self.transforms)} transforms")
+
+    # --- writes ---
+    def _write_batch(self, nodes: list[dict], rows: list[dict]):
+        """Runs on the writer thread: one log append and one transaction for the batch."""
+        if nodes:
+            self.node_log.append_many(nodes)
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    f'INSERT INTO transform_log ({", ".join(self.columns)}) VALUES ({", ".join("?" * len(self.columns))})',
+                    [[r[k] for k in self.columns] for r in rows])
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < MAX_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            nodes = [item["node"] for op, item, _ in batch if op == "append_node"]
+            rows = [item["row"] for op, item, _ in batch if op == "log_transform"]
+            try:
+                await loop.run_in_executor(self.writer, self._write_batch, nodes, rows)
+            except Exception as e:
+                logger.warning(f"Write batch failed: {e}")
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for n in nodes:
+                self._index_node(n)
+            for r in rows:
+                self._index_row([r["source"], r["target"], r["branch"], r["reversal"],
+                                 r["identical"], r["received_up"], r["received_down"]])
+            for _, _, fut in batch:
+                fut.set_result(None)
+
+    # --- reads ---
+    def ancestors(self, node_id: str) -> list[dict]:
+        chain, seen = [], set()
+        while node_id in self.nodes and node_id not in seen:
+            seen.add(node_id)
+            n = self.nodes[node_id]
+            chain.append(n)
+            node_id = n.get("parent_id")
+        return chain[::-1]
+
+    def children(self, node_id: str | None) -> list[dict]:
+        return [self.nodes[c] for c in self.kids.get(node_id, ())]
+
+    def subtree(self, node_id: str, max_depth: int | None = None, branch: str | None = None) -> list:
+        if node_id not in self.nodes:
+            return []
+        out, stack = [], [(node_id, 0)]
+        while stack:
+            nid, d = stack.pop()
+            n = self.nodes[nid]
+            if not branch or n.get("branch") == branch:
+                out.append((d, n))
+            if max_depth is None or d < max_depth:
+                stack.extend((c, d + 1) for c in reversed(self.kids.get(nid, ())))
+        return out
+
+    def jump(self) -> dict:
+        from slf_transform_combined import jump_map
+        return jump_map(tuple(r) for r in self.transforms.values())
+
+    def handle_read(self, op: str, args: dict):
+        if op == "nodes":
+            return list(self.nodes.values())
+        if op == "get":
+            return self.nodes.get(args["id"])
+        if op == "roots":
+            return self.children(None)
+        if op == "children":
+            return self.children(args["id"])
+        if op == "ancestors":
+            return self.ancestors(args["id"])
+        if op == "subtree":
+            return self.subtree(args["id"], args.get("max_depth"), args.get("branch"))
+        if op == "jump":
+            return self.jump()
+        if op == "is_empty":
+            return not self.nodes
+        raise ValueError(f"Unknown op '{op}'")
+
+    # --- connections ---
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    req = json.loads(line)
+                    op = req.pop("op")
+                    if op in ("append_node", "log_transform"):
+                        fut = asyncio.get_running_loop().create_future()
+                        await self.queue.put((op, req, fut))
+                        await fut
+                        resp = {"ok": True, "result": None}
+                    else:
+                        resp = {"ok": True, "result": self.handle_read(op, req)}
+                except Exception as e:
+                    resp = {"ok": False, "error": str(e)}
+                writer.write((json.dumps(resp, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, path: str = SOCKET_PATH):
+        self.queue = asyncio.Queue()
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self._serve, path, limit=MAX_LINE)
+        writer = asyncio.create_task(self._writer())
+        logger.info(f"Serving on {path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer.cancel()
+            self.writer.shutdown(wait=True)
+            self.node_log.close()
+            self.conn.close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+class LogClient:
+    def __init__(self, path: str = SOCKET_PATH):
+        self.path = path
+        self.sock = self.file = None
+        # One request/response at a time: background loaders share the socket with the CLI
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(self.path)
+        except OSError:
+            self.sock.close()
+            self.sock = None
+            raise
+        self.file = self.sock.makefile("rwb")
+
+    def _drop(self):
+        # The next query reconnects, so a restarted server is picked up without restarting the session
+        for f in (self.file, self.sock):
+            if f:
+                try:
+                    f.close()
+                except OSError:
+                    pass  # closing flushes the unsent request into the dead socket
+        self.sock = self.file = None
+
+    def query(self, op: str, **args):
+        """Send one request; raises ConnectionError (or another OSError) when the server is
+        unreachable and RuntimeError when it reports an error."""
+        with self._lock:
+            try:
+                if self.file is None:
+                    self._connect()
+                self.file.write((json.dumps({"op": op, **args}, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.file.flush()
+                line = self.file.readline()
+            except OSError:
+                self._drop()
+                raise
+            if not line:
+                self._drop()
+                raise ConnectionError("Log server closed the connection")
+        resp = json.loads(line)
+        if not resp["ok"]:
+            raise RuntimeError(resp["error"])
+        return resp["result"]
+
+    def append_node(self, node: dict):
+        self.query("append_node", node=node)
+
+    def log_transform(self, row: dict):
+        self.query("log_transform", row=row)
+
+    def close(self):
+        with self._lock:
+            self._drop()
+
+
+class RemoteNodeLog:
+    """Node log interface backed by the log server."""
+
+    def __init__(self, client: LogClient):
+        self.client = client
+
+    def append(self, node: dict):
+        self.client.append_node(node)
+
+    def iter_nodes(self):
+        yield from self.client.query("nodes")
+
+    def get(self, node_id: str) -> dict | None:
+        return self.client.query("get", id=node_id)
+
+    def children(self, parent_id: str | None) -> list[dict]:
+        return self.client.query("children", id=parent_id)
+
+    def is_empty(self) -> bool:
+        return self.client.query("is_empty")
+
+    def close(self):
+        self.client.close()
+
+
+class RemoteLineage:
+    """LineageIndex interface backed by the log server's in-memory tree."""
+
+    def __init__(self, client: LogClient):
+        self.client = client
+
+    def sync(self, node_log) -> int:
+        return 0
+
+    def note_appended(self, node_log, node: dict):
+        pass  # the server indexes nodes as it writes them
+
+    def get(self, node_id: str) -> dict | None:
+        return self.client.query("get", id=node_id)
+
+    def roots(self) -> list[dict]:
+        return self.client.query("roots")
+
+    def children(self, node_id: str) -> list[dict]:
+        return self.client.query("children", id=node_id)
+
+    def ancestors(self, node_id: str) -> list[dict]:
+        return self.client.query("ancestors", id=node_id)
+
+    def subtree(self, node_id: str, max_depth: int | None = None, branch: str | None = None) -> list[tuple[int, dict]]:
+        return [tuple(r) for r in self.client.query("subtree", id=node_id, max_depth=max_depth, branch=branch)]
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Serve the SLF node log and transform history to concurrent sessions.")
+    ap.add_argument('--socket', default=SOCKET_PATH)
+    ap.add_argument('--log', default='seed_tree.jsonl')
+    ap.add_argument('--db', default='transform_history.db')
+    args = ap.parse_args()
+    try:
+        asyncio.run(LogServer(args.log, args.db).serve(args.socket))
+    except KeyboardInterrupt:
+        pass
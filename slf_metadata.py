@@ -0,0 +1,88 @@
+"""
+Metadata snapshots and hot reload for SLF.
+
+A MetadataSnapshot bundles the metadata frame with the lookup structures
+derived from it: per (source, method) option frames, already sorted by
+weight, and acronym rows grouped by source. A snapshot is never modified
+after it is built, so the engine can swap in a new one with a single
+attribute assignment and every lookup sees either the old snapshot or the
+new one, never a mix.
+
+MetadataWatcher polls the parquet files' mtimes from a daemon thread. When
+a file changes and has stayed unchanged for one more poll (so a curator's
+write has finished), it loads and indexes the new metadata off the
+request path and hands the finished snapshot to a callback. A file that
+fails to load leaves the current snapshot in place until the next change.
+"""
+
+from __future__ import annotations
+import logging
+import os
+import threading
+import pandas as pd
+
+logger = logging.getLogger("SLF-Metadata")
+
+POLL_INTERVAL = 2.0
+
+
+class MetadataSnapshot:
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.empty = frame.iloc[0:0]
+        self.options: dict[tuple[str, str], pd.DataFrame] = {}
+        if not frame.empty:
+            for key, rows in frame.groupby(["source", "method"], sort=False):
+                self.options[key] = rows.sort_values("weight", ascending=False)
+        acr = frame[frame["method"] == "acronym"]
+        self.acronyms: dict[str, pd.DataFrame] = {src: g for src, g in acr.groupby("source", sort=False)}
+
+    def get_options(self, char: str, method: str) -> pd.DataFrame:
+        return self.options.get((char, method), self.empty)
+
+
+def file_mtimes(paths: list[str]) -> dict[str, float | None]:
+    out = {}
+    for p in paths:
+        try:
+            out[p] = os.stat(p).st_mtime
+        except OSError:
+            out[p] = None
+    return out
+
+
+class MetadataWatcher(threading.Thread):
+    def __init__(self, paths: list[str], loader, on_reload, interval: float = POLL_INTERVAL):
+        super().__init__(daemon=True, name="slf-metadata-watcher")
+        self.paths = list(paths)
+        self.loader = loader
+        self.on_reload = on_reload
+        self.interval = interval
+        self.loaded = file_mtimes(self.paths)
+        self._seen = self.loaded
+        self._stop_event = threading.Event()
+
+    def poll(self) -> bool:
+        """Reload if the files changed and have settled; True if a new snapshot was swapped in."""
+        now = file_mtimes(self.paths)
+        settled, self._seen = now == self._seen, now
+        if now == self.loaded or not settled:
+            return False
+        try:
+            snap = MetadataSnapshot(self.loader(self.paths, strict=True))
+        except Exception as e:
+            logger.warning(f"Metadata reload failed, keeping current version: {e}")
+            self.loaded = now  # retry once the files change again
+            return False
+        changed = [p for p in self.paths if now[p] != self.loaded.get(p)]
+        self.loaded = now
+        self.on_reload(snap)
+        logger.info(f"Reloaded metadata ({len(snap.frame)} rows) from {', '.join(changed)}")
+        return True
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.poll()
+
+    def stop(self):
+        self._stop_event.set()
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 from collections import defaultdict
+from slf_semantic_index import SemanticIndex
+from slf_transform_graph import GraphBuilder
 
 class SLFNltk:
     def __init__(self, base_path):
@@ -21,7 +23,21 @@ class SLFNltk:
             entry["character_id"].lower(): entry
             for entry in self.metadata
         }
+        self.semantic = SemanticIndex(self.metadata)
         self.seed_tree = {}
+        self.graph_builder = GraphBuilder()
+        self.graph_builder.add_entries(self.metadata)
+        self.graph_builder.add_rows((e.get("source", "").lower(), e.get("target", "").lower(), e.get("weight", 1.0))
+                                    for e in self.phonetic)
+        self._build_graph()
+
+    def _build_graph(self):
+        # Narrative weights are scaled by how central a symbol is in the transform graph
+        self.graph = self.graph_builder.build()
+        self.centrality = self.graph.centrality()
+
+    def symbol_weight(self, label, base=1.0):
+        return base * self.centrality.get(str(label).lower(), 1.0)
 
     def explain_character(self, char):
         cid = char.lower()
@@ -31,6 +47,12 @@ class SLFNltk:
             "phonetic": self.phonetic_lookup.get(cid, [])
         }
 
+    def search_characters(self, query):
+        return self.semantic.search(query)
+
+    def rank_characters(self, query, limit=10):
+        return self.semantic.rank(query, limit)
+
     def find_transforms(self, phrase):
         phrase = phrase.lower()
         results = {}
@@ -40,32 +62,39 @@ class SLFNltk:
         return results
 
     def load_seed_tree(self, jsonl_path):
+        nodes = []
         with open(jsonl_path, encoding="utf-8") as f:
             for line in f:
                 obj = json.loads(line.strip())
+                nodes.append(obj)
                 key = obj.get("input", "").lower()
                 if key:
                     self.seed_tree.setdefault(key, []).append(obj)
+        # Recorded steps are observed edges; rebuild so centrality reflects them
+        self.graph_builder.add_log(nodes)
+        self._build_graph()
 
     def query_seed_tree(self, term):
         return self.seed_tree.get(term.lower(), [])
 
-    def generate_symbolic_narrative(self, term):
+    def _weight_map(self, term):
         weight_map = defaultdict(float)
         transforms = self.find_transforms(term)
         for char, entries in transforms.items():
             for entry in entries:
                 label = entry.get("logographic_ref", entry.get("target"))
-                weight = entry.get("weight", 1.0)
-                weight_map[label] += weight
+                weight_map[label] += self.symbol_weight(label, entry.get("weight", 1.0))
 
         for seed in self.query_seed_tree(term):
             if "chain" in seed:
                 for step in seed["chain"]:
                     if "target" in step:
                         label = step.get("logographic_ref", step["target"])
-                        weight_map[label] += 1.0  # fixed flat weight
+                        weight_map[label] += self.symbol_weight(label)
+        return weight_map
 
+    def generate_symbolic_narrative(self, term):
+        weight_map = self._weight_map(term)
         if not weight_map:
             return f"No symbolic meaning could be generated for '{term}'."
 
@@ -78,21 +107,7 @@ class SLFNltk:
         return "\n".join(summary)
 
     def explain_symbolic_weights(self, term):
-        weight_map = defaultdict(float)
-        transforms = self.find_transforms(term)
-        for char, entries in transforms.items():
-            for entry in entries:
-                label = entry.get("logographic_ref", entry.get("target"))
-                weight = entry.get("weight", 1.0)
-                weight_map[label] += weight
-
-        for seed in self.query_seed_tree(term):
-            if "chain" in seed:
-                for step in seed["chain"]:
-                    if "target" in step:
-                        label = step.get("logographic_ref", step["target"])
-                        weight_map[label] += 1.0  # fixed weight for seed items
-
+        weight_map = self._weight_map(term)
         if not weight_map:
             return f"No data available for symbolic breakdown of '{term}'."
 
@@ -101,7 +116,7 @@ class SLFNltk:
         for symbol, weight in sorted_items:
             narrative.append(f"- '{symbol}' (aggregated weight: {weight:.2f})")
 
-        narrative.append("\nWeights reflect certainty derived from symbolic and seed associations.")
+        narrative.append("\nWeights reflect certainty derived from symbolic and seed associations, scaled by each symbol's centrality in the transform graph.")
         return "\n".join(narrative)
 
 if __name__ == "__main__":
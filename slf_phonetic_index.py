@@ -0,0 +1,113 @@
+"""
+Phonetic-key index over the wordlist.
+
+The phonetic transform rows (c->k, ph->f, qu->kw, ...) are read as
+equivalences, keeping only rows with weight >= min_weight:
+
+- sound units: rows with a multi-letter source or target (ph~f, ch~k~sh,
+  x~ks, ou~ow) are joined into classes, and each class is spelled by its
+  shortest member (ties alphabetical): ph -> f, sh -> k, ks -> x.
+- letters: single-letter rows (b~p, d~t, c~k) are joined into classes
+  represented by their first letter alphabetically.
+
+key(word) splits the word into the longest known sound units, rewrites
+each unit and then each letter to its class representative, and collapses
+repeated letters. Words with the same key sound alike under the metadata,
+so "sounds like" is a single dict lookup once every wordlist key has been
+computed.
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+import pandas as pd
+
+MIN_WEIGHT = 0.85
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: dict[str, str] = {}
+
+    def find(self, x: str) -> str:
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: str, b: str):
+        self.parent[self.find(a)] = self.find(b)
+
+    def classes(self) -> list[list[str]]:
+        out = defaultdict(list)
+        for x in list(self.parent):
+            out[self.find(x)].append(x)
+        return list(out.values())
+
+
+def phonetic_rules(metadata: pd.DataFrame, min_weight: float = MIN_WEIGHT) -> tuple:
+    """Sorted (source, target) pairs that define the key; equal rules give equal keys."""
+    rows = metadata[(metadata["method"] == "phonetic") & (metadata["weight"] >= min_weight)]
+    return tuple(sorted({(s, t) for s, t in zip(rows["source"], rows["target"]) if s and t and s != t}))
+
+
+class PhoneticKey:
+    def __init__(self, rules: tuple):
+        self.rules = rules
+        units, letters = _UnionFind(), _UnionFind()
+        for s, t in rules:
+            if len(s) == 1 and len(t) == 1:
+                letters.union(s, t)
+            else:
+                units.union(s, t)
+        self.letter_rep = {x: min(cls) for cls in letters.classes() for x in cls}
+        self.unit_rep: dict[str, str] = {}
+        for cls in units.classes():
+            rep = min(cls, key=lambda u: (len(u), u))
+            for u in cls:
+                if len(u) > 1:
+                    self.unit_rep[u] = rep
+        self.max_unit = max((len(u) for u in self.unit_rep), default=1)
+
+    def __call__(self, word: str) -> str:
+        out: list[str] = []
+        i, n = 0, len(word)
+        while i < n:
+            for size in range(min(self.max_unit, n - i), 1, -1):
+                rep = self.unit_rep.get(word[i:i + size])
+                if rep is not None:
+                    i += size
+                    break
+            else:
+                rep = word[i]
+                i += 1
+            for ch in rep:
+                ch = self.letter_rep.get(ch, ch)
+                if not out or out[-1] != ch:
+                    out.append(ch)
+        return "".join(out)
+
+
+class PhoneticIndex:
+    def __init__(self, words, rules: tuple, min_len: int = 2):
+        self.words = words
+        self.rules = rules
+        self.key = PhoneticKey(rules)
+        self.buckets: dict[str, list[int]] = defaultdict(list)
+        for wi, w in enumerate(words):
+            if len(w) >= min_len:
+                self.buckets[self.key(w)].append(wi)
+
+    def sounds_like(self, s: str) -> list[str]:
+        """Words whose phonetic key equals that of s (s itself excluded), in wordlist order."""
+        return [self.words[wi] for wi in self.buckets.get(self.key(s), ()) if self.words[wi] != s]
+
+    def fragments(self, seed: str, min_len: int = 3, max_len: int = 12) -> list[tuple[str, int, list[str]]]:
+        """(fragment, pos, words) for every substring of seed with sound-alike words."""
+        out = []
+        for i in range(len(seed)):
+            for j in range(i + min_len, min(len(seed), i + max_len) + 1):
+                words = self.sounds_like(seed[i:j])
+                if words:
+                    out.append((seed[i:j], i, words))
+        return out
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Per-command profiling for SLF sessions.
+
+With --profile, every dispatched command (1a-1e, goto, tree, ...) runs
+under cProfile and leaves three things in the session's profile
+directory, named <seq>_<command>_len<seed length>:
+
+    .pstats     the raw profile, for pstats / snakeviz
+    .folded     collapsed stacks ("frame;frame;frame microseconds"), the
+                input format of flamegraph.pl, speedscope and inferno
+    index.jsonl one line per command: command, seed length, wall and CPU
+                seconds, call count and the two file names
+
+Only the length of the working seed is recorded, never the seed itself.
+A profiler opened with defer=True keeps finished profiles in memory until
+flush(), so a caller timing the commands itself (slf_replay.py) does not
+measure the profile file writes.
+Wall time includes time spent waiting at the command's own prompts; CPU
+time does not, so a slow pick list and a slow person can be told apart.
+
+cProfile records caller -> callee edges rather than whole stacks, so the
+collapsed stacks are rebuilt from the call graph: each function's time is
+split between its callers in proportion to the time each caller spent in
+it. Paths under MIN_FRACTION of the command's time are folded into their
+parent. Every stack starts with a "<command>[len=N]" frame, so the files
+of a session can be concatenated into one flame graph:
+
+    cat profiles/<session>/*.folded | flamegraph.pl > session.svg
+
+Usage:
+    python slf_transform_combined.py --profile
+    python slf_profile.py profiles/<session>
+    python slf_profile.py profiles/<session> --command 1d --top 30
+"""
+
+from __future__ import annotations
+import argparse
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import pathlib
+import pstats
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+
+logger = logging.getLogger("SLF-Profile")
+
+PROFILE_DIR = "profiles"
+INDEX_FILE = "index.jsonl"
+MIN_FRACTION = 1e-4
+
+
+def _safe(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", text)[:40] or "_"
+
+
+def _frame(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins: cProfile reports them as ('~', 0, "<built-in method ...>")
+        return name.replace(";", ",")
+    return f"{name} ({pathlib.Path(filename).name}:{line})".replace(";", ",")
+
+
+def collapse(stats: pstats.Stats, root: str | None = None, min_fraction: float = MIN_FRACTION) -> dict[str, int]:
+    """Collapsed stacks ("a;b;c" -> microseconds) rebuilt from a profile's call graph."""
+    entries = stats.stats
+    callees: dict[tuple, list[tuple[tuple, float]]] = defaultdict(list)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+    roots = [f for f, v in entries.items() if not v[4]]
+    total = sum(entries[f][3] for f in roots)
+    threshold = max(1e-6, total * min_fraction)
+    folded: dict[str, float] = defaultdict(float)
+    prefix = (root,) if root else ()
+    work = [((f,), entries[f][3]) for f in roots]
+    while work:
+        path, spent = work.pop()
+        func = path[-1]
+        _, _, tt, ct, _ = entries[func]
+        share = spent / ct if ct > 0 else 0.0
+        own = tt * share
+        for callee, edge_ct in callees.get(func, ()):
+            t = edge_ct * share
+            if t < threshold or callee in path:
+                # Too small to draw, or recursion already on this path: count it here
+                own += t
+            else:
+                work.append((path + (callee,), t))
+        folded[";".join(prefix + tuple(_frame(f) for f in path))] += own
+    return {stack: round(t * 1e6) for stack, t in folded.items() if round(t * 1e6) > 0}
+
+
+class CommandProfiler:
+    def __init__(self, directory: str | pathlib.Path = PROFILE_DIR, session: str | None = None, defer: bool = False):
+        name = session or f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{os.getpid()}"
+        self.dir = pathlib.Path(directory) / _safe(name)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.seq = 0
+        self.records: list[dict] = []
+        self.defer = defer
+        self.pending: list[tuple] = []
+
+    @contextlib.contextmanager
+    def command(self, cmd: str, seed: str = ""):
+        """Profile the body as one run of cmd on a working seed of len(seed)."""
+        prof = cProfile.Profile()
+        wall, cpu = time.perf_counter(), time.process_time()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            run = (cmd, len(seed or ""), prof, time.perf_counter() - wall, time.process_time() - cpu)
+            if self.defer:
+                self.pending.append(run)
+            else:
+                self._save(*run)
+
+    def flush(self):
+        """Write the profiles held back by defer=True."""
+        pending, self.pending = self.pending, []
+        for run in pending:
+            self._save(*run)
+
+    def _save(self, cmd: str, seed_len: int, prof: cProfile.Profile, wall: float, cpu: float):
+        self.seq += 1
+        stem = f"{self.seq:04d}_{_safe(cmd)}_len{seed_len}"
+        record = {"seq": self.seq, "command": cmd, "seed_length": seed_len, "seconds": wall, "cpu_seconds": cpu,
+                  "time": datetime.now().isoformat(timespec="seconds")}
+        try:
+            stats = pstats.Stats(prof)
+            stats.dump_stats(self.dir / f"{stem}.pstats")
+            folded = collapse(stats, root=f"{cmd}[len={seed_len}]")
+            (self.dir / f"{stem}.folded").write_text("".join(f"{s} {us}\n" for s, us in folded.items()), encoding="utf-8")
+            record.update(calls=stats.total_calls, pstats=f"{stem}.pstats", folded=f"{stem}.folded")
+            with open(self.dir / INDEX_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except (OSError, TypeError) as e:
+            logger.warning(f"Cannot write profile for '{cmd}': {e}")
+            return
+        self.records.append(record)
+        logger.debug(f"Profiled {cmd} (seed length {seed_len}): {wall:.3f}s wall, {cpu:.3f}s CPU -> {stem}.pstats")
+
+    def close(self):
+        self.flush()
+        if self.records:
+            print(format_summary(self.records))
+            print(f"Profiles in {self.dir}")
+
+
+class NoProfiler:
+    def command(self, cmd: str, seed: str = ""):
+        return contextlib.nullcontext()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_profiler(directory: str | pathlib.Path | None = None, session: str | None = None, defer: bool = False):
+    """A CommandProfiler writing under directory, or a no-op one when directory is None."""
+    if directory is None:
+        return NoProfiler()
+    return CommandProfiler(directory, session, defer)
+
+
+def read_index(directory: str | pathlib.Path) -> list[dict]:
+    records = []
+    with open(pathlib.Path(directory) / INDEX_FILE, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return records
+
+
+def format_summary(records: list[dict]) -> str:
+    """Per-command run count, wall / CPU totals, slowest run and its seed length."""
+    by_cmd: dict[str, list[dict]] = defaultdict(list)
+    for r in records:
+        by_cmd[r["command"]].append(r)
+    lines = [f"  {'command':<12}{'runs':>6}{'wall s':>10}{'cpu s':>10}{'max s':>10}{'max len':>9}"]
+    for cmd, runs in sorted(by_cmd.items(), key=lambda kv: -sum(r["seconds"] for r in kv[1])):
+        slowest = max(runs, key=lambda r: r["seconds"])
+        lines.append(f"  {cmd:<12}{len(runs):>6}{sum(r['seconds'] for r in runs):>10.3f}"
+                     f"{sum(r['cpu_seconds'] for r in runs):>10.3f}{slowest['seconds']:>10.3f}{slowest['seed_length']:>9}")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description="Summarise a session profile directory written by --profile.")
+    ap.add_argument('directory', help='A session directory under profiles/')
+    ap.add_argument('--command', help='Merge and print the pstats of this command')
+    ap.add_argument('--top', type=int, default=25, help='Functions to print with --command')
+    ap.add_argument('--sort', default='cumulative', help='pstats sort key (cumulative, tottime, calls, ...)')
+    args = ap.parse_args()
+
+    records = read_index(args.directory)
+    print(format_summary(records))
+    if args.command:
+        files = [str(pathlib.Path(args.directory) / r["pstats"]) for r in records if r["command"] == args.command]
+        if not files:
+            raise SystemExit(f"No profiles for '{args.command}' in {args.directory}")
+        print(f"\n{args.command}: {len(files)} runs merged")
+        pstats.Stats(*files).strip_dirs().sort_stats(args.sort).print_stats(args.top)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Declarative transform recipes for scripted SLF runs.
+
+A recipe is a text file with one step per line (blank lines and # comments
+are ignored):
+
+    phonetic c->k all        # explicit target, every occurrence
+    symbolic a best          # highest-weight target, every occurrence
+    symbolic t best first    # only the first occurrence (or: last)
+    acronym longest          # single longest acronym block (or: all)
+    dictionary top1          # best dictionary match, tracking up/down
+    reverse
+
+The recipe is compiled once against a headless TransformEngine: targets are
+resolved from the metadata up front, so each stage is a plain string
+function. Seeds are streamed from a file or stdin through a chain of
+generator stages and every node is written to stdout as a JSONL record in
+the seed_tree.jsonl format.
+
+Usage:
+    python slf_recipe.py recipe.txt seeds.txt > nodes.jsonl
+    cat seeds.txt | python slf_recipe.py recipe.txt --final-only
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import sys
+import time
+import uuid
+from slf_letter_kernel import calc_diff
+from slf_translate import Rewriter
+from slf_transform_combined import TransformEngine, normalize, now_iso
+
+CHAR_METHODS = ("symbolic", "phonetic")
+
+
+def parse_recipe(text: str) -> list[dict]:
+    steps = []
+    for n, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        words = line.replace("→", "->").split()
+        op, args = words[0].lower(), [w.lower() for w in words[1:]]
+        if op in CHAR_METHODS:
+            if not args:
+                raise ValueError(f"Recipe line {n}: '{op}' needs a letter")
+            src, _, tgt = args[0].partition("->")
+            rest = args[1:]
+            if "best" in rest:
+                rest.remove("best")
+                tgt = tgt or None
+            where = rest[0] if rest else "all"
+            if len(src) != 1 or where not in ("all", "first", "last") or len(rest) > 1:
+                raise ValueError(f"Recipe line {n}: expected '{op} x[->target] [best] [all|first|last]'")
+            steps.append({"op": op, "source": src, "target": tgt or None, "where": where, "line": n})
+        elif op == "acronym":
+            mode = args[0] if args else "longest"
+            if mode not in ("longest", "all"):
+                raise ValueError(f"Recipe line {n}: acronym mode must be 'longest' or 'all'")
+            steps.append({"op": op, "mode": mode, "line": n})
+        elif op == "dictionary":
+            if args and args[0] != "top1":
+                raise ValueError(f"Recipe line {n}: only 'dictionary top1' is supported")
+            steps.append({"op": op, "line": n})
+        elif op == "reverse":
+            steps.append({"op": op, "line": n})
+        else:
+            raise ValueError(f"Recipe line {n}: unknown step '{op}'")
+    return steps
+
+
+def _char_stage(engine: TransformEngine, step: dict):
+    src, tgt = step["source"], step["target"]
+    opts = engine.get_options(src, step["op"])
+    if tgt is None:
+        if opts.empty:
+            raise ValueError(f"Recipe line {step['line']}: no {step['op']} transforms for '{src}'")
+        tgt = opts.iloc[0]["target"]
+    elif tgt not in set(opts["target"]):
+        raise ValueError(f"Recipe line {step['line']}: '{src}->{tgt}' is not a {step['op']} transform")
+    rw = Rewriter({src: tgt})
+    where = step["where"]
+    method = f"{step['op']}_all" if where == "all" else step["op"]
+
+    def apply(seed: str):
+        if src not in seed:
+            return None
+        if where == "all":
+            out = rw.apply(seed)
+        elif where == "first":
+            out = seed.replace(src, tgt, 1)
+        else:
+            head, _, tail = seed.rpartition(src)
+            out = head + tgt + tail
+        return out, "", ""
+    return method, apply
+
+
+def _acronym_stage(engine: TransformEngine, step: dict):
+    best = {src: rows.sort_values("weight", ascending=False, kind="stable").iloc[0]["target"]
+            for src, rows in engine._acronym_groups().items()}
+    longest = max((len(k) for k in best), default=0)
+
+    def longest_at(seed: str, i: int):
+        for j in range(min(len(seed), i + longest), i + 1, -1):
+            if seed[i:j] in best:
+                return seed[i:j]
+        return None
+
+    def apply(seed: str):
+        if step["mode"] == "longest":
+            found = [(blk, i) for i in range(len(seed)) if (blk := longest_at(seed, i))]
+            if not found:
+                return None
+            blk, i = max(found, key=lambda f: (len(f[0]), -f[1]))
+            return seed[:i] + best[blk] + seed[i + len(blk):], "", ""
+        out, i, changed = [], 0, False
+        while i < len(seed):
+            blk = longest_at(seed, i)
+            if blk:
+                out.append(best[blk])
+                i += len(blk)
+                changed = True
+            else:
+                out.append(seed[i])
+                i += 1
+        return ("".join(out), "", "") if changed else None
+    return "acronym", apply
+
+
+def _dictionary_stage(engine: TransformEngine, step: dict):
+    def apply(seed: str):
+        cands = engine.dictionary_candidates(seed, limit=1)
+        if not cands:
+            return None
+        frag, word, pos, up, down = cands[0]
+        return seed[:pos] + word + seed[pos + len(frag):], up, down
+    return "dictionary", apply
+
+
+def _reverse_stage(engine: TransformEngine, step: dict):
+    return "reverse", lambda seed: (seed[::-1], "", "")
+
+
+STAGES = {
+    "symbolic": _char_stage,
+    "phonetic": _char_stage,
+    "acronym": _acronym_stage,
+    "dictionary": _dictionary_stage,
+    "reverse": _reverse_stage,
+}
+
+
+class Pipeline:
+    """A compiled recipe: seeds in, chains of seed_tree-style node records out."""
+
+    def __init__(self, engine: TransformEngine, steps: list[dict], author: str = "recipe", branch: str = "main"):
+        self.stages = [STAGES[s["op"]](engine, s) for s in steps]
+        self.author = author
+        self.branch = branch
+        self.session_id = f"{now_iso()}_{author.replace(' ', '_')}"
+        self.id_base = str(uuid.uuid4())
+        self.id_count = 10
+
+    def _node(self, parent: dict | None, source: str, target: str, method: str, up: str, down: str, started: float) -> dict:
+        self.id_count += 1
+        return {
+            "id": f"{self.id_base}-{self.id_count}",
+            "parent_id": parent["id"] if parent else None,
+            "session_id": self.session_id,
+            "branch": self.branch,
+            "author": self.author,
+            "timestamp": now_iso(),
+            "duration": f"{round(time.time() - started, 3)}s",
+            "step": parent["step"] + 1 if parent else 1,
+            "source": source,
+            "target": target,
+            "up_seed": up,
+            "down_seed": down,
+            "method": method,
+            "diff": calc_diff(source, target),
+            "description": ""
+        }
+
+    def _roots(self, lines):
+        for line in lines:
+            seed = normalize(line.strip())
+            if seed:
+                yield [self._node(None, "root", seed, "root", "", "", time.time())]
+
+    def _stage(self, method: str, apply, chains):
+        for chain in chains:
+            last = chain[-1]
+            started = time.time()
+            res = apply(last["target"])
+            if res is not None and res[0] != last["target"]:
+                target, up, down = res
+                chain.append(self._node(last, last["target"], target, method,
+                                        last["up_seed"] + up, last["down_seed"] + down, started))
+            yield chain
+
+    def run(self, lines):
+        """Yield one node chain per input seed; only one chain is in flight at a time."""
+        chains = self._roots(lines)
+        for method, apply in self.stages:
+            chains = self._stage(method, apply, chains)
+        return chains
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description="Stream seeds through a compiled SLF recipe.")
+    ap.add_argument('recipe', help='Recipe file')
+    ap.add_argument('input', nargs='?', help='Seed file, one seed per line (default: stdin)')
+    ap.add_argument('-m', '--metadata', nargs='+', default=['character_transforms.parquet', 'acronym_transforms.parquet', 'phonetic_transforms.parquet'])
+    ap.add_argument('--author', default='recipe')
+    ap.add_argument('--branch', default='main')
+    ap.add_argument('--final-only', action='store_true', help='Emit only the last node of each chain')
+    ap.add_argument('--line-buffered', action='store_true', help='Flush after every seed')
+    args = ap.parse_args()
+
+    with open(args.recipe, encoding="utf-8") as f:
+        try:
+            steps = parse_recipe(f.read())
+        except ValueError as e:
+            raise SystemExit(str(e))
+    engine = TransformEngine.headless(args.metadata)
+    try:
+        pipeline = Pipeline(engine, steps, args.author, args.branch)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    src = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    out = sys.stdout
+    try:
+        for chain in pipeline.run(src):
+            for node in (chain[-1:] if args.final_only else chain):
+                out.write(json.dumps(node, ensure_ascii=False) + "\n")
+            if args.line_buffered:
+                out.flush()
+    finally:
+        if src is not sys.stdin:
+            src.close()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Deterministic replay of recorded SLF sessions.
+
+Every committed node in the log records source, target, method, up/down
+seeds and branch. For each node, replay works out the command and the
+answers to its prompts (letter, option number, position, ...) that turn
+the source into the recorded target under the current metadata and
+wordlist. It then runs that command through the engine's own transform
+method on a headless engine, with the prompts answered from the script
+and the output discarded, so nothing waits on a person or a terminal.
+
+Step outcomes:
+
+    match      the command reproduced the recorded target
+    diverged   the recorded result is no longer offered (an option,
+               acronym row or dictionary word is gone), or the command now
+               yields a different target; the first offer at the same spot
+               is reported as what the operation yields now
+    noop       source and target are equal; nothing to run
+    skipped    the method only moves state around (select, undo, redo) or
+               the log does not say what it was
+
+Each step starts from its recorded source, so one divergence does not
+cascade into the rest of the session. Step timings cover running the
+command only, not working out its script, and the engine's lazy indexes
+are built before the first pass. --repeat replays the log several times
+to use it as a benchmark workload, and --profile records every replayed
+command the way slf_profile.py does for a live session.
+
+Exits with status 1 when any step diverges.
+
+Usage:
+    python slf_replay.py seed_tree.jsonl
+    python slf_replay.py seed_tree.jsonl --session 2025-07-01T11:12:53Z_me -v
+    python slf_replay.py seed_tree.d --repeat 100 --json replay_report.json
+    python slf_replay.py seed_tree.jsonl --profile
+"""
+
+from __future__ import annotations
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import logging
+import sys
+import time
+from collections import defaultdict, deque
+from slf_segment_log import open_node_log
+from slf_translate import Rewriter
+
+logger = logging.getLogger("SLF-Replay")
+
+STATE_ONLY = ("select_up", "select_down", "select_working", "undo", "redo", "")
+
+
+class ScriptExhausted(EOFError):
+    pass
+
+
+def sessions(nodes) -> dict[str, list[dict]]:
+    """Nodes grouped by session id, each session in log order."""
+    out: dict[str, list[dict]] = defaultdict(list)
+    for n in nodes:
+        out[n.get("session_id", "")].append(n)
+    return dict(out)
+
+
+def _substitutions(s: str, t: str) -> list[tuple[int, str]]:
+    """(pos, replacement) for every way t is s with the single character at pos replaced."""
+    d = len(t) - len(s) + 1
+    if d < 0:
+        return []
+    return [(p, t[p:p + d]) for p in range(len(s)) if s[:p] == t[:p] and s[p + 1:] == t[p + d:]]
+
+
+def _splice(s: str, pos: int, length: int, text: str) -> str:
+    return s[:pos] + text + s[pos + length:]
+
+
+class SessionReplayer:
+    def __init__(self, engine):
+        self.engine = engine
+        # The engine's module: its dispatch table and the prompt() its methods call
+        self.module = sys.modules[type(engine).__module__]
+        self._answers: deque[str] = deque()
+
+    # --- scripted prompts ---
+    def _answer(self, message="", **kwargs) -> str:
+        if not self._answers:
+            raise ScriptExhausted(str(message))
+        return self._answers.popleft()
+
+    @contextlib.contextmanager
+    def _scripted(self, answers: list[str]):
+        self._answers = deque(answers)
+        saved_prompt, saved_input = self.module.prompt, builtins.input
+        self.module.prompt = builtins.input = self._answer
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                yield
+        finally:
+            self.module.prompt, builtins.input = saved_prompt, saved_input
+
+    def warm(self):
+        """Build the engine's lazy indexes so the first replayed command does not pay for them."""
+        e = self.engine
+        if e.wordlist:
+            e._subsequence_index()
+            e._anagram_index()
+            e._phonetic_index()
+        e._reverse_index()
+
+    # --- working out the command for a node ---
+    def plan(self, method: str, s: str, t: str) -> tuple[str | None, list[str], str | None]:
+        """(command, answers, divergence reason) reproducing s -> t with method, if it can be found."""
+        e = self.engine
+        if method in ("symbolic", "phonetic"):
+            fallback = None
+            for pos, x in _substitutions(s, t):
+                c = s[pos]
+                targets = list(e.get_options(c, method)["target"])
+                if not targets:
+                    continue
+                rank = targets.index(x) + 1 if x in targets else None
+                answers = [c, str(rank or 1)]
+                positions = e.seed_buf.positions(c)
+                if method == "phonetic" or len(positions) > 1:
+                    answers.append(str(positions.index(pos) + 1))
+                cmd = "1a" if method == "symbolic" else "1b"
+                if rank:
+                    return cmd, answers, None
+                fallback = fallback or (cmd, answers, f"no {method} option {c}→{x}")
+            return fallback or (None, [], f"no {method} options for the changed letter")
+        if method == "symbolic_all":
+            for c in sorted(set(s)):
+                targets = list(e.get_options(c, "symbolic")["target"])
+                for rank, x in enumerate(targets, 1):
+                    if Rewriter({c: x}).apply(s) == t:
+                        return "1a", [c, str(rank), "a"], None
+            return None, [], "no symbolic option rewrites every occurrence to the recorded target"
+        if method == "acronym":
+            blocks = e.acronym_blocks(s)
+            for bi, (blk, pos, rows) in enumerate(blocks, 1):
+                for xi, x in enumerate(rows["target"], 1):
+                    if _splice(s, pos, len(blk), x) == t:
+                        return "1c", [f"{bi} {xi}"], None
+            return ("1c", ["1 1"], "no acronym row yields the recorded target") if blocks else (None, [], "no acronym blocks")
+        if method == "dictionary":
+            cands = e.dictionary_candidates(s)
+            for i, (frag, word, pos, _, _) in enumerate(cands, 1):
+                if _splice(s, pos, len(frag), word) == t:
+                    return "1d", [str(i)], None
+            return ("1d", ["1"], "recorded word is no longer a candidate") if cands else (None, [], "no dictionary candidates")
+        if method == "phonetic_word":
+            matches = e.sound_matches(s)[:e.PICKS_SHOWN]
+            for i, (frag, pos, word) in enumerate(matches, 1):
+                if _splice(s, pos, len(frag), word) == t:
+                    return "15", [str(i)], None
+            return ("15", ["1"], "recorded word no longer sounds alike") if matches else (None, [], "no sound-alike words")
+        if method == "backward_all":
+            return "16", ["a"], None
+        if method.startswith("backward_"):
+            props = e.backward_proposals(s)[:e.PICKS_SHOWN]
+            for i, (pos, tgt, src, m, _) in enumerate(props, 1):
+                if m == method[len("backward_"):] and _splice(s, pos, len(tgt), src) == t:
+                    return "16", [str(i)], None
+            return ("16", ["1"], "recorded span no longer collapses to that source") if props else (None, [], "no target spans")
+        if method == "reverse":
+            return "2", [], None
+        if method == "manual":
+            return "3", [t], None
+        if method == "manual_up":
+            d = len(t) - len(s)
+            for pos in range(len(s) + 1):
+                if d > 0 and t[:pos] == s[:pos] and t[pos + d:] == s[pos:]:
+                    return "4", [t[pos:pos + d], str(pos + 1)], None
+            return None, [], "target is not the source with letters inserted"
+        if method == "manual_down":
+            for pos in range(len(s)):
+                if s[:pos] + s[pos + 1:] == t:
+                    return "5", [s[pos], str(e.seed_buf.positions(s[pos]).index(pos) + 1)], None
+            return None, [], "target is not the source with one letter removed"
+        return None, [], None
+
+    # --- running ---
+    def _reset(self, seed: str):
+        e = self.engine
+        e.seed_buf.reset(seed)
+        e.prev_working_seed = seed
+        e.up_seed = e.down_seed = ""
+        e.last_action_method = None
+
+    def step(self, node: dict) -> dict:
+        method = node.get("method") or ""
+        s, t = node.get("source", ""), node.get("target", "")
+        out = {"id": node.get("id"), "session_id": node.get("session_id"), "step": node.get("step"),
+               "method": method, "source": s, "expected": t}
+        seconds = 0.0
+        if method == "root":
+            out["status"] = "root"
+        elif s == t:
+            out["status"] = "noop"
+        elif method in STATE_ONLY:
+            out["status"] = "skipped"
+        else:
+            self._reset(s)
+            cmd, answers, reason = self.plan(method, s, t)
+            if cmd is None and reason is None:
+                out["status"] = "skipped"
+            else:
+                got = None
+                if cmd is not None:
+                    start = time.perf_counter()
+                    try:
+                        with self._scripted(answers):
+                            self.module.dispatch(self.engine, cmd)
+                        got = self.engine.working_seed
+                    except ScriptExhausted as ex:
+                        reason = reason or f"command asked for more input ({ex})"
+                    finally:
+                        seconds = time.perf_counter() - start
+                        # --profile holds the profile back until the timer has stopped
+                        self.engine.profiler.flush()
+                out["command"], out["answers"], out["got"] = cmd, answers, got
+                if reason is None and got != t:
+                    reason = "same operation now yields a different target"
+                out["status"] = "diverged" if reason else "match"
+                if reason:
+                    out["reason"] = reason
+        out["seconds"] = seconds
+        return out
+
+    def replay(self, nodes: list[dict]) -> list[dict]:
+        return [self.step(n) for n in nodes]
+
+
+def summarize(results: list[dict], elapsed: float, passes: int = 1) -> dict:
+    counts: dict[str, int] = defaultdict(int)
+    per_method: dict[str, list[float]] = defaultdict(list)
+    for r in results:
+        counts[r["status"]] += 1
+        if r["status"] in ("match", "diverged"):
+            per_method[r["method"]].append(r["seconds"])
+    executed = sum(len(v) for v in per_method.values())
+    methods = {}
+    for m, secs in sorted(per_method.items()):
+        secs = sorted(secs)
+        methods[m] = {"steps": len(secs), "mean_ms": 1000 * sum(secs) / len(secs),
+                      "p95_ms": 1000 * secs[min(len(secs) - 1, int(0.95 * len(secs)))]}
+    return {
+        "steps": len(results) // passes,
+        "passes": passes,
+        "sessions": len({r["session_id"] for r in results}),
+        "counts": {k: v // passes for k, v in counts.items()},
+        "seconds": elapsed,
+        "steps_per_second": len(results) / elapsed if elapsed else 0.0,
+        "executed_per_second": executed / elapsed if elapsed else 0.0,
+        "methods": methods,
+        "divergences": [r for r in results[:len(results) // passes] if r["status"] == "diverged"],
+    }
+
+
+def format_summary(summary: dict) -> str:
+    passes = f" x{summary['passes']}" if summary["passes"] > 1 else ""
+    lines = [
+        f"Replayed {summary['steps']} steps from {summary['sessions']} sessions{passes} in {summary['seconds']:.3f}s "
+        f"({summary['steps_per_second']:.0f} steps/s, {summary['executed_per_second']:.0f} commands/s)",
+        "  " + "  ".join(f"{k} {v}" for k, v in sorted(summary["counts"].items())),
+    ]
+    if summary["methods"]:
+        lines.append(f"  {'method':<16}{'steps':>7}{'mean ms':>10}{'p95 ms':>10}")
+        for m, st in summary["methods"].items():
+            lines.append(f"  {m:<16}{st['steps']:>7}{st['mean_ms']:>10.3f}{st['p95_ms']:>10.3f}")
+    if summary["divergences"]:
+        lines.append("Divergences:")
+        for r in summary["divergences"]:
+            now = f" (now: {r['got']})" if r.get("got") is not None else ""
+            lines.append(f"  {r['session_id']} step {r['step']} {r['id']}: {r['method']} "
+                         f"{r['source']} → {r['expected']}; {r['reason']}{now}")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    from slf_profile import PROFILE_DIR, open_profiler
+    from slf_transform_combined import TransformEngine
+
+    ap = argparse.ArgumentParser(description="Re-run recorded sessions headlessly and report divergences and throughput.")
+    ap.add_argument('log', nargs='?', default='seed_tree.jsonl', help='Node log: a JSONL file or a segmented log directory')
+    ap.add_argument('-m', '--metadata', nargs='+', default=['character_transforms.parquet', 'acronym_transforms.parquet', 'phonetic_transforms.parquet'])
+    ap.add_argument('--session', action='append', help='Replay only this session id (repeatable)')
+    ap.add_argument('--repeat', type=int, default=1, help='Replay the log this many times (benchmark)')
+    ap.add_argument('--json', help='Write the full report here')
+    ap.add_argument('-v', '--verbose', action='store_true', help='Print every step')
+    ap.add_argument('--profile', nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                    help='Profile every replayed command into a session directory under DIR')
+    args = ap.parse_args()
+
+    log = open_node_log(args.log)
+    grouped = sessions(log.iter_nodes())
+    log.close()
+    if args.session:
+        grouped = {sid: grouped[sid] for sid in args.session if sid in grouped}
+    nodes = [n for group in grouped.values() for n in group]
+    if not nodes:
+        raise SystemExit(f"No nodes to replay in {args.log}")
+
+    engine = TransformEngine.headless(args.metadata)
+    engine.profiler = open_profiler(args.profile, f"replay_{time.strftime('%Y%m%dT%H%M%S')}", defer=True)
+    replayer = SessionReplayer(engine)
+    replayer.warm()
+    results: list[dict] = []
+    start = time.perf_counter()
+    for _ in range(max(1, args.repeat)):
+        results += replayer.replay(nodes)
+    summary = summarize(results, time.perf_counter() - start, max(1, args.repeat))
+
+    if args.verbose:
+        for r in results[:len(nodes)]:
+            script = f" [{r['command']} {' | '.join(r['answers'])}]" if r.get("command") else ""
+            print(f"{r['status']:<9}{r['session_id']} step {r['step']}: {r['method']} {r['source']} → {r['expected']}{script}")
+    print(format_summary(summary))
+    engine.profiler.close()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**summary, "results": results[:len(nodes)]}, f, ensure_ascii=False, indent=2)
+    sys.exit(1 if summary["divergences"] else 0)
@@ -0,0 +1,54 @@
+"""
+Reverse (target -> source) transform index for backward decoding.
+
+Forward lookups go from a source letter or block to its targets; decoding
+an observed word needs the opposite. ReverseIndex groups the metadata rows
+by target (best weight first) and builds a WordAutomaton over every
+distinct target, so a single pass over a seed finds each span that some
+transform could have produced, multi-letter targets included
+("unitedstates" -> "us", "man" -> "a").
+
+collapse() picks non-overlapping spans left to right, longest first, and
+replaces each with its highest-weight source.
+"""
+
+from __future__ import annotations
+import pandas as pd
+from slf_embedded import WordAutomaton
+
+REVERSE_METHODS = ("symbolic", "phonetic", "acronym")
+MIN_SPAN = 2  # single letters match nearly everywhere; ask for them explicitly
+
+
+class ReverseIndex:
+    def __init__(self, frame: pd.DataFrame, methods=REVERSE_METHODS):
+        rows = frame[frame["method"].isin(methods) & frame["target"].notna() & (frame["target"] != "")]
+        rows = rows[rows["target"] != rows["source"]].sort_values("weight", ascending=False, kind="stable")
+        # groupby keeps the row order within each group, so every group is best weight first
+        self.by_target: dict[str, pd.DataFrame] = dict(tuple(rows.groupby("target", sort=False)))
+        self.targets = list(self.by_target)
+        self.automaton = WordAutomaton(self.targets)
+
+    def sources(self, target: str, method: str | None = None) -> pd.DataFrame:
+        rows = self.by_target.get(target)
+        if rows is None:
+            return pd.DataFrame(columns=["source", "target", "method", "weight"])
+        return rows[rows["method"] == method] if method else rows
+
+    def spans(self, seed: str, min_len: int = MIN_SPAN) -> list[tuple[int, str, pd.DataFrame]]:
+        """(start, target, source rows) for every target occurring in seed, in one pass."""
+        return [(start, tgt, self.by_target[tgt]) for start, tgt in self.automaton.find(seed) if len(tgt) >= min_len]
+
+    def collapse(self, seed: str, min_len: int = MIN_SPAN) -> tuple[str, list[tuple[int, str, str]]]:
+        """Seed with non-overlapping target spans replaced by their best source, and the (pos, target, source) used."""
+        out, used, end = [], [], 0
+        for start, tgt, rows in self.spans(seed, min_len):
+            # spans() is ordered by start, longest first, so the first span at each start wins
+            if start < end:
+                continue
+            src = rows.iloc[0]["source"]
+            out.append(seed[end:start] + src)
+            used.append((start, tgt, src))
+            end = start + len(tgt)
+        out.append(seed[end:])
+        return "".join(out), used
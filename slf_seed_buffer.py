@@ -0,0 +1,156 @@
+"""
+Chunked working-seed buffer with per-character position indexes and an
+undo/redo history.
+
+The text is held as a list of bounded chunks, each with its own letter
+Counter. An edit only re-splits the chunks it touches, so inserting,
+deleting or replacing a few characters in a long passage costs
+O(chunk + number of chunks) instead of copying the whole string, and
+positions(ch) skips every chunk that does not contain ch. Each edit is
+recorded as a list of (pos, removed, inserted) steps, which is all
+undo/redo needs; the caller can annotate() an edit with its own state,
+which undo()/redo() hand back.
+"""
+
+from __future__ import annotations
+from collections import Counter, deque
+
+
+def _common_prefix(a: str, b: str) -> int:
+    # Bisect on slice equality so the comparison itself runs in C
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class SeedBuffer:
+    def __init__(self, text: str = "", chunk_size: int = 512, history: int = 1000):
+        self.chunk_size = chunk_size
+        self.undo_stack: deque = deque(maxlen=history)
+        self.redo_stack: deque = deque(maxlen=history)
+        self.edits = 0  # edits recorded so far, so callers can tell whether a call made one
+        self._load(text)
+
+    def _load(self, text: str):
+        n = self.chunk_size
+        self.chunks = [text[i:i+n] for i in range(0, len(text), n)] or [""]
+        self.counts = [Counter(c) for c in self.chunks]
+        self.length = len(text)
+        self._text = text
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        if self._text is None:
+            self._text = "".join(self.chunks)
+        return self._text
+
+    def _locate(self, pos: int) -> tuple[int, int]:
+        """Chunk index and offset holding pos (end of text maps into the last chunk)."""
+        for i, c in enumerate(self.chunks):
+            if pos < len(c):
+                return i, pos
+            pos -= len(c)
+        return len(self.chunks) - 1, len(self.chunks[-1]) + pos
+
+    def _splice(self, pos: int, length: int, text: str) -> str:
+        i, off = self._locate(pos)
+        j, end = i, off + length
+        region = self.chunks[i]
+        while end > len(region) and j + 1 < len(self.chunks):
+            j += 1
+            region += self.chunks[j]
+        removed = region[off:end]
+        region = region[:off] + text + region[end:]
+        # Fold a short remainder into its neighbour so chunks do not fragment
+        if len(region) < self.chunk_size // 2 and j + 1 < len(self.chunks):
+            j += 1
+            region += self.chunks[j]
+        # Split evenly so a region just over the limit does not leave a sliver
+        parts = -(-len(region) // self.chunk_size)
+        n = -(-len(region) // parts) if parts else 1
+        new_chunks = [region[k:k+n] for k in range(0, len(region), n)]
+        if not new_chunks and len(self.chunks) == j - i + 1:
+            new_chunks = [""]
+        self.chunks[i:j+1] = new_chunks
+        self.counts[i:j+1] = [Counter(c) for c in new_chunks]
+        self.length += len(text) - len(removed)
+        self._text = None
+        return removed
+
+    def _record(self, steps: list):
+        self.undo_stack.append([steps, None])
+        self.redo_stack.clear()
+        self.edits += 1
+
+    def annotate(self, state):
+        """Attach state to the newest edit; undo() and redo() return it with the edit."""
+        if self.undo_stack:
+            self.undo_stack[-1][1] = state
+
+    def replace(self, pos: int, length: int, text: str):
+        """Replace length characters at pos with text as one undoable edit."""
+        removed = self._splice(pos, length, text)
+        self._record([(pos, removed, text)])
+
+    def insert(self, pos: int, text: str):
+        self.replace(pos, 0, text)
+
+    def delete(self, pos: int, length: int = 1):
+        self.replace(pos, length, "")
+
+    def assign(self, text: str):
+        """Set the whole text as one undoable edit covering only the changed middle."""
+        old = str(self)
+        if text == old:
+            return
+        start = _common_prefix(old, text)
+        end = _common_prefix(old[start:][::-1], text[start:][::-1])
+        self.replace(start, len(old) - start - end, text[start:len(text) - end])
+
+    def reset(self, text: str):
+        """Replace the text and drop the edit history (used when moving between nodes)."""
+        self._load(text)
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def undo(self) -> list | None:
+        """Revert the newest edit; its [steps, state] entry, or None if there is nothing to undo."""
+        if not self.undo_stack:
+            return None
+        entry = self.undo_stack.pop()
+        for pos, removed, inserted in reversed(entry[0]):
+            self._splice(pos, len(inserted), removed)
+        self.redo_stack.append(entry)
+        return entry
+
+    def redo(self) -> list | None:
+        if not self.redo_stack:
+            return None
+        entry = self.redo_stack.pop()
+        for pos, removed, inserted in entry[0]:
+            self._splice(pos, len(removed), inserted)
+        self.undo_stack.append(entry)
+        return entry
+
+    def count(self, ch: str) -> int:
+        return sum(c[ch] for c in self.counts)
+
+    def positions(self, ch: str) -> list[int]:
+        """Sorted positions of the single character ch."""
+        out = []
+        base = 0
+        for chunk, cnt in zip(self.chunks, self.counts):
+            if cnt[ch]:
+                k = chunk.find(ch)
+                while k != -1:
+                    out.append(base + k)
+                    k = chunk.find(ch, k + 1)
+            base += len(chunk)
+        return out
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Node log storage for SLF.
+
+JsonlNodeLog is the original single seed_tree.jsonl file. SegmentedNodeLog
+splits the same records into fixed-size segments under a directory:
+
+    seed_tree.d/segment-000001.parquet     closed, compacted
+    seed_tree.d/segment-000001.idx.json    sidecar index
+    seed_tree.d/segment-000002.jsonl       active, append-only
+
+Each sidecar holds id -> offset (byte offset for JSONL, row number once
+compacted), parent -> ids and the min/max timestamp of its segment, so
+point lookups, child lookups and time-range reads open only the segments
+that can contain a match. When the active segment passes segment_bytes it
+is closed and a background thread compacts it into a zstd Parquet file,
+which keeps each node's original JSON line next to the typed columns.
+
+Both classes expose append / iter_nodes / get / children / is_empty, and
+open_node_log() picks one from the path (a directory or a '.d' suffix
+means segmented). The export command writes the segments back out as a
+single JSONL file in the original line format.
+
+Usage:
+    python slf_segment_log.py import seed_tree.jsonl --dir seed_tree.d
+    python slf_segment_log.py export --dir seed_tree.d -o seed_tree.jsonl
+    python slf_segment_log.py compact --dir seed_tree.d
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import pathlib
+import sys
+import threading
+from collections import OrderedDict
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger("SLF-Log")
+
+SEGMENT_BYTES = 4 << 20
+ROOT_KEY = ""  # sidecar key for parent_id None
+RAW_COLUMN = "_json"  # exact JSONL line of each node in a compacted segment
+
+
+def _dumps(node: dict) -> str:
+    return json.dumps(node, ensure_ascii=False)
+
+
+def _segment_table(lines: list[str], nodes: list[dict]) -> pa.Table:
+    """Columns for the union of the segment's keys plus the raw line of every node.
+
+    The typed columns are for analytics readers; a node missing a key gets
+    a null there, so reads go through the raw column and get back exactly
+    the keys that were logged. A key whose values mix types is stored as
+    JSON text.
+    """
+    keys = [k for k in dict.fromkeys(k for n in nodes for k in n) if k != RAW_COLUMN]
+    columns = {}
+    for k in keys:
+        values = [n.get(k) for n in nodes]
+        try:
+            columns[k] = pa.array(values)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            columns[k] = pa.array([None if v is None else json.dumps(v, ensure_ascii=False) for v in values], type=pa.string())
+    columns[RAW_COLUMN] = pa.array(lines, type=pa.string())
+    return pa.table(columns)
+
+
+class JsonlNodeLog:
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+
+    def append(self, node: dict):
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(_dumps(node) + "\n")
+
+    def append_many(self, nodes: list[dict]):
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write("".join(_dumps(n) + "\n" for n in nodes))
+
+    def iter_nodes(self):
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except Exception as e:
+                    logger.warning(f"Skipping invalid log line: {e}")
+
+    def get(self, node_id: str) -> dict | None:
+        found = None
+        for n in self.iter_nodes():
+            if n.get("id") == node_id:
+                found = n
+        return found
+
+    def children(self, parent_id: str | None) -> list[dict]:
+        return [n for n in self.iter_nodes() if n.get("parent_id") == parent_id]
+
+    def is_empty(self) -> bool:
+        return not self.path.exists() or self.path.stat().st_size == 0
+
+    def close(self):
+        pass
+
+
+class _Segment:
+    def __init__(self, root: pathlib.Path, number: int):
+        self.number = number
+        self.stem = root / f"segment-{number:06d}"
+        self.ids: dict[str, int] = {}
+        self.parents: dict[str, list[str]] = {}
+        self.min_ts: str | None = None
+        self.max_ts: str | None = None
+        self.count = 0
+        self.format = "jsonl"
+        self.loaded = False
+
+    @property
+    def data_path(self) -> pathlib.Path:
+        return self.stem.with_suffix(".parquet" if self.format == "parquet" else ".jsonl")
+
+    @property
+    def index_path(self) -> pathlib.Path:
+        return self.stem.with_suffix(".idx.json")
+
+    def add(self, node: dict, where: int):
+        nid = node.get("id")
+        self.ids[nid] = where
+        self.parents.setdefault(node.get("parent_id") or ROOT_KEY, []).append(nid)
+        ts = node.get("timestamp")
+        if ts:
+            self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+            self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+        self.count += 1
+
+    def save_index(self):
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "format": self.format, "count": self.count,
+            "min_ts": self.min_ts, "max_ts": self.max_ts,
+            "ids": self.ids, "parents": self.parents,
+        }), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def load_index(self):
+        if self.loaded:
+            return
+        meta = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self.format = meta["format"]
+        self.count = meta["count"]
+        self.min_ts, self.max_ts = meta["min_ts"], meta["max_ts"]
+        self.ids, self.parents = meta["ids"], meta["parents"]
+        self.loaded = True
+
+    def scan(self):
+        """Rebuild the index of a JSONL segment from its data (used for the active segment)."""
+        self.ids, self.parents, self.count = {}, {}, 0
+        self.min_ts = self.max_ts = None
+        if self.data_path.exists():
+            with self.data_path.open("rb") as f:
+                pos = 0
+                for raw in f:
+                    if raw.strip():
+                        try:
+                            self.add(json.loads(raw), pos)
+                        except ValueError as e:
+                            logger.warning(f"Skipping invalid log line: {e}")
+                    pos += len(raw)
+        self.loaded = True
+
+
+class SegmentedNodeLog:
+    def __init__(self, root: str | pathlib.Path, segment_bytes: int = SEGMENT_BYTES, background: bool = True):
+        self.root = pathlib.Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.background = background
+        self.lock = threading.RLock()
+        self._tables: OrderedDict = OrderedDict()
+        numbers = sorted({int(p.name[8:14]) for p in self.root.glob("segment-*.*")})
+        self.segments: list[_Segment] = []
+        for num in numbers:
+            seg = _Segment(self.root, num)
+            if seg.stem.with_suffix(".parquet").exists():
+                seg.format = "parquet"
+            self.segments.append(seg)
+        if not self.segments or self.segments[-1].format == "parquet" or self.segments[-1].index_path.exists():
+            # Only closed segments have a sidecar; otherwise keep appending to the last one
+            self.segments.append(_Segment(self.root, (numbers[-1] if numbers else 0) + 1))
+        self.active = self.segments[-1]
+        self.active.scan()
+        self._compactor: threading.Thread | None = None
+        if background:
+            self._start_compaction()
+
+    # --- writes ---
+    def append(self, node: dict):
+        data = (_dumps(node) + "\n").encode("utf-8")
+        with self.lock:
+            seg = self.active
+            with seg.data_path.open("ab") as f:
+                pos = f.tell()
+                f.write(data)
+            seg.add(node, pos)
+            if pos + len(data) >= self.segment_bytes:
+                self.rotate()
+
+    def append_many(self, nodes: list[dict]):
+        with self.lock:
+            for node in nodes:
+                self.append(node)
+
+    def rotate(self):
+        """Close the active segment and open a new one."""
+        with self.lock:
+            if self.active.count == 0:
+                return
+            self.active.save_index()
+            self.active = _Segment(self.root, self.active.number + 1)
+            self.active.loaded = True
+            self.segments.append(self.active)
+        if self.background:
+            self._start_compaction()
+
+    # --- compaction ---
+    def _start_compaction(self):
+        if self._compactor and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self.compact_closed, daemon=True)
+        self._compactor.start()
+
+    def compact_closed(self):
+        for seg in list(self.segments[:-1]):
+            if seg.format == "jsonl":
+                try:
+                    self.compact(seg)
+                except Exception as e:
+                    logger.warning(f"Compaction of {seg.data_path.name} failed: {e}")
+
+    def compact(self, seg: _Segment):
+        """Rewrite a closed JSONL segment as zstd Parquet and swap its index to row numbers."""
+        seg.load_index()
+        src = seg.data_path
+        lines = list(self._read_lines(src))
+        nodes = [json.loads(line) for line in lines]
+        table = _segment_table(lines, nodes)
+        dst = seg.stem.with_suffix(".parquet")
+        tmp = dst.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        rows = {n.get("id"): i for i, n in enumerate(nodes)}
+        with self.lock:
+            os.replace(tmp, dst)
+            seg.format = "parquet"
+            seg.ids = rows
+            seg.save_index()
+            src.unlink()
+
+    def wait_for_compaction(self):
+        if self._compactor:
+            self._compactor.join()
+
+    # --- reads ---
+    def _read_lines(self, path: pathlib.Path, start: int = 0):
+        """Text of every valid JSON line, without its newline."""
+        with path.open("rb") as f:
+            f.seek(start)
+            for raw in f:
+                if raw.strip():
+                    try:
+                        json.loads(raw)
+                    except ValueError as e:
+                        logger.warning(f"Skipping invalid log line: {e}")
+                        continue
+                    yield raw.decode("utf-8").rstrip("\r\n")
+
+    def _read_jsonl(self, path: pathlib.Path, start: int = 0):
+        for line in self._read_lines(path, start):
+            yield json.loads(line)
+
+    def _raw_lines(self, seg: _Segment) -> list[str] | None:
+        """Logged lines of a compacted segment; None for segments compacted before RAW_COLUMN."""
+        if RAW_COLUMN not in pq.read_schema(seg.data_path).names:
+            return None
+        return pq.read_table(seg.data_path, columns=[RAW_COLUMN]).column(RAW_COLUMN).to_pylist()
+
+    def _table(self, seg: _Segment) -> list[dict]:
+        rows = self._tables.get(seg.number)
+        if rows is None:
+            lines = self._raw_lines(seg)
+            rows = pq.read_table(seg.data_path).to_pylist() if lines is None else [json.loads(line) for line in lines]
+            self._tables[seg.number] = rows
+            while len(self._tables) > 4:
+                self._tables.popitem(last=False)
+        else:
+            self._tables.move_to_end(seg.number)
+        return rows
+
+    def _load(self, seg: _Segment, node_id: str) -> dict:
+        # Resolve under the lock so a concurrent compaction cannot swap the
+        # segment between reading its offset and reading its data
+        with self.lock:
+            where = seg.ids[node_id]
+            if seg.format == "jsonl":
+                with seg.data_path.open("rb") as f:
+                    f.seek(where)
+                    return json.loads(f.readline())
+        return self._table(seg)[where]
+
+    def _segments(self) -> list[_Segment]:
+        with self.lock:
+            segs = list(self.segments)
+        for seg in segs:
+            seg.load_index()
+        return segs
+
+    def iter_segment(self, seg: _Segment):
+        with self.lock:
+            fmt, path = seg.format, seg.data_path
+        if fmt == "parquet":
+            yield from self._table(seg)
+        elif path.exists():
+            yield from self._read_jsonl(path)
+
+    def iter_nodes(self):
+        for seg in self._segments():
+            yield from self.iter_segment(seg)
+
+    def get(self, node_id: str) -> dict | None:
+        for seg in reversed(self._segments()):
+            if node_id in seg.ids:
+                return self._load(seg, node_id)
+        return None
+
+    def children(self, parent_id: str | None) -> list[dict]:
+        key = parent_id or ROOT_KEY
+        out = []
+        for seg in self._segments():
+            for nid in seg.parents.get(key, ()):
+                out.append(self._load(seg, nid))
+        return out
+
+    def in_time_range(self, start: str | None = None, end: str | None = None):
+        """Nodes whose timestamp is in [start, end], reading only overlapping segments."""
+        for seg in self._segments():
+            if seg.count == 0 or (start and seg.max_ts and seg.max_ts < start) or (end and seg.min_ts and seg.min_ts > end):
+                continue
+            for n in self.iter_segment(seg):
+                ts = n.get("timestamp") or ""
+                if (not start or ts >= start) and (not end or ts <= end):
+                    yield n
+
+    def is_empty(self) -> bool:
+        return all(seg.count == 0 for seg in self._segments())
+
+    def iter_lines(self):
+        """Every node as its logged JSON line, in log order."""
+        for seg in self._segments():
+            with self.lock:
+                fmt, path = seg.format, seg.data_path
+            if fmt == "jsonl":
+                if path.exists():
+                    yield from self._read_lines(path)
+                continue
+            lines = self._raw_lines(seg)
+            yield from (_dumps(n) for n in self._table(seg)) if lines is None else lines
+
+    def export_jsonl(self, out) -> int:
+        count = 0
+        for line in self.iter_lines():
+            out.write(line + "\n")
+            count += 1
+        return count
+
+    def close(self):
+        # The active segment has no sidecar on disk; it is rescanned on open
+        self.wait_for_compaction()
+
+
+def open_node_log(path: str | pathlib.Path, **kwargs):
+    p = pathlib.Path(path)
+    if p.is_dir() or p.suffix == ".d":
+        return SegmentedNodeLog(p, **kwargs)
+    return JsonlNodeLog(p)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Manage the segmented SLF node log.")
+    ap.add_argument('command', choices=['import', 'export', 'compact'])
+    ap.add_argument('source', nargs='?', help='JSONL file to import')
+    ap.add_argument('--dir', default='seed_tree.d', help='Segment directory')
+    ap.add_argument('-o', '--output', help='Export destination (default: stdout)')
+    ap.add_argument('--segment-bytes', type=int, default=SEGMENT_BYTES)
+    args = ap.parse_args()
+
+    log = SegmentedNodeLog(args.dir, segment_bytes=args.segment_bytes, background=False)
+    if args.command == 'import':
+        if not args.source:
+            raise SystemExit("import needs a source JSONL file")
+        n = 0
+        for node in JsonlNodeLog(args.source).iter_nodes():
+            log.append(node)
+            n += 1
+        log.rotate()
+        log.compact_closed()
+        logger.info(f"Imported {n} nodes into {args.dir}")
+    elif args.command == 'export':
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            n = log.export_jsonl(out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        logger.info(f"Exported {n} nodes")
+    else:
+        log.rotate()
+        log.compact_closed()
+    log.close()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Inverted index over the semantic fields of data/character_metadata.json.
+
+Each indexed field value (strings, lists and nested cross-linguistic
+records alike) is tokenized into lowercase terms; IPA transcriptions in
+`phonetics` keep their symbols ("/æ/" -> "æ"). Postings map
+field -> term -> {character_id: term frequency}, with an "all fields"
+list beside the per-field ones.
+
+Queries:
+
+    origin divinity              both terms (AND is implied)
+    culture:norse OR culture:greek
+    meaning:fire NOT tech:ascii
+    (culture:hebrew OR culture:arabic) meaning:first
+
+Field prefixes are the field names or the short aliases in FIELD_ALIASES.
+search() returns the matching character ids; rank() scores characters
+containing any positive term with BM25, excluding NOT terms.
+
+Usage:
+    python slf_semantic_index.py "culture:norse meaning:divinity"
+    python slf_semantic_index.py --rank "fire water light"
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import math
+import pathlib
+import re
+from collections import defaultdict
+
+FIELDS = ("symbolic_meaning", "phonetics", "cultural_origin", "technological_association", "cross_linguistic_symbolism")
+FIELD_ALIASES = {
+    "meaning": "symbolic_meaning",
+    "phoneme": "phonetics",
+    "culture": "cultural_origin",
+    "tech": "technological_association",
+    "symbolism": "cross_linguistic_symbolism",
+}
+ALL = "*"
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_QUERY = re.compile(r'\(|\)|[^\s()]+:"[^"]*"|"[^"]*"|[^\s()]+')
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _strings(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from _strings(v)
+
+
+def tokenize(text: str, field: str | None = None) -> list[str]:
+    text = text.lower()
+    if field == "phonetics":
+        return [t for t in text.replace("/", " ").replace("[", " ").replace("]", " ").split() if t]
+    return _WORD.findall(text)
+
+
+class SemanticIndex:
+    def __init__(self, entries: list[dict], fields=FIELDS):
+        self.fields = tuple(fields)
+        self.ids: list[str] = []
+        self.postings: dict[str, dict[str, dict[str, int]]] = {f: defaultdict(dict) for f in (*self.fields, ALL)}
+        self.doc_len: dict[str, dict[str, int]] = {f: {} for f in (*self.fields, ALL)}
+        for e in entries:
+            cid = e.get("character_id")
+            if not cid:
+                continue
+            self.ids.append(cid)
+            total = 0
+            for f in self.fields:
+                terms = [t for s in _strings(e.get(f)) for t in tokenize(s, f)]
+                for t in terms:
+                    self.postings[f][t][cid] = self.postings[f][t].get(cid, 0) + 1
+                    self.postings[ALL][t][cid] = self.postings[ALL][t].get(cid, 0) + 1
+                self.doc_len[f][cid] = len(terms)
+                total += len(terms)
+            self.doc_len[ALL][cid] = total
+        self.avg_len = {f: (sum(d.values()) / len(d) if d else 0.0) for f, d in self.doc_len.items()}
+
+    @classmethod
+    def from_file(cls, path: str | pathlib.Path, fields=FIELDS) -> "SemanticIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), fields)
+
+    # --- query parsing ---
+    def _term(self, raw: str) -> list[tuple[str, str]]:
+        """(field, term) pairs for one query word; several when it tokenizes to more than one term."""
+        field, sep, text = raw.partition(":")
+        if sep and (FIELD_ALIASES.get(field.lower()) or field.lower()) in self.fields:
+            field = FIELD_ALIASES.get(field.lower(), field.lower())
+        else:
+            field, text = ALL, raw
+        text = text.strip('"')
+        return [(field, t) for t in tokenize(text, field if field != ALL else None)]
+
+    def _parse(self, query: str):
+        tokens = _QUERY.findall(query)
+        pos = 0
+
+        def peek():
+            return tokens[pos] if pos < len(tokens) else None
+
+        def expr():
+            nonlocal pos
+            node = seq()
+            while peek() == "OR":
+                pos += 1
+                node = ("or", node, seq())
+            return node
+
+        def seq():
+            nonlocal pos
+            node = unary()
+            while peek() not in (None, "OR", ")"):
+                if peek() == "AND":
+                    pos += 1
+                node = ("and", node, unary())
+            return node
+
+        def unary():
+            nonlocal pos
+            tok = peek()
+            if tok is None:
+                raise ValueError("Query ends unexpectedly")
+            pos += 1
+            if tok == "NOT":
+                return ("not", unary())
+            if tok == "(":
+                node = expr()
+                if peek() != ")":
+                    raise ValueError("Missing ')'")
+                pos += 1
+                return node
+            if tok == ")":
+                raise ValueError("Unexpected ')'")
+            return ("term", self._term(tok))
+
+        if not tokens:
+            raise ValueError("Empty query")
+        tree = expr()
+        if pos != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[pos]}'")
+        return tree
+
+    # --- evaluation ---
+    def _docs(self, pairs) -> set[str]:
+        out: set[str] | None = None
+        for field, term in pairs:
+            docs = set(self.postings[field].get(term, ()))
+            out = docs if out is None else out & docs
+        return out or set()
+
+    def _eval(self, node) -> set[str]:
+        op = node[0]
+        if op == "term":
+            return self._docs(node[1])
+        if op == "not":
+            return set(self.ids) - self._eval(node[1])
+        left, right = self._eval(node[1]), self._eval(node[2])
+        return left & right if op == "and" else left | right
+
+    def search(self, query: str) -> list[str]:
+        """Character ids matching the boolean query, in metadata order."""
+        hits = self._eval(self._parse(query))
+        return [cid for cid in self.ids if cid in hits]
+
+    def _terms(self, node, negated=False, out=None):
+        out = out if out is not None else ([], [])
+        if node[0] == "term":
+            out[1 if negated else 0].extend(node[1])
+        elif node[0] == "not":
+            self._terms(node[1], not negated, out)
+        else:
+            self._terms(node[1], negated, out)
+            self._terms(node[2], negated, out)
+        return out
+
+    def rank(self, query: str, limit: int | None = 10) -> list[tuple[str, float]]:
+        """(character id, BM25 score) for characters with any positive term, best first."""
+        positive, negative = self._terms(self._parse(query))
+        excluded = set().union(*(self._docs([p]) for p in negative)) if negative else set()
+        n = len(self.ids)
+        scores: dict[str, float] = defaultdict(float)
+        for field, term in positive:
+            plist = self.postings[field].get(term, {})
+            if not plist:
+                continue
+            idf = math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            avg = self.avg_len[field] or 1.0
+            for cid, tf in plist.items():
+                if cid in excluded:
+                    continue
+                norm = 1 - BM25_B + BM25_B * self.doc_len[field][cid] / avg
+                scores[cid] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        order = {cid: i for i, cid in enumerate(self.ids)}
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], order[kv[0]]))
+        return ranked[:limit] if limit else ranked
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description="Query character metadata by meaning, culture, phoneme, technology or symbolism.")
+    ap.add_argument('query')
+    ap.add_argument('--rank', action='store_true', help='BM25-ranked results instead of a boolean match')
+    ap.add_argument('--limit', type=int, default=10)
+    ap.add_argument('--metadata', default='data/character_metadata.json')
+    args = ap.parse_args()
+
+    index = SemanticIndex.from_file(args.metadata)
+    try:
+        if args.rank:
+            for cid, score in index.rank(args.query, args.limit):
+                print(f"{cid}\t{score:.3f}")
+        else:
+            print(" ".join(index.search(args.query)) or "No matches.")
+    except ValueError as e:
+        raise SystemExit(f"Invalid query: {e}")
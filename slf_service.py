@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Warm SLF engine served over local HTTP/JSON.
+
+Loads the metadata, wordlist, dictionary index and SLFNltk once (metadata
+edits are picked up by a background watcher) and answers POST requests
+with a JSON body:
+
+    /options     {"char": "a", "method": "symbolic"}
+    /acronym     {"seed": "usaf"}
+    /dictionary  {"seed": "helo", "limit": 10}
+    /diff        {"source": "abc", "target": "abd"}
+    /narrative   {"term": "sun", "explain": false}
+    /characters  {"query": "culture:norse meaning:divinity", "ranked": false, "limit": 10}
+    /batch       {"requests": [{"op": "diff", "source": "a", "target": "b"}, ...]}
+
+GET /health reports readiness. The server is plain asyncio (no web
+framework): connections are kept alive and pipelined requests are parsed
+as they arrive, run concurrently on the executor pool, and answered in
+order. Handlers run in a thread pool by default; --processes gives each
+worker process its own warm engine for CPU-heavy batch work.
+
+Usage:
+    python slf_service.py --port 8765
+    curl -s localhost:8765/diff -d '{"source": "sun", "target": "nus"}'
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import math
+import pathlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from slf_letter_kernel import calc_diff
+
+logger = logging.getLogger("SLF-Service")
+
+MAX_BODY = 16 << 20
+DEFAULT_METADATA = ['character_transforms.parquet', 'acronym_transforms.parquet', 'phonetic_transforms.parquet']
+
+_engine = None
+_nltk = None
+
+
+def init_worker(metadata_paths: list[str], data_dir: str | None):
+    """Load the engine data layer (and SLFNltk, if its data is present) into this process."""
+    global _engine, _nltk
+    from slf_transform_combined import TransformEngine
+    _engine = TransformEngine.headless(metadata_paths)
+    # Build the dictionary index now so no request pays for it and threads never race to build it
+    _engine._subsequence_index()
+    _engine.watch_metadata()
+    if data_dir:
+        from slf_nltk_engine import SLFNltk
+        base = pathlib.Path(data_dir)
+        try:
+            _nltk = SLFNltk(base)
+            if (base / "seed_tree.jsonl").exists():
+                _nltk.load_seed_tree(base / "seed_tree.jsonl")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Narratives and character search disabled: {e}")
+
+
+def _clean(v):
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    return v
+
+
+def _records(df) -> list[dict]:
+    return [{k: _clean(v) for k, v in row.items()} for row in df.to_dict("records")]
+
+
+def _text(req: dict, key: str, default: str | None = None) -> str:
+    """req[key] as a string; a missing or non-string field is the client's error (400)."""
+    value = req[key] if default is None else req.get(key, default)
+    if not isinstance(value, str):
+        raise TypeError(f"'{key}' must be a string, not {type(value).__name__}")
+    return value
+
+
+def _seed(req: dict, key: str = "seed") -> str:
+    # Same normalisation as seeds typed into the interactive engine
+    return _engine._normalize(_text(req, key))
+
+
+def op_options(req: dict):
+    return _records(_engine.get_options(_seed(req, "char"), _text(req, "method", "symbolic")))
+
+
+def op_acronym(req: dict):
+    return [{"block": blk, "pos": pos, "transforms": _records(rows)}
+            for blk, pos, rows in _engine.acronym_blocks(_seed(req))]
+
+
+def op_dictionary(req: dict):
+    cands = _engine.dictionary_candidates(_seed(req), limit=int(req.get("limit", 50)))
+    return [{"fragment": f, "word": w, "pos": p, "up": u, "down": d} for f, w, p, u, d in cands]
+
+
+def op_diff(req: dict):
+    return calc_diff(_text(req, "source"), _text(req, "target"))
+
+
+def op_narrative(req: dict):
+    if _nltk is None:
+        raise LookupError("Narratives are not available (no --data directory loaded)")
+    term = _text(req, "term")
+    return _nltk.explain_symbolic_weights(term) if req.get("explain") else _nltk.generate_symbolic_narrative(term)
+
+
+def op_characters(req: dict):
+    if _nltk is None:
+        raise LookupError("Character search is not available (no --data directory loaded)")
+    if req.get("ranked"):
+        return [{"character": cid, "score": score} for cid, score in _nltk.rank_characters(_text(req, "query"), int(req.get("limit", 10)))]
+    return _nltk.search_characters(_text(req, "query"))
+
+
+def op_batch(req: dict):
+    out = []
+    for sub in req["requests"]:
+        try:
+            out.append({"ok": True, "result": OPS[sub["op"]](sub)})
+        except Exception as e:
+            out.append({"ok": False, "error": f"{type(e).__name__}: {e}"})
+    return out
+
+
+OPS = {
+    "options": op_options,
+    "acronym": op_acronym,
+    "dictionary": op_dictionary,
+    "diff": op_diff,
+    "narrative": op_narrative,
+    "characters": op_characters,
+    "batch": op_batch,
+}
+
+
+def run_op(name: str, req: dict):
+    return OPS[name](req)
+
+
+class Service:
+    def __init__(self, executor):
+        self.executor = executor
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        method, target, version = line.decode("latin-1").split()
+        headers = {}
+        while (h := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            k, _, v = h.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        return method, target.split("?", 1)[0], body, keep_alive
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"ok": True, "ops": sorted(OPS)}
+        name = path.strip("/")
+        if method != "POST" or name not in OPS:
+            return HTTPStatus.NOT_FOUND, {"ok": False, "error": f"No endpoint {method} {path}"}
+        try:
+            req = json.loads(body or b"{}")
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"ok": False, "error": f"Invalid JSON: {e}"}
+        if not isinstance(req, dict):
+            return HTTPStatus.BAD_REQUEST, {"ok": False, "error": "Request body must be a JSON object"}
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.executor, run_op, name, req)
+        except (KeyError, TypeError, ValueError) as e:
+            return HTTPStatus.BAD_REQUEST, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        except LookupError as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"ok": False, "error": str(e)}
+        except Exception as e:
+            # Anything else is a bug in an op; answer it rather than drop the pipelined connection
+            logger.exception(f"{name} failed: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return HTTPStatus.OK, {"ok": True, "result": result}
+
+    @staticmethod
+    def _response(status: HTTPStatus, payload: dict, keep_alive: bool) -> bytes:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode("latin-1") + body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Pipelined requests start as soon as they are parsed; a queue keeps responses in order
+        pending: asyncio.Queue = asyncio.Queue()
+
+        async def respond():
+            while (item := await pending.get()) is not None:
+                task, keep_alive = item
+                writer.write(self._response(*await task, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+
+        responder = asyncio.create_task(respond())
+        try:
+            while True:
+                try:
+                    req = await self._read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError) as e:
+                    fut = asyncio.get_running_loop().create_future()
+                    fut.set_result((HTTPStatus.BAD_REQUEST, {"ok": False, "error": str(e)}))
+                    await pending.put((fut, False))
+                    break
+                if req is None:
+                    break
+                method, path, body, keep_alive = req
+                await pending.put((asyncio.ensure_future(self._dispatch(method, path, body)), keep_alive))
+                if not keep_alive:
+                    break
+            await pending.put(None)
+            await responder
+        except (ConnectionResetError, BrokenPipeError):
+            responder.cancel()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info(f"Serving on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Serve a warm SLF engine over HTTP/JSON.")
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('-m', '--metadata', nargs='+', default=DEFAULT_METADATA)
+    ap.add_argument('--data', default='data', help='SLFNltk data directory (character_metadata.json etc.)')
+    ap.add_argument('--workers', type=int, default=4)
+    ap.add_argument('--processes', action='store_true', help='Run handlers in worker processes, each with its own engine')
+    args = ap.parse_args()
+
+    init = (args.metadata, args.data)
+    if args.processes:
+        executor = ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=init)
+        # Start every worker (and its engine load) before accepting requests
+        warm = {"source": "", "target": ""}
+        for f in [executor.submit(run_op, "diff", warm) for _ in range(args.workers)]:
+            f.result()
+    else:
+        init_worker(*init)
+        executor = ThreadPoolExecutor(args.workers)
+    try:
+        asyncio.run(Service(executor).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown()
@@ -0,0 +1,204 @@
+"""
+Subsequence index for the insert/delete-only matching used by the
+dictionary scan.
+
+A fragment matches a word when one is a subsequence of the other, i.e. the
+word is reachable from the fragment by insertions only (up letters) or by
+deletions only (down letters).
+
+- superwords: if frag is a subsequence of w with at most max_up extra
+  letters, frag's first two letters appear in order within the first
+  2 + max_up letters of w. Every word is indexed under those ordered letter
+  pairs (at most 15 keys for max_up=4, built with NumPy), so a probe is one
+  binary search; candidates of the wrong length or missing one of frag's
+  letters are dropped with array masks, and the rest is verified per word.
+- subwords: up to max_down deletions of the fragment are probed against the
+  exact word table.
+
+Postings are stored CSR-style, one int32 word-id run per letter pair with
+ids ascending within each run, so matches() can merge the postings
+of many fragments in wordlist order and stop as soon as enough words are
+found, as the old linear scan did.
+"""
+
+from __future__ import annotations
+import heapq
+from collections import defaultdict
+from itertools import combinations
+from operator import itemgetter
+import numpy as np
+
+KEY_LEN = 2
+
+
+def deletions(word: str, depth: int, min_len: int = 1) -> set[str]:
+    """word plus every string reachable from it by up to depth deletions."""
+    out = {word}
+    frontier = {word}
+    for _ in range(depth):
+        nxt = set()
+        for v in frontier:
+            if len(v) <= min_len:
+                continue
+            for i in range(len(v)):
+                nxt.add(v[:i] + v[i+1:])
+        nxt -= out
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+def is_subsequence(small: str, big: str) -> bool:
+    it = iter(big)
+    return all(c in it for c in small)
+
+
+def letter_mask(word: str) -> int:
+    """Bit per letter a-z, bit 26 for anything else."""
+    m = 0
+    for c in word:
+        o = ord(c) - 97
+        m |= 1 << (o if 0 <= o < 26 else 26)
+    return m
+
+
+def _masks(seq, chunk: int = 65536) -> np.ndarray:
+    out = np.zeros(len(seq), dtype=np.int64)
+    for start in range(0, len(seq), chunk):
+        part = seq[start:start + chunk]
+        width = max(map(len, part), default=0)
+        if not width:
+            continue
+        codes = np.array(part, dtype=f"U{width}").view(np.uint32).reshape(len(part), width).astype(np.int64) - 97
+        bits = np.where((codes >= 0) & (codes < 26), codes, 26)
+        present = codes != -97  # zero padding
+        m = np.zeros(len(part), dtype=np.int64)
+        for col in range(width):
+            m |= np.where(present[:, col], np.int64(1) << bits[:, col], 0)
+        out[start:start + len(part)] = m
+    return out
+
+
+class SubsequenceIndex:
+    # Fragments longer than this skip delete-probing and scan the few words of
+    # a nearby length instead (the probe count grows combinatorially).
+    MAX_PROBE_LEN = 12
+
+    def __init__(self, words: list[str], max_up: int = 4, max_down: int = 3, min_len: int = 2):
+        self.words = words
+        self.max_up = max_up
+        self.max_down = max_down
+        self.min_len = min_len
+        seq = words if isinstance(words, list) else list(words)
+        self.exact: dict[str, int] = {}
+        self.by_length: dict[int, list[int]] = defaultdict(list)
+        for wi, w in enumerate(seq):
+            self.exact.setdefault(w, wi)
+            self.by_length[len(w)].append(wi)
+
+        head = KEY_LEN + max_up
+        n = len(seq)
+        # First `head` code points of every word, zero-padded, as dense letter ranks (0 = padding)
+        codes = np.array(seq, dtype=f"U{head}").view(np.uint32).reshape(n, head) if n else np.zeros((0, head), dtype=np.uint32)
+        seen = np.flatnonzero(np.bincount(codes.ravel(), minlength=1))
+        self.alphabet = seen[seen != 0]
+        ranks = np.searchsorted(self.alphabet, codes).astype(np.int64) + 1
+        ranks[codes == 0] = 0
+        lengths = np.fromiter(map(len, seq), dtype=np.int64, count=n)
+        wid = np.arange(n, dtype=np.int64)
+        width = len(self.alphabet) + 1
+        packed = []
+        for i, j in combinations(range(head), 2):
+            ok = (ranks[:, j] != 0) & (lengths >= min_len)
+            packed.append((ranks[ok, i] * width + ranks[ok, j]) << 32 | wid[ok])
+        # One sort of (pair, word id) packed into int64; unique also drops repeated pairs ("banana")
+        packed = np.sort(np.concatenate(packed)) if packed else np.zeros(0, dtype=np.int64)
+        packed = packed[np.diff(packed, prepend=-1) != 0]
+        pair_of = packed >> 32
+        starts = np.flatnonzero(np.diff(pair_of, prepend=-1)) if len(packed) else np.zeros(0, dtype=np.int64)
+        self.pairs = pair_of[starts]
+        self.offsets = np.append(starts, len(packed)).astype(np.int64)
+        self.ids = (packed & 0xFFFFFFFF).astype(np.int32)
+        # Length and letter set per word, so probes drop impossible words before any string work
+        self.word_lengths = lengths.astype(np.int32)
+        self.masks = _masks(seq)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _postings(self, a: str, b: str) -> np.ndarray:
+        ra, rb = np.searchsorted(self.alphabet, [ord(a), ord(b)])
+        if ra >= len(self.alphabet) or rb >= len(self.alphabet) or self.alphabet[ra] != ord(a) or self.alphabet[rb] != ord(b):
+            return self.ids[:0]
+        key = (ra + 1) * (len(self.alphabet) + 1) + rb + 1
+        k = np.searchsorted(self.pairs, key)
+        if k >= len(self.pairs) or self.pairs[k] != key:
+            return self.ids[:0]
+        return self.ids[self.offsets[k]:self.offsets[k + 1]]
+
+    def _iter_superwords(self, frag: str, max_up: int, lengths: tuple[int, int] | None = None):
+        n = len(frag)
+        lo_len, hi_len = n, n + max_up
+        if lengths:
+            lo_len, hi_len = max(lo_len, lengths[0]), min(hi_len, lengths[1])
+        if n < KEY_LEN or lo_len > hi_len:
+            return
+        ids = self._postings(frag[0], frag[1])
+        ln = self.word_lengths[ids]
+        need = letter_mask(frag)
+        ids = ids[(ln >= lo_len) & (ln <= hi_len) & (self.masks[ids] & need == need)]
+        words = self.words
+        for wi in ids.tolist():
+            if is_subsequence(frag, words[wi]):
+                yield wi
+
+    def superwords(self, frag: str, max_up: int | None = None) -> list[int]:
+        """Ids of words containing frag as a subsequence with at most max_up extra letters."""
+        max_up = self.max_up if max_up is None else min(max_up, self.max_up)
+        return list(self._iter_superwords(frag, max_up))
+
+    def subwords(self, frag: str, max_down: int | None = None, lengths: tuple[int, int] | None = None) -> list[int]:
+        """Ids of words that are subsequences of frag with at most max_down letters removed."""
+        max_down = self.max_down if max_down is None else max_down
+        lo_len, hi_len = max(len(frag) - max_down, 0), len(frag)
+        if lengths:
+            lo_len, hi_len = max(lo_len, lengths[0]), min(hi_len, lengths[1])
+        if lo_len > hi_len:
+            return []
+        if len(frag) <= self.MAX_PROBE_LEN:
+            found = (self.exact.get(v) for v in deletions(frag, len(frag) - lo_len) if len(v) <= hi_len)
+            return sorted(wi for wi in found if wi is not None)
+        out = []
+        for n in range(lo_len, hi_len + 1):
+            out.extend(wi for wi in self.by_length.get(n, ()) if is_subsequence(self.words[wi], frag))
+        return sorted(out)
+
+    def _iter_lookup(self, frag: str, max_up: int, max_down: int, lengths: tuple[int, int] | None = None):
+        seen = set()
+        for wi in heapq.merge(self._iter_superwords(frag, max_up, lengths), self.subwords(frag, max_down, lengths)):
+            if wi not in seen:
+                seen.add(wi)
+                yield wi
+
+    def lookup(self, frag: str, max_up: int | None = None, max_down: int | None = None) -> list[int]:
+        """Sorted ids of every word within the up/down limits of frag."""
+        max_up = self.max_up if max_up is None else min(max_up, self.max_up)
+        return list(self._iter_lookup(frag, max_up, self.max_down if max_down is None else max_down))
+
+    def matches(self, fragments, max_up: int | None = None, max_down: int | None = None,
+                lengths: tuple[int, int] | None = None):
+        """(word id, fragment) for every match of any fragment, lazily in ascending word id order
+        (fragments of one word in the order given); lengths=(lo, hi) keeps only words of that many letters."""
+        max_up = self.max_up if max_up is None else min(max_up, self.max_up)
+        max_down = self.max_down if max_down is None else max_down
+
+        def tagged(frag):
+            for wi in self._iter_lookup(frag, max_up, max_down, lengths):
+                yield wi, frag
+
+        lo_len, hi_len = lengths or (0, float("inf"))
+        # Merge on the word id alone: heapq.merge is stable, so a word matched by several
+        # fragments lists them in the order of `fragments`, as the old scan's inner loop did
+        return heapq.merge(*(tagged(f) for f in fragments
+                             if len(f) >= self.min_len and len(f) + max_up >= lo_len and len(f) - max_down <= hi_len),
+                           key=itemgetter(0))
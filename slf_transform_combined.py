@@ -18,9 +18,27 @@ import uuid
 from datetime import datetime
 import time
 import sqlite3
-from collections import Counter, defaultdict
+from collections import defaultdict
+from itertools import islice
 import pandas as pd
 from prompt_toolkit import prompt
+from slf_anagram_index import AnagramIndex
+from slf_completion import CompletionIndex, threaded_completer
+from slf_checkpoint import CHECKPOINT_DIR, CHECKPOINT_INTERVAL, load_checkpoint, restore, save_checkpoint
+from slf_subsequence_index import SubsequenceIndex
+from slf_embedded import WordAutomaton
+from slf_letter_kernel import WordHistograms, calc_diff
+from slf_lineage import LineageIndex, format_node
+from slf_log_server import LogClient, RemoteLineage, RemoteNodeLog
+from slf_metadata import MetadataSnapshot, MetadataWatcher
+from slf_phonetic_index import PhoneticIndex, phonetic_rules
+from slf_profile import PROFILE_DIR, NoProfiler, open_profiler
+from slf_reverse_index import ReverseIndex
+from slf_seed_buffer import SeedBuffer
+from slf_segment_log import open_node_log
+from slf_translate import Rewriter
+from slf_wordlist import CompiledWordlist, open_wordlist
+from slf_tree_render import DEFAULT_LIMIT, page, render_tree
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("SLF-Core")
@@ -28,68 +46,246 @@ logger = logging.getLogger("SLF-Core")
 def now_iso():
     return datetime.utcnow().isoformat(timespec="seconds") + "Z"
 
-def calc_diff(src, tgt):
-    src_c = Counter(src)
-    tgt_c = Counter(tgt)
-    add = ''.join((tgt_c - src_c).elements())
-    rem = ''.join((src_c - tgt_c).elements())
-    s = []
-    if add: s.append(f"+{add}")
-    if rem: s.append(f"-{rem}")
-    return " ".join(s)
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+
+def load_metadata(paths: list[str], strict: bool = False) -> pd.DataFrame:
+    """Concatenated transform rows; with strict, unreadable files raise instead of being skipped."""
+    dfs: list[pd.DataFrame] = []
+    for p in paths:
+        fp = pathlib.Path(p)
+        if not fp.exists():
+            logger.warning(f"Metadata file not found: {fp}")
+            continue
+        try:
+            df = pd.read_parquet(fp)
+        except Exception as e:
+            if strict:
+                raise
+            logger.warning(f"Failed to load {p}: {e}")
+            continue
+        if "source" in df.columns:
+            dfs.append(df)
+        elif "character_id" in df.columns:
+            rows = []
+            for _, row in df.iterrows():
+                for t in row["character_transforms"]:
+                    rows.append({
+                        "source": normalize(t["source"]),
+                        "target": normalize(t["target"]),
+                        "context": t.get("context", ""),
+                        "method": t.get("method", ""),
+                        "weight": t.get("weight", 0),
+                        "logographic_ref": t.get("logographic_ref")
+                    })
+            dfs.append(pd.DataFrame(rows))
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(columns=["source","target","context","method","weight","logographic_ref"])
+
+def load_wordlist() -> CompiledWordlist | list[str]:
+    """Sorted, deduplicated lowercase words, memory-mapped from the compiled artifact."""
+    for name in ("large_wordlist.txt", "wordlist.txt"):
+        fp = pathlib.Path(name)
+        if fp.exists():
+            try:
+                words = open_wordlist(fp)
+            except Exception as e:
+                logger.warning(f"Unable to read wordlist {name}: {e}")
+                continue
+            if not words:
+                logger.warning(f"{name} is empty.")
+            return words
+    logger.warning("No wordlist found; dictionary disabled.")
+    return []
+
+def init_db(db_path: str = "transform_history.db", **kwargs) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, **kwargs)
+    c = conn.cursor()
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS transform_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            source TEXT,
+            target TEXT,
+            reversal BOOLEAN,
+            identical BOOLEAN,
+            branch TEXT,
+            received_up BOOLEAN DEFAULT 0,
+            received_down BOOLEAN DEFAULT 0
+        )
+    ''')
+    # Try to add columns if missing
+    try:
+        c.execute('ALTER TABLE transform_log ADD COLUMN received_up BOOLEAN DEFAULT 0')
+    except sqlite3.OperationalError:
+        pass
+    try:
+        c.execute('ALTER TABLE transform_log ADD COLUMN received_down BOOLEAN DEFAULT 0')
+    except sqlite3.OperationalError:
+        pass
+    c.execute('CREATE INDEX IF NOT EXISTS idx_branch ON transform_log(branch)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_reversal ON transform_log(reversal)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_identical ON transform_log(identical)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_up ON transform_log(received_up)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_down ON transform_log(received_down)')
+    conn.commit()
+    return conn
+
+TRANSFORM_COLUMNS = ("timestamp", "source", "target", "reversal", "identical", "branch", "received_up", "received_down")
+
+def transform_row(source: str, target: str, branch: str, method: str = "") -> dict:
+    # Consider all methods that should mark as up/down
+    received_up = method.startswith("manual_up") or method == "dictionary" or method == "symbolic_all"
+    received_down = method.startswith("manual_down") or method == "dictionary"
+    return {
+        "timestamp": now_iso(), "source": source, "target": target,
+        "reversal": target == source[::-1], "identical": target == source, "branch": branch,
+        "received_up": int(received_up), "received_down": int(received_down),
+    }
+
+def jump_map(rows) -> dict[str, list[tuple[str, str]]]:
+    """source -> [(target, branch)] over distinct (source, target, branch, reversal, identical,
+    received_up, received_down) rows, excluding reversals, identicals, and any seed
+    that has received an up or down."""
+    rows = list(rows)
+    received_mod = set()
+    for source, target, _, _, _, up, down in rows:
+        if up or down:
+            received_mod.update((source, target))
+    root_map = defaultdict(list)
+    seen = set()
+    for source, target, branch, reversal, identical, _, _ in rows:
+        if reversal or identical or (source, target, branch) in seen:
+            continue
+        if source in received_mod or target in received_mod:
+            continue
+        seen.add((source, target, branch))
+        root_map[source].append((target, branch))
+    return root_map
+
+# Engine fields that describe the pending edit, saved with each undoable change
+EDIT_FIELDS = ("up_seed", "down_seed", "prev_working_seed", "last_action_method")
 
 class TransformEngine:
-    def __init__(self, metadata_paths: list[str], seed: str):
-        self._startup(metadata_paths, seed)
+    # Entries listed by the open-ended pick lists (15 sound-alikes, 16 backward spans);
+    # smart_dict_scan likewise lists at most 50 candidates
+    PICKS_SHOWN = 50
+
+    def __init__(self, metadata_paths: list[str], seed: str, log_path: str = "seed_tree.jsonl",
+                 resume: dict | None = None, checkpoint_dir: str = CHECKPOINT_DIR, server: str | None = None):
+        self.tree_log = pathlib.Path(log_path)
+        if server:
+            self.server = LogClient(server)
+            self.node_log = RemoteNodeLog(self.server)
+        else:
+            self.server = None
+            self.node_log = open_node_log(self.tree_log)
+        self.checkpoint_dir = checkpoint_dir
+        self.last_checkpoint = 0.0
+        self.profiler = NoProfiler()
+        if resume is not None:
+            self._resume(metadata_paths, resume)
+        else:
+            self._startup(metadata_paths, seed)
+
+    @classmethod
+    def headless(cls, metadata_paths: list[str]) -> "TransformEngine":
+        """Engine with metadata and wordlist loaded but no prompts, session, or logs."""
+        self = cls.__new__(cls)
+        self.metadata = self._load_metadata(metadata_paths)
+        self.wordlist = self._load_wordlist()
+        self.working_seed = ""
+        self.up_seed = ""
+        self.down_seed = ""
+        self.completion = CompletionIndex(self.wordlist)
+        self.profiler = NoProfiler()
+        return self
+
+    @property
+    def metadata(self) -> pd.DataFrame:
+        return self.meta.frame
+
+    @metadata.setter
+    def metadata(self, frame: pd.DataFrame):
+        self.meta = MetadataSnapshot(frame)
+
+    def watch_metadata(self, interval: float | None = None) -> MetadataWatcher:
+        """Poll the metadata files and swap in a rebuilt snapshot when they change."""
+        kw = {"interval": interval} if interval else {}
+        watcher = MetadataWatcher(self.metadata_paths, load_metadata, self._swap_metadata, **kw)
+        watcher.start()
+        self.metadata_watcher = watcher
+        return watcher
+
+    def _swap_metadata(self, snap: MetadataSnapshot):
+        # One reference assignment: lookups see the old snapshot or the new one
+        self.meta = snap
+        if getattr(self, "completion", None) is not None:
+            self.completion.add_targets(snap.frame["target"].unique())
+
+    def _start_completion(self):
+        """Completion index over the wordlist now, and the node log and targets in the background."""
+        self.completion = CompletionIndex(self.wordlist)
+        self.completion.start(self.node_log.iter_nodes, self.metadata["target"].unique())
+
+    def _completer(self, kind: str):
+        lookup = {"nodes": self.completion.node_ids, "seeds": self.completion.seeds,
+                  "branches": self.completion.branch_names}[kind]
+        return threaded_completer(lookup)
+
+    def _resolve_node_id(self, text: str) -> str | None:
+        """text itself if it is a node id, else the one id it is a prefix of."""
+        if not text or self.lineage.get(text) is not None:
+            return text or None
+        matches = self.completion.node_ids(text, 2)
+        if len(matches) == 1:
+            return matches[0][0]
+        if matches:
+            print(f"'{text}' matches several nodes; type more of the id (Tab completes).")
+        return None
+
+    @property
+    def working_seed(self) -> str:
+        return str(self.seed_buf)
+
+    @working_seed.setter
+    def working_seed(self, text: str):
+        # Whole-seed assignments become one undoable edit on the buffer
+        if getattr(self, "seed_buf", None) is None:
+            self.seed_buf = SeedBuffer(text)
+        else:
+            self.seed_buf.assign(text)
 
     def _init_db(self):
         self.db_path = "transform_history.db"
-        self.conn = sqlite3.connect(self.db_path)
-        c = self.conn.cursor()
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS transform_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                source TEXT,
-                target TEXT,
-                reversal BOOLEAN,
-                identical BOOLEAN,
-                branch TEXT,
-                received_up BOOLEAN DEFAULT 0,
-                received_down BOOLEAN DEFAULT 0
-            )
-        ''')
-        # Try to add columns if missing
-        try:
-            c.execute('ALTER TABLE transform_log ADD COLUMN received_up BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        try:
-            c.execute('ALTER TABLE transform_log ADD COLUMN received_down BOOLEAN DEFAULT 0')
-        except sqlite3.OperationalError:
-            pass
-        c.execute('CREATE INDEX IF NOT EXISTS idx_branch ON transform_log(branch)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_reversal ON transform_log(reversal)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_identical ON transform_log(identical)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_up ON transform_log(received_up)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_down ON transform_log(received_down)')
-        self.conn.commit()
+        if self.server is not None:
+            # The log server owns both stores; reads and writes go over its socket
+            self.conn = None
+            self.lineage = RemoteLineage(self.server)
+            return
+        # The full-screen interface runs each command on a worker thread (one at a time)
+        self.conn = init_db(self.db_path, check_same_thread=False)
+        self.lineage = LineageIndex(self.conn)
+        self.lineage.sync(self.node_log)
 
     def _log_sqlite(self, source, target, branch, method=""):
-        reversal = (target == source[::-1])
-        identical = (target == source)
-        # Consider all methods that should mark as up/down
-        received_up = method.startswith("manual_up") or method == "dictionary" or method == "symbolic_all"
-        received_down = method.startswith("manual_down") or method == "dictionary"
+        row = transform_row(source, target, branch, method)
+        if self.server is not None:
+            try:
+                self.server.log_transform(row)
+            except (RuntimeError, OSError) as e:
+                logger.warning(f"Log server did not record the transform {source} → {target}: {e}")
+            return
         c = self.conn.cursor()
-        c.execute('''
-            INSERT INTO transform_log (timestamp, source, target, reversal, identical, branch, received_up, received_down)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (now_iso(), source, target, reversal, identical, branch, int(received_up), int(received_down)))
+        c.execute(f'INSERT INTO transform_log ({", ".join(TRANSFORM_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                  [row[k] for k in TRANSFORM_COLUMNS])
         self.conn.commit()
 
     def _startup(self, metadata_paths: list[str], seed: str):
         self._init_db()
+        # Loaded before the prompts so the seed prompt can complete words and targets
+        self.metadata = self._load_metadata(metadata_paths)
+        self.wordlist = self._load_wordlist()
+        self._start_completion()
         while True:
             try:
                 self.author = prompt("Enter author name: ").strip()
@@ -102,7 +298,7 @@ class TransformEngine:
 
         while True:
             try:
-                initial_seed = prompt("Enter initial seed: ").strip()
+                initial_seed = prompt("Enter initial seed: ", completer=self._completer("seeds"), complete_while_typing=True).strip()
             except (EOFError, KeyboardInterrupt):
                 print("\nAborted.")
                 sys.exit(0)
@@ -113,9 +309,6 @@ class TransformEngine:
         self.session_id = f"{now_iso()}_{self.author.replace(' ','_')}"
         self.branch = "main"
         self.description = ""
-        self.metadata = self._load_metadata(metadata_paths)
-        self.wordlist = self._load_wordlist()
-        self.tree_log = pathlib.Path("seed_tree.jsonl")
         self.id_base = str(uuid.uuid4())
         self.id_count = 10
         self.working_seed = self._normalize(initial_seed)
@@ -128,7 +321,7 @@ class TransformEngine:
         self.current_node_id = f"{self.id_base}-{self.id_count}"
         self.parent_id = None
 
-        if not self.tree_log.exists() or self.tree_log.stat().st_size == 0:
+        if self.node_log.is_empty():
             self._log_node(
                 source="root",
                 target=self.working_seed,
@@ -139,54 +332,78 @@ class TransformEngine:
                 description="Initial root node"
             )
 
+    def _resume(self, metadata_paths: list[str], state: dict):
+        # Everything comes from the checkpoint; the node log is not read
+        self._init_db()
+        self.metadata = self._load_metadata(metadata_paths)
+        self.wordlist = self._load_wordlist()
+        self._start_completion()
+        restore(self, state)
+        self.last_timestamp = time.time()
+        logger.info(f"Resumed session {self.session_id} at node {self.current_node_id}")
+
+    def checkpoint(self, force: bool = False):
+        """Snapshot engine state, at most once per CHECKPOINT_INTERVAL unless forced."""
+        if not force and time.time() - self.last_checkpoint < CHECKPOINT_INTERVAL:
+            return
+        try:
+            save_checkpoint(self, self.checkpoint_dir)
+            self.last_checkpoint = time.time()
+        except OSError as e:
+            logger.warning(f"Checkpoint failed: {e}")
+
     def _normalize(self, text: str) -> str:
-        return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+        return normalize(text)
 
     def _load_metadata(self, paths: list[str]) -> pd.DataFrame:
         self.metadata_paths = paths
-        dfs: list[pd.DataFrame] = []
-        for p in paths:
-            fp = pathlib.Path(p)
-            if not fp.exists():
-                logger.warning(f"Metadata file not found: {fp}")
-                continue
-            try:
-                df = pd.read_parquet(fp)
-            except Exception as e:
-                logger.warning(f"Failed to load {p}: {e}")
-                continue
-            if "source" in df.columns:
-                dfs.append(df)
-            elif "character_id" in df.columns:
-                rows = []
-                for _, row in df.iterrows():
-                    for t in row["character_transforms"]:
-                        rows.append({
-                            "source": self._normalize(t["source"]),
-                            "target": self._normalize(t["target"]),
-                            "context": t.get("context", ""),
-                            "method": t.get("method", ""),
-                            "weight": t.get("weight", 0),
-                            "logographic_ref": t.get("logographic_ref")
-                        })
-                dfs.append(pd.DataFrame(rows))
-        return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame(columns=["source","target","context","method","weight","logographic_ref"])
-
-    def _load_wordlist(self) -> list[str]:
-        for name in ("large_wordlist.txt", "wordlist.txt"):
-            fp = pathlib.Path(name)
-            if fp.exists():
-                try:
-                    lines = fp.read_text(encoding="utf-8").splitlines()
-                except Exception as e:
-                    logger.warning(f"Unable to read wordlist {name}: {e}")
-                    continue
-                words = sorted({w.strip().lower() for w in lines if w.strip()})
-                if not words:
-                    logger.warning(f"{name} is empty.")
-                return words
-        logger.warning("No wordlist found; dictionary disabled.")
-        return []
+        return load_metadata(paths)
+
+    def _load_wordlist(self) -> CompiledWordlist | list[str]:
+        return load_wordlist()
+
+    def _subsequence_index(self) -> SubsequenceIndex:
+        # Built on first dictionary scan; rebuilt if the wordlist is replaced
+        idx = getattr(self, "_subsequences", None)
+        if idx is None or idx.words is not self.wordlist:
+            idx = self._subsequences = SubsequenceIndex(self.wordlist)
+        return idx
+
+    def _anagram_index(self) -> AnagramIndex:
+        idx = getattr(self, "_anagrams", None)
+        if idx is None or idx.source is not self.wordlist:
+            idx = self._anagrams = AnagramIndex(self.wordlist)
+        return idx
+
+    def _phonetic_index(self) -> PhoneticIndex:
+        # Rebuilt only when the wordlist or the phonetic rows change, not on every metadata reload
+        idx, meta = getattr(self, "_phonetics", None), self.meta
+        if idx is not None and idx.words is self.wordlist and self._phonetics_meta is meta:
+            return idx
+        rules = phonetic_rules(meta.frame)
+        if idx is None or idx.words is not self.wordlist or idx.rules != rules:
+            idx = self._phonetics = PhoneticIndex(self.wordlist, rules)
+        self._phonetics_meta = meta
+        return idx
+
+    def _reverse_index(self) -> ReverseIndex:
+        idx, meta = getattr(self, "_reverse", None), self.meta
+        if idx is None or self._reverse_meta is not meta:
+            idx = self._reverse = ReverseIndex(meta.frame)
+            self._reverse_meta = meta
+        return idx
+
+    def _embedded_index(self) -> WordAutomaton:
+        idx = getattr(self, "_embedded", None)
+        if idx is None or idx.source is not self.wordlist:
+            idx = self._embedded = WordAutomaton(self.wordlist)
+        return idx
+
+    def embedded_words(self, s: str | None = None) -> list[str]:
+        """Dictionary words occurring as substrings of s (default: the working seed)."""
+        if not self.wordlist:
+            return []
+        return self._embedded_index().found_words(self.working_seed if s is None else s)
 
     def _is_subsequence(self, small: str, big: str) -> bool:
         it = iter(big)
@@ -194,15 +411,11 @@ class TransformEngine:
 
     def load_tree(self) -> dict[str, dict]:
         nodes: dict[str, dict] = {}
-        if self.tree_log.exists():
-            for line in self.tree_log.read_text(encoding="utf-8").splitlines():
-                if not line.strip():
-                    continue
-                try:
-                    n = json.loads(line)
-                    nodes[n["id"]] = n
-                except Exception as e:
-                    logger.warning(f"Skipping invalid log line: {e}")
+        for n in self.node_log.iter_nodes():
+            if "id" not in n:
+                logger.warning("Skipping log line without an id")
+                continue
+            nodes[n["id"]] = n
         return nodes
 
     def _next_id(self):
@@ -231,12 +444,20 @@ class TransformEngine:
             "diff": diff,
             "description": description if description is not None else self.description
         }
-        with self.tree_log.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(node, ensure_ascii=False) + "\n")
+        try:
+            self.node_log.append(node)
+        except (RuntimeError, OSError) as e:
+            # A failed write or a restarting log server must not end the session
+            logger.warning(f"Node {node['id']} was not logged: {e}")
+            return
+        self.lineage.note_appended(self.node_log, node)
+        self.completion.add_node(node)
 
     def _commit_node(self):
         prev_id = self.current_node_id
         new_id = self._next_id()
+        # The new node carries the new id; logging it under prev_id made every commit its own parent
+        self.current_node_id = new_id
         self._log_node(
             source=self.prev_working_seed,
             target=self.working_seed,
@@ -247,20 +468,18 @@ class TransformEngine:
         )
         # Log to sqlite, pass method for up/down mark
         self._log_sqlite(self.prev_working_seed, self.working_seed, self.branch, self.last_action_method or "")
-        self.current_node_id = new_id
         self.parent_id = prev_id
         self.step += 1
         self.last_action_method = None
         self.description = ""
         self.prev_working_seed = self.working_seed
+        # The id counter moved; snapshot now so a resume never reissues an id
+        self.checkpoint(force=True)
         logger.info(f"Committed node {new_id}")
 
     # --- Begin: Transform methods from 1.7.1 ---
     def get_options(self, char: str, method: str) -> pd.DataFrame:
-        return self.metadata[
-            (self.metadata["source"] == char) &
-            (self.metadata["method"] == method)
-        ].sort_values("weight", ascending=False)
+        return self.meta.get_options(char, method)
 
     def symbolic_transform(self):
         c = prompt("Letter to transform > ").strip().lower()
@@ -277,15 +496,14 @@ class TransformEngine:
         if not (pick.isdigit() and 1 <= int(pick) <= len(opts)):
             return
         t = opts.iloc[int(pick) - 1]
-        positions = [i for i, ch in enumerate(self.working_seed) if ch == c]
+        positions = self.seed_buf.positions(c)
         if not positions:
             print(f"No '{c}' found in working seed.")
             return
         if len(positions) == 1:
             pos = positions[0]
             self.prev_working_seed = self.working_seed
-            s = self.working_seed
-            self.working_seed = s[:pos] + t.target + s[pos+1:]
+            self.seed_buf.replace(pos, 1, t.target)
             self.last_action_method = "symbolic"
             print(f"Updated Working Seed: {self.working_seed}")
             return
@@ -296,17 +514,13 @@ class TransformEngine:
         print("a. Apply to all")
         pos_pick = prompt(f"Pick position (1-{len(positions)}) or 'a' for all > ").strip().lower()
         self.prev_working_seed = self.working_seed
-        s = self.working_seed
         if pos_pick == 'a':
-            s_list = list(s)
-            for pos in positions:
-                s_list[pos] = t.target
-            self.working_seed = "".join(s_list)
+            self.working_seed = Rewriter({c: t.target}).apply(self.working_seed)
             self.last_action_method = "symbolic_all"
             print(f"Updated Working Seed (all): {self.working_seed}")
         elif pos_pick.isdigit() and 1 <= int(pos_pick) <= len(positions):
             pos = positions[int(pos_pick)-1]
-            self.working_seed = s[:pos] + t.target + s[pos+1:]
+            self.seed_buf.replace(pos, 1, t.target)
             self.last_action_method = "symbolic"
             print(f"Updated Working Seed: {self.working_seed}")
         else:
@@ -327,7 +541,7 @@ class TransformEngine:
         if not (pick.isdigit() and 1 <= int(pick) <= len(opts)):
             return
         t = opts.iloc[int(pick) - 1]
-        positions = [i for i, ch in enumerate(self.working_seed) if ch == c]
+        positions = self.seed_buf.positions(c)
         if not positions:
             print(f"No '{c}' found in working seed.")
             return
@@ -339,23 +553,91 @@ class TransformEngine:
             return
         pos = positions[int(pos_pick) - 1]
         self.prev_working_seed = self.working_seed
-        s = self.working_seed
-        self.working_seed = s[:pos] + t.target + s[pos+1:]
+        self.seed_buf.replace(pos, 1, t.target)
         self.last_action_method = "phonetic"
         print(f"Updated Working Seed: {self.working_seed}")
 
-    def acronym_transform(self):
+    def sound_matches(self, s: str) -> list:
+        """(fragment, pos, word) for words sounding like s or one of its fragments."""
+        idx = self._phonetic_index()
+        matches = [(s, 0, w) for w in idx.sounds_like(s)]
+        matches += [(frag, pos, w) for frag, pos, words in idx.fragments(s) if frag != s for w in words]
+        return matches
+
+    def sounds_like(self):
+        """Words that sound like the working seed or one of its fragments, by phonetic key."""
         s = self.working_seed
+        if not self.wordlist:
+            print("Wordlist empty.")
+            return
+        found = self.sound_matches(s)
+        if not found:
+            print("No sound-alike words.")
+            return
+        matches = found[:self.PICKS_SHOWN]
+        for i, (frag, pos, word) in enumerate(matches, 1):
+            print(f"{i}. '{frag}' at pos {pos} sounds like '{word}'")
+        if len(found) > len(matches):
+            print(f"... {len(found) - len(matches)} more not shown")
+        pick = prompt("Pick (num) > ").strip()
+        if pick.isdigit() and 1 <= int(pick) <= len(matches):
+            frag, pos, word = matches[int(pick) - 1]
+            self.prev_working_seed = self.working_seed
+            self.seed_buf.replace(pos, len(frag), word)
+            self.last_action_method = "phonetic_word"
+            print(f"Updated Working Seed: {self.working_seed}")
+
+    def backward_proposals(self, s: str) -> list:
+        """(pos, target, source, method, weight) for every target span of s that collapses to a source."""
+        return [(pos, tgt, row.source, row.method, row.weight)
+                for pos, tgt, rows in self._reverse_index().spans(s) for row in rows.itertuples()]
+
+    def backward_transform(self):
+        """Propose collapsing transform targets found in the working seed back to their sources."""
+        s = self.working_seed
+        idx = self._reverse_index()
+        found = self.backward_proposals(s)
+        if not found:
+            print("No transform targets found in working seed.")
+            return
+        props = found[:self.PICKS_SHOWN]
+        for i, (pos, tgt, src, method, weight) in enumerate(props, 1):
+            print(f"{i}. '{tgt}' at pos {pos} ← {src} [{method}, w={weight}]")
+        if len(found) > len(props):
+            print(f"... {len(found) - len(props)} more not shown")
+        collapsed, used = idx.collapse(s)
+        print(f"a. Collapse all ({len(used)} spans): {collapsed}")
+        pick = prompt("Pick (num) or 'a' > ").strip().lower()
+        if pick == 'a':
+            self.prev_working_seed = self.working_seed
+            self.working_seed = collapsed
+            self.last_action_method = "backward_all"
+            print(f"Updated Working Seed (all): {self.working_seed}")
+        elif pick.isdigit() and 1 <= int(pick) <= len(props):
+            pos, tgt, src, method, _ = props[int(pick) - 1]
+            self.prev_working_seed = self.working_seed
+            self.seed_buf.replace(pos, len(tgt), src)
+            self.last_action_method = f"backward_{method}"
+            print(f"Updated Working Seed: {self.working_seed}")
+
+    def _acronym_groups(self) -> dict[str, pd.DataFrame]:
+        return self.meta.acronyms
+
+    def acronym_blocks(self, s: str) -> list:
+        """(block, pos, rows) for every substring of s with acronym transforms."""
+        groups = self._acronym_groups()
+        longest = max((len(k) for k in groups), default=0)
         blocks: list = []
         for i in range(len(s)):
-            for j in range(i + 2, len(s) + 1):
+            for j in range(i + 2, min(len(s), i + longest) + 1):
                 blk = s[i:j]
-                rows = self.metadata[
-                    (self.metadata["source"] == blk) &
-                    (self.metadata["method"] == "acronym")
-                ]
-                if not rows.empty:
-                    blocks.append((blk, i, rows))
+                if blk in groups:
+                    blocks.append((blk, i, groups[blk]))
+        return blocks
+
+    def acronym_transform(self):
+        s = self.working_seed
+        blocks = self.acronym_blocks(s)
         if not blocks:
             print("No acronym matches.")
             return
@@ -369,18 +651,15 @@ class TransformEngine:
             blk, pos, rows = blocks[b]
             t = rows.iloc[x]
             self.prev_working_seed = self.working_seed
-            self.working_seed = s[:pos] + t.target + s[pos + len(blk):]
+            self.seed_buf.replace(pos, len(blk), t.target)
             self.last_action_method = "acronym"
             print(f"Updated Working Seed: {self.working_seed}")
 
-    def smart_dict_scan(self):
-        s = self.working_seed
-        if not self.wordlist:
-            print("Wordlist empty.")
-            return
+    def dictionary_candidates(self, s: str, limit: int = 50) -> list:
+        """(fragment, word, pos, up, down) dictionary matches for s, in wordlist order."""
         candidates: list = []
         MAX_FRAG_LEN = 6
-        MAX_CANDIDATES = 50
+        MAX_UP, MAX_DOWN = 4, 3
 
         fragments = set()
         for i in range(len(s)):
@@ -388,23 +667,31 @@ class TransformEngine:
                 fragments.add(s[i:j])
         fragments.add(s)
 
-        for w in self.wordlist:
-            if abs(len(w) - len(s)) > 10:
-                continue
-            for frag in fragments:
-                if len(frag) < 2:
-                    continue
-                if self._is_subsequence(frag, w) or self._is_subsequence(w, frag):
-                    up = ''.join((Counter(w) - Counter(frag)).elements())
-                    down = ''.join((Counter(frag) - Counter(w)).elements())
-                    if len(up) <= 4 and len(down) <= 3:
-                        pos = s.find(frag) if frag in s else 0
-                        candidates.append((frag, w, pos, up, down))
-                        if len(candidates) >= MAX_CANDIDATES:
-                            break
-            if len(candidates) >= MAX_CANDIDATES:
-                break
+        # The index streams (word, fragment) matches in wordlist order, so the
+        # scan stops at the limit like the old linear pass instead of
+        # resolving every fragment in full.
+        index = self._subsequence_index()
+        hits = list(islice(index.matches(fragments, MAX_UP, MAX_DOWN, lengths=(len(s) - 10, len(s) + 10)), limit))
+        # Up/down letters for every hit of a fragment come from one histogram subtraction
+        hist = WordHistograms([self.wordlist[wi] for wi, _ in hits])
+        rows_of = defaultdict(list)
+        for r, (_, frag) in enumerate(hits):
+            rows_of[frag].append(r)
+        diffs = {}
+        for frag, rows in rows_of.items():
+            diffs.update(zip(rows, hist.letter_diffs(frag, rows)))
+        for r, (wi, frag) in enumerate(hits):
+            up, down = diffs[r]
+            pos = s.find(frag) if frag in s else 0
+            candidates.append((frag, hist.words[r], pos, up, down))
+        return candidates
 
+    def smart_dict_scan(self):
+        s = self.working_seed
+        if not self.wordlist:
+            print("Wordlist empty.")
+            return
+        candidates = self.dictionary_candidates(s)
         if not candidates:
             print("No fuzzy matches found.")
             return
@@ -416,17 +703,47 @@ class TransformEngine:
             self.prev_working_seed = self.working_seed
             self.up_seed += up
             self.down_seed += down
-            self.working_seed = s[:pos] + full + s[pos + len(f):]
+            self.seed_buf.replace(pos, len(f), full)
             self.last_action_method = "dictionary"
             print(f"Updated Working Seed: {self.working_seed}")
 
+    def decode_pool(self):
+        """List dictionary words (and optionally phrases) spellable from the up or down letters."""
+        try:
+            ch = prompt("Decode [1=up,3=down]>").strip()
+        except (EOFError, KeyboardInterrupt):
+            print("\nOperation cancelled.")
+            return
+        pool = self.up_seed if ch == '1' else self.down_seed if ch == '3' else None
+        if pool is None:
+            print("Invalid selection.")
+            return
+        if not pool:
+            print("Selected pool is empty.")
+            return
+        if not self.wordlist:
+            print("Wordlist empty.")
+            return
+        idx = self._anagram_index()
+        words = idx.words(pool, limit=100)
+        if not words:
+            print(f"No words spellable from '{pool}'.")
+            return
+        print(f"Words from '{pool}':")
+        print(", ".join(words))
+        if prompt("Show full-pool phrases? (y/n) > ").strip().lower() == 'y':
+            phrases = idx.phrases(pool, max_words=3, limit=50)
+            if not phrases:
+                print("No phrases use every letter.")
+            for i, ph in enumerate(phrases, 1):
+                print(f"{i}. {' '.join(ph)}")
+
     def select(self):
         try:
             ch = prompt("Select [1=up,2=wrk,3=down]>").strip()
         except (EOFError, KeyboardInterrupt):
             print("\nOperation cancelled.")
             return
-        branch_id = self._next_id()
         prev_id = self.current_node_id
         prev_seed = self.working_seed
         desc = None
@@ -451,7 +768,8 @@ class TransformEngine:
         else:
             print("Invalid selection.")
             return
-        self.current_node_id = branch_id
+        # Take the id only once a node will be logged under it
+        self.current_node_id = self._next_id()
         self.parent_id = prev_id
         self._log_node(
             source=prev_seed,
@@ -462,6 +780,8 @@ class TransformEngine:
             down=self.down_seed,
             description=desc
         )
+        # As in _commit_node: the id counter moved, so a resume must not reissue it
+        self.checkpoint(force=True)
         print(f"Now: {self.working_seed}")
 
     def add_description(self):
@@ -476,7 +796,7 @@ class TransformEngine:
 
     def set_branch(self):
         try:
-            branch = prompt("Enter branch name/tag > ").strip()
+            branch = prompt("Enter branch name/tag > ", completer=self._completer("branches"), complete_while_typing=True).strip()
         except (EOFError, KeyboardInterrupt):
             print("\nOperation cancelled.")
             return
@@ -485,36 +805,81 @@ class TransformEngine:
             print(f"Branch/tag set: {branch}")
 
     def print_list(self):
-        if not self.tree_log.exists():
+        if self.node_log.is_empty():
             print("No nodes.")
             return
-        for line in self.tree_log.read_text(encoding="utf-8").splitlines():
-            if not line.strip():
-                continue
-            node = json.loads(line)
+        for node in self.node_log.iter_nodes():
             print(json.dumps(node, ensure_ascii=False))
 
+    def render_tree(self, node_id: str | None = None, max_depth: int | None = None, branch: str | None = None,
+                    collapse: bool = True, limit: int | None = DEFAULT_LIMIT):
+        """Lines of the forest, or of the subtree under node_id, generated lazily."""
+        if node_id:
+            root = self.lineage.get(node_id)
+            roots = [root] if root else []
+        else:
+            roots = self.lineage.roots()
+        return render_tree(roots, self.lineage.children, max_depth, branch, collapse, limit)
+
     def print_tree(self):
-        nodes = self.load_tree()
-        children = {}
-        for nid, n in nodes.items():
-            p = n.get("parent_id")
-            if p not in children: children[p] = []
-            children[p].append(nid)
-        def walk(nid, depth=0):
-            if nid not in nodes: return
-            n = nodes[nid]
-            print("  " * depth + f"{nid[-2:]}: {n['source']} \u2192 {n['target']} [{n.get('branch','')}] ({n.get('description','')})")
-            for child in children.get(nid, []):
-                walk(child, depth+1)
-        roots = [nid for nid, n in nodes.items() if n["parent_id"] is None]
-        for r in roots: walk(r)
+        try:
+            opts = prompt("Tree options [node=ID depth=N branch=B limit=N full] > ").strip().split()
+        except (EOFError, KeyboardInterrupt):
+            print("\nOperation cancelled.")
+            return
+        kw = {"collapse": "full" not in opts}
+        for o in opts:
+            key, _, val = o.partition("=")
+            if key == "node" and val:
+                kw["node_id"] = val
+            elif key in ("depth", "limit") and val.isdigit():
+                kw["max_depth" if key == "depth" else "limit"] = int(val)
+            elif key == "branch" and val:
+                kw["branch"] = val
+        if kw.get("node_id") and self.lineage.get(kw["node_id"]) is None:
+            print("Node id not found.")
+            return
+        page(self.render_tree(**kw))
+
+    def ancestors(self, node_id: str | None = None) -> list[dict]:
+        return self.lineage.ancestors(node_id or self.current_node_id)
+
+    def subtree(self, node_id: str | None = None, max_depth: int | None = None, branch: str | None = None) -> list[tuple[int, dict]]:
+        return self.lineage.subtree(node_id or self.current_node_id, max_depth, branch)
+
+    def print_ancestors(self):
+        try:
+            nid = prompt(f"Node id [{self.current_node_id}] > ", completer=self._completer("nodes")).strip()
+        except (EOFError, KeyboardInterrupt):
+            print("\nOperation cancelled.")
+            return
+        node_id = self._resolve_node_id(nid) if nid else self.current_node_id
+        chain = self.ancestors(node_id) if node_id else []
+        if not chain:
+            print("Node id not found.")
+            return
+        for depth, n in enumerate(chain):
+            print("  " * depth + format_node(n))
+
+    def print_subtree(self):
+        try:
+            nid = prompt(f"Node id [{self.current_node_id}] > ", completer=self._completer("nodes")).strip()
+            depth = prompt("Max depth (blank for all) > ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print("\nOperation cancelled.")
+            return
+        node_id = self._resolve_node_id(nid) if nid else self.current_node_id
+        rows = self.subtree(node_id, int(depth) if depth.isdigit() else None) if node_id else []
+        if not rows:
+            print("Node id not found.")
+            return
+        for d, n in rows:
+            print("  " * d + format_node(n))
 
     def reset_working(self):
-        nodes = self.load_tree()
-        if self.current_node_id in nodes:
-            n = nodes[self.current_node_id]
-            self.working_seed = n['target']
+        n = self.node_log.get(self.current_node_id)
+        if n is not None:
+            self.seed_buf.reset(n['target'])
             self.prev_working_seed = self.working_seed
             self.up_seed = n.get('up_seed', '')
             self.down_seed = n.get('down_seed', '')
@@ -536,15 +901,62 @@ Help — SLF Menu Commands:
 [6 lock/commit]  : Commit current node (increments step/ID and logs all details)
 [7 select]       : Switch working seed to Up, Down, or remain (branches log if Up/Down)
 [8 list]         : Print all nodes in the JSONL log
-[9 tree]         : Print log as a tree (parent/child indented)
+[9 tree]         : Print log as a tree (node=ID depth=N branch=B limit=N full)
 [10 branch]      : Set or tag the current branch
 [11 desc]        : Add/edit description for next commit
+[12 decode]      : List words/phrases spellable from the Up or Down letters
+[13 ancestors]   : Print the chain from the root to a node
+[14 subtree]     : Print all descendants of a node
+[15 sounds]      : Words that sound like the seed or its fragments (phonetic key)
+[16 back]        : Backward transform: collapse targets in the seed to their sources
+[undo]           : Undo the last edit to the working seed
+[redo]           : Redo the last undone edit
 [reset]          : Reset working, up, down to current node in log
 [goto]           : Jump to any previous node by ID
 [q quit]         : Quit
 [help]           : Print this help menu
 """)
 
+    def run_command(self, method: str):
+        """Run one command method, recording the seed fields around any edit it makes."""
+        before, edits = self._edit_fields(), self.seed_buf.edits
+        getattr(self, method)()
+        if self.seed_buf.edits != edits:
+            self.seed_buf.annotate((before, self._edit_fields()))
+
+    def _edit_fields(self) -> tuple:
+        return tuple(getattr(self, f, None) for f in EDIT_FIELDS)
+
+    def _move_fields(self, frm: tuple | None, to: tuple | None, label: str):
+        # Only fields still as the edit left them are moved; a commit since then
+        # (new prev_working_seed, cleared method) is kept
+        restored = False
+        if frm is not None and to is not None:
+            for f, a, b in zip(EDIT_FIELDS, frm, to):
+                if getattr(self, f, None) == a:
+                    setattr(self, f, b)
+                    restored |= f == "last_action_method"
+        if not restored:
+            self.last_action_method = label
+
+    def undo_edit(self):
+        entry = self.seed_buf.undo()
+        if entry is None:
+            print("Nothing to undo.")
+            return
+        before, after = entry[1] or (None, None)
+        self._move_fields(after, before, "undo")
+        print(f"Undone: {self.working_seed}")
+
+    def redo_edit(self):
+        entry = self.seed_buf.redo()
+        if entry is None:
+            print("Nothing to redo.")
+            return
+        before, after = entry[1] or (None, None)
+        self._move_fields(before, after, "redo")
+        print(f"Redone: {self.working_seed}")
+
     def reverse_transform(self):
         self.prev_working_seed = self.working_seed
         self.working_seed = self.working_seed[::-1]
@@ -553,7 +965,7 @@ Help — SLF Menu Commands:
 
     def manual_enter_seed(self):
         try:
-            s = prompt("New seed >").strip()
+            s = prompt("New seed >", completer=self._completer("seeds"), complete_while_typing=True).strip()
         except (EOFError, KeyboardInterrupt):
             print("\nOperation cancelled.")
             return
@@ -583,7 +995,7 @@ Help — SLF Menu Commands:
             pos = positions[int(pos_input)-1]
             self.prev_working_seed = s
             self.up_seed += up
-            self.working_seed = s[:pos] + up + s[pos:]
+            self.seed_buf.insert(pos, up)
             self.last_action_method = "manual_up"
             print(f"Added (up): {up} at {pos} => {self.working_seed}")
 
@@ -595,7 +1007,7 @@ Help — SLF Menu Commands:
             return
         if down:
             s = self.working_seed
-            positions = [i for i, c in enumerate(s) if c == down]
+            positions = self.seed_buf.positions(down)
             if not positions:
                 print(f"No '{down}' found in working seed.")
                 return
@@ -609,33 +1021,23 @@ Help — SLF Menu Commands:
             pos = positions[int(pos_input)-1]
             self.prev_working_seed = s
             self.down_seed += down
-            self.working_seed = s[:pos] + s[pos+1:]
+            self.seed_buf.delete(pos, 1)
             self.last_action_method = "manual_down"
             print(f"Removed (down): {down} at {pos} => {self.working_seed}")
 
     def goto(self):
-        nodes = self.load_tree()
-        if not nodes:
-            print("No nodes.")
-            return
-        node_list = list(nodes.items())
-        print("Available nodes:")
-        for idx, (nid, n) in enumerate(node_list, 1):
-            print(f"{idx}. {nid}|{n['source']}\u2192{n['target']}|step={n['step']}|method={n['method']}")
+        # Ids complete from the index as they are typed, so the log is never listed or scanned here
         try:
-            sel = prompt("Pick node by number or enter node id > ").strip()
+            sel = prompt("Node id (Tab completes) > ", completer=self._completer("nodes"), complete_while_typing=True).strip()
         except (EOFError, KeyboardInterrupt):
             print("\nOperation cancelled.")
             return
-        if sel.isdigit() and 1 <= int(sel) <= len(node_list):
-            goto_id = node_list[int(sel) - 1][0]
-        else:
-            goto_id = sel
-        if goto_id not in nodes:
+        goto_id = self._resolve_node_id(sel)
+        n = self.lineage.get(goto_id) if goto_id else None
+        if n is None:
             print("Node id not found.")
             return
-        n = nodes[goto_id]
-        self.working_seed = n['target']
+        self.seed_buf.reset(n['target'])
         self.prev_working_seed = self.working_seed
         self.current_node_id = n['id']
         self.up_seed = n.get('up_seed', '')
@@ -646,26 +1048,17 @@ Help — SLF Menu Commands:
     # --- End: Transform methods from 1.7.1 ---
 
     # --- Begin: 1.7.3 unique methods ---
+    def _jump_map(self) -> dict[str, list[tuple[str, str]]]:
+        if self.server is not None:
+            return {src: [tuple(t) for t in tgts] for src, tgts in self.server.query("jump").items()}
+        c = self.conn.cursor()
+        c.execute('SELECT DISTINCT source, target, branch, reversal, identical, received_up, received_down FROM transform_log')
+        return jump_map(c.fetchall())
+
     def jump_1e(self):
         """Provide fast hash-based jump menu for roots and major transforms.
         Exclude reversals, identicals, and any seed that has received up or down."""
-        c = self.conn.cursor()
-        # Find all seeds that have received an up or down
-        c.execute('SELECT DISTINCT source FROM transform_log WHERE received_up=1 OR received_down=1')
-        received_mod_sources = {row[0] for row in c.fetchall()}
-        c.execute('SELECT DISTINCT target FROM transform_log WHERE received_up=1 OR received_down=1')
-        received_mod_targets = {row[0] for row in c.fetchall()}
-        received_mod = received_mod_sources | received_mod_targets
-
-        # Only include entries that are not reversals, not identicals, and not in received_mod
-        c.execute('SELECT DISTINCT source, target, branch, reversal, identical FROM transform_log')
-        root_map = defaultdict(list)
-        for source, target, branch, reversal, identical in c.fetchall():
-            if reversal or identical:
-                continue
-            if source in received_mod or target in received_mod:
-                continue
-            root_map[source].append((target, branch))
+        root_map = self._jump_map()
         if not root_map:
             print("No jumpable entries.")
             return
@@ -689,42 +1082,79 @@ Help — SLF Menu Commands:
                 print(f"Working seed set to {chosen_target}, branch {chosen_branch}")
 
     def close(self):
+        if getattr(self, "metadata_watcher", None):
+            self.metadata_watcher.stop()
+        if hasattr(self, "session_id"):
+            self.checkpoint(force=True)
         if hasattr(self, "conn") and self.conn:
             self.conn.close()
+        if hasattr(self, "node_log"):
+            self.node_log.close()
+        self.profiler.close()
+
+FOUND_SHOWN = 12
+
+# (aliases, engine method) for every interactive command except quit
+COMMAND_TABLE = (
+    (('1a',), 'symbolic_transform'),
+    (('1b',), 'phonetic_transform'),
+    (('1c',), 'acronym_transform'),
+    (('1d',), 'smart_dict_scan'),
+    (('1e',), 'jump_1e'),
+    (('2',), 'reverse_transform'),
+    (('3',), 'manual_enter_seed'),
+    (('4', 'up', 'add'), 'manual_up_add'),
+    (('5', 'down', 'remove'), 'manual_down_remove'),
+    (('6', 'lock', 'commit'), '_commit_node'),
+    (('7', 'select'), 'select'),
+    (('8', 'list'), 'print_list'),
+    (('9', 'tree'), 'print_tree'),
+    (('10', 'branch'), 'set_branch'),
+    (('11', 'desc', 'description'), 'add_description'),
+    (('12', 'decode'), 'decode_pool'),
+    (('13', 'ancestors'), 'print_ancestors'),
+    (('14', 'subtree'), 'print_subtree'),
+    (('15', 'sounds'), 'sounds_like'),
+    (('16', 'back', 'backward'), 'backward_transform'),
+    (('u', 'undo'), 'undo_edit'),
+    (('redo',), 'redo_edit'),
+    (('reset',), 'reset_working'),
+    (('goto',), 'goto'),
+    (('help',), 'help'),
+)
+COMMANDS = {alias: method for aliases, method in COMMAND_TABLE for alias in aliases}
+QUIT = ('q', 'quit')
+CMDS_PROMPT = (
+    "[1a sym 1b phon 1c acr 1d dict 1e jump "
+    "2 rev 3 enter 4 up add 5 down remove 6 lock 7 select 8 list 9 tree 10 branch 11 desc 12 decode 13 ancestors 14 subtree 15 sounds 16 back undo redo reset goto help q quit]> "
+)
+
+def dispatch(engine: TransformEngine, cmd: str) -> bool:
+    """Run one interactive command; False if cmd is not a command."""
+    method = COMMANDS.get(cmd)
+    if method is None:
+        return False
+    with engine.profiler.command(cmd, engine.working_seed):
+        engine.run_command(method)
+    return True
 
 def interactive_loop(engine: TransformEngine):
-    cmds = (
-        "[1a sym 1b phon 1c acr 1d dict 1e jump "
-        "2 rev 3 enter 4 up add 5 down remove 6 lock 7 select 8 list 9 tree 10 branch 11 desc reset goto help q quit]> "
-    )
     while True:
         print(f"\n──────────────")
         print(f"Work:{engine.working_seed}|Up:{engine.up_seed}|Down:{engine.down_seed}|Node:{engine.current_node_id}|Step:{engine.step}|Branch:{engine.branch}")
+        found = engine.embedded_words()
+        if found:
+            print(f"Found:{', '.join(found[:FOUND_SHOWN])}{' ...' if len(found) > FOUND_SHOWN else ''}")
         try:
-            cmd = prompt(cmds).strip().lower()
+            cmd = prompt(CMDS_PROMPT).strip().lower()
         except (EOFError, KeyboardInterrupt):
             print("\nSession ended.")
             break
-        if cmd == '1a': engine.symbolic_transform()
-        elif cmd == '1b': engine.phonetic_transform()
-        elif cmd == '1c': engine.acronym_transform()
-        elif cmd == '1d': engine.smart_dict_scan()
-        elif cmd == '1e': engine.jump_1e()
-        elif cmd == '2': engine.reverse_transform()
-        elif cmd == '3': engine.manual_enter_seed()
-        elif cmd in ('4','up','add'): engine.manual_up_add()
-        elif cmd in ('5','down','remove'): engine.manual_down_remove()
-        elif cmd in ('6','lock','commit'): engine._commit_node()
-        elif cmd in ('7','select'): engine.select()
-        elif cmd in ('8','list'): engine.print_list()
-        elif cmd in ('9','tree'): engine.print_tree()
-        elif cmd in ('10','branch'): engine.set_branch()
-        elif cmd in ('11','desc','description'): engine.add_description()
-        elif cmd == 'reset': engine.reset_working()
-        elif cmd == 'goto': engine.goto()
-        elif cmd == 'help': engine.help()
-        elif cmd in ('q','quit'): break
-        else: print("Unknown command.")
+        if cmd in QUIT:
+            break
+        if not dispatch(engine, cmd):
+            print("Unknown command.")
+        engine.checkpoint()
     engine.close()
     print("Bye.")
 
@@ -732,87 +1162,30 @@ if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('-m','--metadata', nargs='+', default=['character_transforms.parquet','acronym_transforms.parquet','phonetic_transforms.parquet'])
     ap.add_argument('-s','--seed', default='')
+    ap.add_argument('--log', default='seed_tree.jsonl', help='Node log: a JSONL file, or a directory / *.d path for the segmented log')
+    ap.add_argument('--resume', nargs='?', const='latest', default=None, metavar='SESSION',
+                    help='Resume the latest checkpointed session, or the named session id')
+    ap.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR)
+    ap.add_argument('--no-watch', action='store_true', help='Do not reload metadata files when they change')
+    ap.add_argument('--server', default=None, metavar='SOCKET', help='Send reads and writes through a running slf_log_server.py')
+    ap.add_argument('--tui', action='store_true', help='Full-screen interface (status, menu, results and log regions)')
+    ap.add_argument('--profile', nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                    help='Profile every command; pstats and collapsed stacks go to a session directory under DIR')
     args = ap.parse_args()
-    interactive_loop(TransformEngine(args.metadata, args.seed))
-
-
-# === INTERFACE START ===
-from colorama import Fore, Style, init
-init(autoreset=True)
-import os
-
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def print_status(engine):
-    print(f"\n{Fore.CYAN}{'═'*40}")
-    print(f"{Fore.GREEN}🌱  SLF Transform Engine — v1.7.4")
-    print(f"{Fore.CYAN}{'═'*40}")
-    print(f"{Fore.YELLOW}🔤 Seed      : {Style.BRIGHT}{engine.working_seed}")
-    print(f"{Fore.BLUE}🔼 Up Seed   : {Style.BRIGHT}{engine.up_seed}")
-    print(f"{Fore.MAGENTA}🔽 Down Seed : {Style.BRIGHT}{engine.down_seed}")
-    branch_info = "← Reverse" if engine.reverse_mode else "→ Forward"
-    print(f"{Fore.LIGHTBLACK_EX}📍 Branch    : {branch_info} {Fore.LIGHTWHITE_EX}| Step {engine.step}")
-    print(f"{Fore.CYAN}{'─'*40}")
-    print(f"{Fore.WHITE}🆔 Node ID   : {Style.BRIGHT}{engine.current_node_id}")
-
-def help():
-    print(f"""
-{Fore.GREEN}{Style.BRIGHT}📘 Help — SLF Menu Commands:{Style.RESET_ALL}
-
-{Fore.YELLOW}{Style.BRIGHT}[1a] Symbolic        {Style.RESET_ALL}→ Parquet letter/meaning transform
-{Fore.YELLOW}{Style.BRIGHT}[1b] Phonetic        {Style.RESET_ALL}→ Phonetic substitutions
-{Fore.YELLOW}{Style.BRIGHT}[1c] Acronym         {Style.RESET_ALL}→ State/company/country/stock mappings
-{Fore.YELLOW}{Style.BRIGHT}[1d] Dictionary Scan {Style.RESET_ALL}→ Wordlist-based fuzzy match
-{Fore.YELLOW}{Style.BRIGHT}[1e] Jump            {Style.RESET_ALL}→ Fast jump to unique targets
-
-{Fore.CYAN}{Style.BRIGHT}[2]  Reverse           {Style.RESET_ALL}→ Reverse the working seed
-{Fore.CYAN}{Style.BRIGHT}[3]  New Seed          {Style.RESET_ALL}→ Enter new root
-{Fore.CYAN}{Style.BRIGHT}[4]  Add (Up)          {Style.RESET_ALL}→ Append letters
-{Fore.CYAN}{Style.BRIGHT}[5]  Remove (Down)     {Style.RESET_ALL}→ Remove letters
-{Fore.CYAN}{Style.BRIGHT}[7]  Select Seed       {Style.RESET_ALL}→ Branch to Up, Down, or stay
-
-{Fore.MAGENTA}{Style.BRIGHT}[8]  List Nodes     {Style.RESET_ALL}→ Full session log
-{Fore.MAGENTA}{Style.BRIGHT}[9]  View Tree      {Style.RESET_ALL}→ Parent-child visual tree
-{Fore.MAGENTA}{Style.BRIGHT}[11] Description    {Style.RESET_ALL}→ Add narrative to next commit
-
-{Fore.RED}{Style.BRIGHT}[goto]  Goto Node       {Style.RESET_ALL}→ Jump to previous ID
-{Fore.RED}{Style.BRIGHT}[q]     Quit            {Style.RESET_ALL}→ Exit the engine
-""")
-
-def interactive_loop(engine):
-    cmds = (
-        f"{Style.BRIGHT}[1a sym 1b phon 1c acr 1d dict 1e jump "
-        f"2 rev 3 enter 4 up add 5 down remove 7 select 8 list 9 tree 11 desc goto help q quit]{Style.RESET_ALL}> "
-    )
-    while True:
-        clear_screen()
-        print_status(engine)
-        try:
-            cmd = input(Fore.LIGHTCYAN_EX + cmds + Style.RESET_ALL).strip().lower()
-        except (EOFError, KeyboardInterrupt):
-            print("\nSession ended.")
-            break
-
-        if cmd == '1a': engine.symbolic_transform()
-        elif cmd == '1b': engine.phonetic_transform()
-        elif cmd == '1c': engine.acronym_transform()
-        elif cmd == '1d': engine.smart_dict_scan()
-        elif cmd == '1e': engine.jump_1e()
-        elif cmd == '2': engine.reverse_transform()
-        elif cmd == '3': engine.manual_enter_seed()
-        elif cmd in ('4','up','add'): engine.manual_up_add()
-        elif cmd in ('5','down','remove'): engine.manual_down_remove()
-        elif cmd in ('7','select'): engine.select()
-        elif cmd in ('8','list'): engine.print_list()
-        elif cmd in ('9','tree'): engine.print_tree()
-        elif cmd in ('11','desc','description'): engine.add_description()
-        elif cmd == 'goto': engine.goto()
-        elif cmd == 'help': help()
-        elif cmd in ('q','quit'): break
-        else: print(f"{Fore.RED}Unknown command.{Style.RESET_ALL}")
-
-        engine._commit_node()
+    state = None
+    if args.resume:
+        state = load_checkpoint(args.checkpoint_dir, args.resume)
+        if state is None:
+            raise SystemExit(f"No checkpoint for '{args.resume}' in {args.checkpoint_dir}")
+        if state.get("log_path") and args.log == ap.get_default('log'):
+            args.log = state["log_path"]
+    engine = TransformEngine(args.metadata, args.seed, args.log, resume=state, checkpoint_dir=args.checkpoint_dir, server=args.server)
+    if not args.no_watch:
+        engine.watch_metadata()
+    engine.profiler = open_profiler(args.profile, engine.session_id)
+    if args.tui:
+        from slf_tui import run_tui
+        run_tui(engine)
+    else:
+        interactive_loop(engine)
 
-    engine.close()
-    print("Bye.")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Transform graph for SLF, compiled to CSR arrays.
+
+Every metadata row is a weighted edge source -> target ("a" -> "man"), and
+every logged seed-tree step is an observed edge from one seed to the next.
+Strings are interned to dense ids (`labels[i]`, `ids[label]`) and the
+edges are stored in compressed sparse row form:
+
+    offsets  int64[n + 1]   out-edges of node i are offsets[i]:offsets[i + 1]
+    indices  int32[m]       target node of each edge
+    weights  float64[m]     edge weight; parallel edges are summed
+
+Analytics run on the arrays directly:
+
+    pagerank()        weighted PageRank (dangling mass spread uniformly)
+    centrality()      label -> PageRank scaled so the mean node scores 1.0
+    scc()             strongly connected component id of every node
+    reach_counts()    number of other nodes reachable from every node
+    reachable(label)  labels reachable from one node
+
+SLFNltk scales its narrative weights by centrality(), so symbols that many
+letters, phonetic swaps and recorded sessions lead to outrank one-off ones.
+
+Usage:
+    python slf_transform_graph.py --top 20
+    python slf_transform_graph.py --log seed_tree.jsonl --reach a
+    python slf_transform_graph.py --export transform_graph.npz
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import pathlib
+from collections import defaultdict
+import numpy as np
+
+DAMPING = 0.85
+OBSERVED_WEIGHT = 1.0  # weight of one recorded seed-tree step
+
+
+class GraphBuilder:
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.edges: dict[tuple[int, int], float] = defaultdict(float)
+
+    def intern(self, label: str) -> int:
+        i = self.ids.get(label)
+        if i is None:
+            i = self.ids[label] = len(self.ids)
+        return i
+
+    def add(self, source, target, weight: float = 1.0):
+        if not source or not target or source == target:
+            return
+        self.edges[self.intern(str(source)), self.intern(str(target))] += float(weight)
+
+    def add_rows(self, rows):
+        """(source, target, weight) triples, e.g. zip over a metadata frame's columns."""
+        for s, t, w in rows:
+            self.add(s, t, w)
+
+    def add_entries(self, entries):
+        """character_metadata.json entries: their character_transforms, keyed by source."""
+        for e in entries:
+            for t in e.get("character_transforms", []):
+                self.add(t.get("source", "").lower(), t.get("target", "").lower(), t.get("weight", 1.0))
+
+    def add_log(self, nodes):
+        """Observed seed-tree steps (node dicts with source and target)."""
+        for n in nodes:
+            if n.get("method") not in ("root", None):
+                self.add(n.get("source"), n.get("target"), OBSERVED_WEIGHT)
+
+    def build(self) -> "TransformGraph":
+        n = len(self.ids)
+        labels = [""] * n
+        for label, i in self.ids.items():
+            labels[i] = label
+        if self.edges:
+            pairs = np.array(list(self.edges), dtype=np.int64)
+            w = np.fromiter(self.edges.values(), dtype=np.float64, count=len(self.edges))
+            order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+            src, dst, w = pairs[order, 0], pairs[order, 1], w[order]
+        else:
+            src = dst = np.zeros(0, dtype=np.int64)
+            w = np.zeros(0, dtype=np.float64)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        return TransformGraph(labels, offsets, dst.astype(np.int32), w)
+
+
+class TransformGraph:
+    def __init__(self, labels: list[str], offsets: np.ndarray, indices: np.ndarray, weights: np.ndarray):
+        self.labels = labels
+        self.ids = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+
+    @classmethod
+    def from_frame(cls, frame, log_nodes=()) -> "TransformGraph":
+        b = GraphBuilder()
+        b.add_rows(zip(frame["source"], frame["target"], frame["weight"]))
+        b.add_log(log_nodes)
+        return b.build()
+
+    @property
+    def n(self) -> int:
+        return len(self.labels)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def successors(self, label: str) -> list[tuple[str, float]]:
+        i = self.ids.get(label)
+        if i is None:
+            return []
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return [(self.labels[j], float(w)) for j, w in zip(self.indices[lo:hi], self.weights[lo:hi])]
+
+    # --- analytics ---
+    def pagerank(self, damping: float = DAMPING, tol: float = 1e-10, max_iter: int = 200) -> np.ndarray:
+        n = self.n
+        if n == 0:
+            return np.zeros(0)
+        rows = np.repeat(np.arange(n), np.diff(self.offsets))
+        out_w = np.bincount(rows, weights=self.weights, minlength=n)
+        dangling = out_w == 0
+        share = np.divide(self.weights, out_w[rows], out=np.zeros_like(self.weights), where=out_w[rows] > 0)
+        pr = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            nxt = np.bincount(self.indices, weights=pr[rows] * share, minlength=n)
+            nxt = (1 - damping) / n + damping * (nxt + pr[dangling].sum() / n)
+            if np.abs(nxt - pr).sum() < tol:
+                return nxt
+            pr = nxt
+        return pr
+
+    def centrality(self, damping: float = DAMPING) -> dict[str, float]:
+        """label -> PageRank * n; 1.0 is an average node."""
+        pr = self.pagerank(damping) * self.n
+        return dict(zip(self.labels, pr.tolist()))
+
+    def scc(self) -> np.ndarray:
+        """Component id of every node (Tarjan, iterative); ids are in reverse topological order."""
+        n, offsets, indices = self.n, self.offsets, self.indices
+        index = np.full(n, -1, dtype=np.int64)
+        low = np.zeros(n, dtype=np.int64)
+        comp = np.full(n, -1, dtype=np.int64)
+        on_stack = np.zeros(n, dtype=bool)
+        stack: list[int] = []
+        counter = ncomp = 0
+        for root in range(n):
+            if index[root] >= 0:
+                continue
+            work = [(root, int(offsets[root]))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                v, e = work[-1]
+                if e < offsets[v + 1]:
+                    work[-1] = (v, e + 1)
+                    w = int(indices[e])
+                    if index[w] < 0:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, int(offsets[w])))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                    continue
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = ncomp
+                        if w == v:
+                            break
+                    ncomp += 1
+        return comp
+
+    def components(self, min_size: int = 2) -> list[list[str]]:
+        """Strongly connected components with at least min_size members, largest first."""
+        groups: dict[int, list[str]] = defaultdict(list)
+        for label, c in zip(self.labels, self.scc().tolist()):
+            groups[c].append(label)
+        return sorted((g for g in groups.values() if len(g) >= min_size), key=len, reverse=True)
+
+    def reach_counts(self) -> np.ndarray:
+        """Number of other nodes reachable from every node, via the condensation DAG."""
+        comp = self.scc()
+        ncomp = int(comp.max()) + 1 if self.n else 0
+        members = [0] * ncomp
+        for v, c in enumerate(comp.tolist()):
+            members[c] |= 1 << v
+        succ: list[set[int]] = [set() for _ in range(ncomp)]
+        rows = np.repeat(np.arange(self.n), np.diff(self.offsets))
+        for cu, cv in zip(comp[rows].tolist(), comp[self.indices].tolist()):
+            if cu != cv:
+                succ[cu].add(cv)
+        # Tarjan numbers sinks first, so successors are always finished before their predecessors
+        reach = [0] * ncomp
+        for c in range(ncomp):
+            r = members[c]
+            for d in succ[c]:
+                r |= reach[d]
+            reach[c] = r
+        return np.array([reach[c].bit_count() - 1 for c in comp.tolist()], dtype=np.int64)
+
+    def reachable(self, label: str) -> list[str]:
+        start = self.ids.get(label)
+        if start is None:
+            return []
+        seen = np.zeros(self.n, dtype=bool)
+        seen[start] = True
+        frontier = [start]
+        while frontier:
+            nxt = []
+            for v in frontier:
+                for w in self.indices[self.offsets[v]:self.offsets[v + 1]].tolist():
+                    if not seen[w]:
+                        seen[w] = True
+                        nxt.append(w)
+            frontier = nxt
+        seen[start] = False
+        return [self.labels[i] for i in np.flatnonzero(seen)]
+
+    # --- export ---
+    def save(self, path: str | pathlib.Path):
+        np.savez_compressed(path, labels=np.array(self.labels, dtype=str), offsets=self.offsets,
+                            indices=self.indices, weights=self.weights)
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> "TransformGraph":
+        with np.load(path) as z:
+            return cls(z["labels"].tolist(), z["offsets"], z["indices"], z["weights"])
+
+
+def read_log(path: str | pathlib.Path) -> list[dict]:
+    nodes = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    nodes.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return nodes
+
+
+if __name__ == '__main__':
+    from slf_transform_combined import load_metadata
+
+    ap = argparse.ArgumentParser(description="Compile the transform graph and report centrality, reachability and cycles.")
+    ap.add_argument('-m', '--metadata', nargs='+', default=['character_transforms.parquet', 'acronym_transforms.parquet', 'phonetic_transforms.parquet'])
+    ap.add_argument('--log', help='Seed-tree JSONL whose steps are added as observed edges')
+    ap.add_argument('--top', type=int, default=15, help='Show the N most central symbols')
+    ap.add_argument('--reach', help='List the symbols reachable from this one')
+    ap.add_argument('--scc', action='store_true', help='List the strongly connected components (cycles)')
+    ap.add_argument('--export', help='Write the CSR arrays to this .npz file')
+    args = ap.parse_args()
+
+    graph = TransformGraph.from_frame(load_metadata(args.metadata), read_log(args.log) if args.log else ())
+    print(f"{graph.n} symbols, {len(graph.indices)} edges")
+    if args.export:
+        graph.save(args.export)
+        print(f"Wrote {args.export}")
+    if args.reach:
+        found = graph.reachable(args.reach)
+        print(f"{len(found)} reachable from '{args.reach}': {', '.join(found[:50])}{' ...' if len(found) > 50 else ''}")
+    elif args.scc:
+        for group in graph.components():
+            print(f"[{len(group)}] {', '.join(sorted(group))}")
+    else:
+        cent = graph.centrality()
+        reach = graph.reach_counts()
+        for label, score in sorted(cent.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"{label:<20} centrality {score:7.3f}   reaches {reach[graph.ids[label]]}")
@@ -21,9 +21,12 @@ import sqlite3
 from collections import Counter, defaultdict
 import pandas as pd
 from prompt_toolkit import prompt
+from slf_profile import PROFILE_DIR, open_profiler
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("SLF-Core")
+# Per-command profiler; a no-op unless --profile is given
+profiler = open_profiler()
 
 def now_iso():
     return datetime.utcnow().isoformat(timespec="seconds") + "Z"
@@ -719,32 +722,37 @@ def interactive_loop(engine: TransformEngine):
         except (EOFError, KeyboardInterrupt):
             print("\nSession ended.")
             break
-        if cmd == '1a': engine.symbolic_transform()
-        elif cmd == '1b': engine.phonetic_transform()
-        elif cmd == '1c': engine.acronym_transform()
-        elif cmd == '1d': engine.smart_dict_scan()
-        elif cmd == '1e': engine.jump_1e()
-        elif cmd == '2': engine.reverse_transform()
-        elif cmd == '3': engine.manual_enter_seed()
-        elif cmd in ('4','up','add'): engine.manual_up_add()
-        elif cmd in ('5','down','remove'): engine.manual_down_remove()
-        elif cmd in ('6','lock','commit'): engine._commit_node()
-        elif cmd in ('7','select'): engine.select()
-        elif cmd in ('8','list'): engine.print_list()
-        elif cmd in ('9','tree'): engine.print_tree()
-        elif cmd in ('10','branch'): engine.set_branch()
-        elif cmd in ('11','desc','description'): engine.add_description()
-        elif cmd == 'reset': engine.reset_working()
-        elif cmd == 'goto': engine.goto()
-        elif cmd == 'help': engine.help()
-        elif cmd in ('q','quit'): break
-        else: print("Unknown command.")
+        if cmd in ('q','quit'): break
+        with profiler.command(cmd, engine.working_seed):
+            if cmd == '1a': engine.symbolic_transform()
+            elif cmd == '1b': engine.phonetic_transform()
+            elif cmd == '1c': engine.acronym_transform()
+            elif cmd == '1d': engine.smart_dict_scan()
+            elif cmd == '1e': engine.jump_1e()
+            elif cmd == '2': engine.reverse_transform()
+            elif cmd == '3': engine.manual_enter_seed()
+            elif cmd in ('4','up','add'): engine.manual_up_add()
+            elif cmd in ('5','down','remove'): engine.manual_down_remove()
+            elif cmd in ('6','lock','commit'): engine._commit_node()
+            elif cmd in ('7','select'): engine.select()
+            elif cmd in ('8','list'): engine.print_list()
+            elif cmd in ('9','tree'): engine.print_tree()
+            elif cmd in ('10','branch'): engine.set_branch()
+            elif cmd in ('11','desc','description'): engine.add_description()
+            elif cmd == 'reset': engine.reset_working()
+            elif cmd == 'goto': engine.goto()
+            elif cmd == 'help': engine.help()
+            else: print("Unknown command.")
     engine.close()
+    profiler.close()
     print("Bye.")
 
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('-m','--metadata', nargs='+', default=['character_transforms.parquet','acronym_transforms.parquet','phonetic_transforms.parquet'])
     ap.add_argument('-s','--seed', default='')
+    ap.add_argument('--profile', nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                    help='Profile every command; pstats and collapsed stacks go to a session directory under DIR')
     args = ap.parse_args()
+    profiler = open_profiler(args.profile)
     interactive_loop(TransformEngine(args.metadata, args.seed))
\ No newline at end of file
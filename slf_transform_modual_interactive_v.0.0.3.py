@@ -23,9 +23,14 @@ from rich.panel import Panel
 from rich.table import Table
 from rich import box
 from time import sleep
+from slf_dedupe import MODES, open_deduper
+from slf_profile import PROFILE_DIR, open_profiler
 
 console = Console()
-previous_outputs = set()
+# Digests of outputs already shown; replaced from the command line in __main__
+dedupe = open_deduper()
+# Per-command profiler; a no-op unless --profile is given
+profiler = open_profiler()
 
 def show_menu():
     menu_table = Table(show_header=False, box=box.ROUNDED, width=60)
@@ -61,9 +66,8 @@ def show_status(engine):
     console.print(Panel(status, title="[bold white]Status[/bold white]", border_style="cyan"))
 
 def print_if_unique(output):
-    if output not in previous_outputs:
+    if not dedupe.seen(output):
         console.print(Panel(output, border_style="blue"))
-        previous_outputs.add(output)
     else:
         console.print("[yellow]Duplicate output skipped.[/yellow]")
 
@@ -775,28 +779,31 @@ def interactive_loop(engine: TransformEngine):
         except (EOFError, KeyboardInterrupt):
             console.print("\n[red]Session ended.[/red]")
             break
+        if cmd in ('q','quit'): break
         last_output = None
-        if cmd == '1a': last_output = engine.symbolic_transform()
-        elif cmd == '1b': last_output = engine.phonetic_transform()
-        elif cmd == '1c': last_output = engine.acronym_transform()
-        elif cmd == '1d': last_output = engine.smart_dict_scan()
-        elif cmd == '1e': last_output = engine.jump_1e()
-        elif cmd == '2': last_output = engine.reverse_transform()
-        elif cmd == '3': last_output = engine.manual_enter_seed()
-        elif cmd in ('4','up','add'): last_output = engine.manual_up_add()
-        elif cmd in ('5','down','remove'): last_output = engine.manual_down_remove()
-        elif cmd in ('7','select'): last_output = engine.select()
-        elif cmd in ('8','list'): last_output = engine.print_list()
-        elif cmd in ('9','tree'): last_output = engine.print_tree()
-        elif cmd in ('10','branch'): last_output = engine.set_branch()
-        elif cmd in ('11','desc','description'): last_output = engine.add_description()
-        elif cmd == 'reset': last_output = engine.reset_working()
-        elif cmd == 'goto': last_output = engine.goto()
-        elif cmd == 'help': last_output = engine.help()
-        elif cmd in ('q','quit'): break
-        else: console.print("[red]Unknown command.[/red]")
+        with profiler.command(cmd, engine.working_seed):
+            if cmd == '1a': last_output = engine.symbolic_transform()
+            elif cmd == '1b': last_output = engine.phonetic_transform()
+            elif cmd == '1c': last_output = engine.acronym_transform()
+            elif cmd == '1d': last_output = engine.smart_dict_scan()
+            elif cmd == '1e': last_output = engine.jump_1e()
+            elif cmd == '2': last_output = engine.reverse_transform()
+            elif cmd == '3': last_output = engine.manual_enter_seed()
+            elif cmd in ('4','up','add'): last_output = engine.manual_up_add()
+            elif cmd in ('5','down','remove'): last_output = engine.manual_down_remove()
+            elif cmd in ('7','select'): last_output = engine.select()
+            elif cmd in ('8','list'): last_output = engine.print_list()
+            elif cmd in ('9','tree'): last_output = engine.print_tree()
+            elif cmd in ('10','branch'): last_output = engine.set_branch()
+            elif cmd in ('11','desc','description'): last_output = engine.add_description()
+            elif cmd == 'reset': last_output = engine.reset_working()
+            elif cmd == 'goto': last_output = engine.goto()
+            elif cmd == 'help': last_output = engine.help()
+            else: console.print("[red]Unknown command.[/red]")
         if last_output: print_if_unique(str(last_output))
     engine.close()
+    dedupe.close()
+    profiler.close()
     console.print("[bold green]Bye.[/bold green]")
     print("Bye.")
 
@@ -805,6 +812,14 @@ if __name__ == '__main__':
     ap.add_argument('-m', '--metadata', nargs='+', default=['character_transforms.parquet', 'acronym_transforms.parquet', 'phonetic_transforms.parquet'])
     ap.add_argument('-s', '--seed', default='')
     ap.add_argument('--author', default=None, help='Author name for logging')
+    ap.add_argument('--dedupe', choices=MODES, default='lru', help='Duplicate-output suppression: exact LRU, approximate Bloom filter, or off')
+    ap.add_argument('--dedupe-size', type=int, default=None, help='Outputs remembered (LRU entries, or Bloom filter capacity)')
+    ap.add_argument('--dedupe-window', type=float, default=None, help='With lru, also forget outputs older than this many seconds')
+    ap.add_argument('--dedupe-file', default=None, help='Persist the dedupe history here so it carries across sessions')
+    ap.add_argument('--profile', nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                    help='Profile every command; pstats and collapsed stacks go to a session directory under DIR')
     args = ap.parse_args()
+    dedupe = open_deduper(args.dedupe, args.dedupe_size, args.dedupe_window, args.dedupe_file)
+    profiler = open_profiler(args.profile)
     engine = TransformEngine(args.metadata, args.seed, args.author)
     interactive_loop(engine)
\ No newline at end of file
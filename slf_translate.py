@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Compiled single-character rewrites for SLF.
+
+A set of one-letter transforms (source -> target, e.g. c->k or a->man) is
+compiled once into a str.translate table, so applying it to a seed, or to a
+whole seed file, runs in C. Targets may be longer than one character;
+str.translate expands them in place.
+
+Usage:
+    python slf_translate.py --methods phonetic --letters cbd seeds.txt > out.txt
+    python slf_translate.py --pick c=k --pick a=man < seeds.txt
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import pandas as pd
+
+BLOCK_SIZE = 1 << 20
+
+
+def compile_table(mapping: dict[str, str]) -> dict[int, str]:
+    """Translation table for {single char: replacement}."""
+    for src in mapping:
+        if len(src) != 1:
+            raise ValueError(f"Only single-character sources can be compiled: {src!r}")
+    return str.maketrans(mapping)
+
+
+def best_mapping(metadata: pd.DataFrame, methods=("symbolic", "phonetic"), letters: str | None = None) -> dict[str, str]:
+    """Highest-weight single-character target per source letter from the metadata rows."""
+    rows = metadata[metadata["method"].isin(methods) & (metadata["source"].str.len() == 1)]
+    if letters:
+        rows = rows[rows["source"].isin(list(letters))]
+    rows = rows.sort_values("weight", ascending=False, kind="stable").drop_duplicates("source")
+    return dict(zip(rows["source"], rows["target"]))
+
+
+class Rewriter:
+    """A compiled mapping set applied to single seeds or whole streams."""
+
+    def __init__(self, mapping: dict[str, str]):
+        self.mapping = dict(mapping)
+        self.table = compile_table(self.mapping)
+
+    def apply(self, seed: str) -> str:
+        return seed.translate(self.table)
+
+    def apply_stream(self, src, dst, block_size: int = BLOCK_SIZE) -> int:
+        """Translate src into dst block by block; returns characters read.
+
+        Sources are single characters and never newlines, so block
+        boundaries cannot split a match.
+        """
+        total = 0
+        for block in iter(lambda: src.read(block_size), ""):
+            dst.write(block.translate(self.table))
+            total += len(block)
+        return total
+
+
+def parse_picks(picks: list[str]) -> dict[str, str]:
+    mapping = {}
+    for p in picks:
+        src, sep, tgt = p.partition("=")
+        if not sep or len(src) != 1:
+            raise SystemExit(f"Invalid --pick '{p}', expected x=target")
+        mapping[src.lower()] = tgt.lower()
+    return mapping
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description="Apply compiled one-letter transforms to a seed file.")
+    ap.add_argument('input', nargs='?', help='Seed file (default: stdin)')
+    ap.add_argument('-o', '--output', help='Output file (default: stdout)')
+    ap.add_argument('-m', '--metadata', nargs='+', default=['character_transforms.parquet', 'phonetic_transforms.parquet'])
+    ap.add_argument('--methods', nargs='+', default=['symbolic', 'phonetic'])
+    ap.add_argument('--letters', default=None, help='Only rewrite these source letters')
+    ap.add_argument('--pick', action='append', default=[], help='Explicit mapping x=target (overrides metadata)')
+    args = ap.parse_args()
+
+    mapping = {}
+    if not args.pick or args.letters:
+        from slf_transform_combined import load_metadata
+        mapping = best_mapping(load_metadata(args.metadata), tuple(args.methods), args.letters)
+    mapping.update(parse_picks(args.pick))
+    if not mapping:
+        raise SystemExit("No single-character transforms selected.")
+
+    rw = Rewriter(mapping)
+    src = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    dst = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        rw.apply_stream(src, dst)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
@@ -0,0 +1,112 @@
+"""
+Streaming tree renderer for the SLF node log.
+
+render_tree() walks the tree with an explicit stack instead of recursion,
+so chains thousands of commits deep render fine, and it is a generator
+that fetches children only when it reaches them: output stops, and work
+stops, as soon as the depth or node limit is hit or the pager is closed.
+
+Linear chains (nodes with exactly one child) are collapsed to their first
+and last node plus a count of the steps in between, and do not add
+indentation. Each node is expanded at most once, so self-parented nodes and
+parent cycles in a damaged log cannot make the walk loop.
+"""
+
+from __future__ import annotations
+import os
+import shlex
+import subprocess
+import sys
+
+DEFAULT_LIMIT = 500
+
+
+def node_line(n: dict) -> str:
+    return f"{n['id'][-2:]}: {n['source']} → {n['target']} [{n.get('branch','')}] ({n.get('description','')})"
+
+
+def render_tree(roots, children, max_depth: int | None = None, branch: str | None = None,
+                collapse: bool = True, limit: int | None = DEFAULT_LIMIT):
+    """Yield tree lines for roots.
+
+    children(node_id) returns the child nodes of a node; it is only called
+    for nodes that are about to be expanded.
+    """
+    def kids(n):
+        out = [c for c in children(n["id"]) if c["id"] not in visited]
+        return [c for c in out if c.get("branch") == branch] if branch else out
+
+    shown = 0
+    # Logs can hold self-parented nodes and parent cycles; each node is expanded once
+    visited = set()
+    # Stack of (node, indent depth, generations below the roots); pushed in
+    # reverse so siblings print in order. max_depth counts generations, so a
+    # collapsed chain uses up depth even though it adds no indentation.
+    stack = [(n, 0, 0) for n in reversed(list(roots))]
+    while stack:
+        n, depth, level = stack.pop()
+        if n["id"] in visited:
+            continue
+        if limit is not None and shown >= limit:
+            yield f"... node limit {limit} reached"
+            return
+        visited.add(n["id"])
+        pad = "  " * depth
+        yield pad + node_line(n)
+        shown += 1
+        below = kids(n)
+        # Walk a chain no further than the remaining depth and node budget allow
+        steps = float("inf")
+        if max_depth is not None:
+            steps = max_depth - level - 1
+        if limit is not None:
+            steps = min(steps, limit - shown)
+        if collapse and len(below) == 1 and steps >= 2:
+            skipped, last = 0, below[0]
+            chain = {n["id"], last["id"]}
+            nxt = kids(last)
+            while len(nxt) == 1 and skipped < steps and nxt[0]["id"] not in chain:
+                skipped += 1
+                last = nxt[0]
+                chain.add(last["id"])
+                nxt = kids(last)
+            if skipped >= 2:
+                # The chain end takes the chain's place at this depth
+                yield pad + f"  ⋮ {skipped} linear steps"
+                yield pad + node_line(last)
+                shown += 1
+                visited |= chain
+                below = [c for c in nxt if c["id"] not in visited]
+                level += skipped + 1
+        if not below:
+            continue
+        if max_depth is not None and level >= max_depth:
+            yield pad + f"  + {len(below)} more"
+            continue
+        stack.extend((c, depth + 1, level + 1) for c in reversed(below))
+
+
+def page(lines, out=None):
+    """Write lines through $PAGER when attached to a terminal, else to out/stdout.
+
+    Lines are streamed; quitting the pager stops consuming the generator.
+    """
+    out = out or sys.stdout
+    cmd = os.environ.get("PAGER", "less -FRX")
+    if out is not sys.stdout or not out.isatty() or not cmd:
+        for line in lines:
+            print(line, file=out)
+        return
+    try:
+        proc = subprocess.Popen(shlex.split(cmd), stdin=subprocess.PIPE, text=True)
+    except OSError:
+        for line in lines:
+            print(line, file=out)
+        return
+    try:
+        for line in lines:
+            proc.stdin.write(line + "\n")
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass
+    proc.wait()
@@ -0,0 +1,327 @@
+"""
+Full-screen terminal interface for the SLF engine.
+
+One prompt_toolkit Application with fixed regions:
+
+    status    working / up / down seeds, embedded words, node, step, branch
+    menu      command keys
+    results   everything commands print (scrollable, last RESULT_LINES kept)
+    log       logging records (metadata reloads, warnings)
+    input     the command line, which also answers a command's own prompts
+
+prompt_toolkit redraws by diffing against the previous screen, so only
+the cells that changed are written to the terminal; there is no clear
+screen and no subprocess per command. The status fragments are rebuilt
+only when the engine state they show changes.
+
+Commands are the same ones interactive_loop dispatches. Each runs on a
+worker thread with stdout routed into the results region and the engine
+module's prompt()/input() routed to the input line, so the engine's
+pick-a-number flows work unchanged.
+
+Usage:
+    python slf_transform_combined.py --tui
+"""
+
+from __future__ import annotations
+import builtins
+import contextlib
+import io
+import logging
+import queue
+import sys
+import threading
+from prompt_toolkit.application import Application
+from prompt_toolkit.document import Document
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import HSplit, Layout, VSplit, Window
+from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.layout.dimension import Dimension
+from prompt_toolkit.widgets import Frame, TextArea
+
+logger = logging.getLogger("SLF-TUI")
+
+RESULT_LINES = 5000
+LOG_LINES = 500
+LOG_HEIGHT = 6
+
+MENU = (
+    ("1a", "symbolic"), ("1b", "phonetic"), ("1c", "acronym"), ("1d", "dictionary"), ("1e", "jump"),
+    ("2", "reverse"), ("3", "new seed"), ("4", "up add"), ("5", "down remove"), ("6", "lock"),
+    ("7", "select"), ("8", "list"), ("9", "tree"), ("10", "branch"), ("11", "description"),
+    ("12", "decode"), ("13", "ancestors"), ("14", "subtree"), ("15", "sounds"), ("16", "backward"),
+    ("undo", "undo"), ("redo", "redo"), ("reset", "reset"), ("goto", "goto node"), ("help", "help"),
+    ("q", "quit"),
+)
+
+
+class _PaneWriter(io.TextIOBase):
+    """File-like sink that appends to a read-only TextArea from any thread."""
+
+    def __init__(self, app: "SLFApp", area: TextArea, max_lines: int):
+        self.app = app
+        self.area = area
+        self.max_lines = max_lines
+        self._pending: list[str] = []
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, s: str) -> int:
+        with self._lock:
+            self._pending.append(s)
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            self.app.call_soon(self._flush)
+        return len(s)
+
+    def _flush(self):
+        with self._lock:
+            chunk = "".join(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+        if not chunk:
+            return
+        text = self.area.text + chunk
+        lines = text.count("\n")
+        if lines > self.max_lines:
+            cut = 0
+            for _ in range(lines - self.max_lines):
+                cut = text.index("\n", cut) + 1
+            text = text[cut:]
+        self.area.buffer.set_document(Document(text, len(text)), bypass_readonly=True)
+        self.app.invalidate()
+
+
+class _PaneHandler(logging.Handler):
+    def __init__(self, writer: _PaneWriter):
+        super().__init__()
+        self.writer = writer
+        self.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s", "%H:%M:%S"))
+
+    def emit(self, record):
+        try:
+            self.writer.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class SLFApp:
+    def __init__(self, engine):
+        self.engine = engine
+        # The engine's own module: its dispatch table and the prompt() its methods call
+        self.module = sys.modules[type(engine).__module__]
+        self.answers: queue.Queue = queue.Queue()
+        self.asking: str | None = None
+        self.running: str | None = None
+        self.worker: threading.Thread | None = None
+        self._status_key = None
+        self._status_text: list[tuple[str, str]] = []
+
+        self.results = TextArea(read_only=True, scrollbar=True, focusable=False, wrap_lines=False)
+        self.log = TextArea(read_only=True, focusable=False, height=LOG_HEIGHT)
+        self.input = TextArea(height=1, multiline=False, prompt=self._prompt_text, accept_handler=self._accept)
+        status = Window(FormattedTextControl(self._status), height=Dimension.exact(3), wrap_lines=True)
+        menu = Window(FormattedTextControl(self._menu_text()), width=Dimension.exact(22))
+
+        root = HSplit([
+            Frame(status, title="SLF"),
+            VSplit([Frame(menu, title="Commands"), Frame(self.results, title="Results")]),
+            Frame(self.log, title="Log"),
+            self.input,
+        ])
+        self.app = Application(layout=Layout(root, focused_element=self.input), key_bindings=self._bindings(),
+                               full_screen=True, mouse_support=False)
+        self.out = _PaneWriter(self, self.results, RESULT_LINES)
+        self.log_out = _PaneWriter(self, self.log, LOG_LINES)
+
+    # --- thread-safe redraw ---
+    def call_soon(self, fn):
+        loop = self.app.loop
+        if loop is None:
+            fn()
+        else:
+            loop.call_soon_threadsafe(fn)
+
+    def invalidate(self):
+        self.app.invalidate()
+
+    # --- regions ---
+    def _status(self):
+        if self.running and self._status_text:
+            # The command thread owns the engine until it finishes; reading the seed here could
+            # cache a half-edited SeedBuffer, so keep the last status and only mark the command
+            return self._status_text[:-1] + [("fg:ansired", f"   running {self.running}")]
+        e = self.engine
+        key = (e.working_seed, e.up_seed, e.down_seed, e.current_node_id, e.step, e.branch, self.running, id(e.meta))
+        if key != self._status_key:
+            found = e.embedded_words()
+            shown = self.module.FOUND_SHOWN
+            self._status_text = [
+                ("bold", " Work "), ("fg:ansiyellow bold", e.working_seed or "-"),
+                ("bold", "   Up "), ("fg:ansiblue", e.up_seed or "-"),
+                ("bold", "   Down "), ("fg:ansimagenta", e.down_seed or "-"),
+                ("", "\n"),
+                ("bold", " Found "), ("fg:ansigreen", ", ".join(found[:shown]) + (" ..." if len(found) > shown else "")),
+                ("", "\n"),
+                ("bold", " Node "), ("", str(e.current_node_id)),
+                ("bold", "   Step "), ("", str(e.step)),
+                ("bold", "   Branch "), ("", str(e.branch)),
+                ("fg:ansired", f"   running {self.running}" if self.running else ""),
+            ]
+            self._status_key = key
+        return self._status_text
+
+    @staticmethod
+    def _menu_text():
+        frags = []
+        for keys, label in MENU:
+            frags += [("fg:ansicyan bold", f" {keys:<6}"), ("", f"{label}\n")]
+        return frags
+
+    def _prompt_text(self):
+        if self.asking is not None:
+            return [("fg:ansiyellow", self.asking or "> ")]
+        if self.running:
+            return [("fg:ansired", f"[{self.running}] ")]
+        return [("fg:ansicyan bold", "slf> ")]
+
+    def _bindings(self) -> KeyBindings:
+        kb = KeyBindings()
+
+        @kb.add("c-c")
+        def _(event):
+            if self.running:
+                # A command is in flight: cancel its pick if it is waiting on one, never quit
+                if self.asking is not None:
+                    self.answers.put(KeyboardInterrupt)
+            elif self.input.text:
+                self.input.text = ""
+            else:
+                self._quit()
+
+        @kb.add("c-d")
+        @kb.add("c-q")
+        def _(event):
+            self._quit()
+
+        @kb.add("pageup")
+        def _(event):
+            self._scroll(-1)
+
+        @kb.add("pagedown")
+        def _(event):
+            self._scroll(1)
+
+        return kb
+
+    def _scroll(self, direction: int):
+        info = self.results.window.render_info
+        rows = max(1, (info.window_height if info else 20) - 1)
+        buf = self.results.buffer
+        doc = buf.document
+        delta = doc.get_cursor_down_position(count=rows) if direction > 0 else doc.get_cursor_up_position(count=rows)
+        buf.cursor_position += delta
+
+    # --- input and commands ---
+    def _accept(self, buff) -> bool:
+        text = buff.text
+        if self.asking is not None:
+            self.out.write(f"{self.asking}{text}\n")
+            self.answers.put(text)
+            return False
+        cmd = text.strip().lower()
+        if not cmd:
+            return False
+        if self.running:
+            self.out.write(f"Busy with '{self.running}'.\n")
+            return False
+        if cmd in self.module.QUIT:
+            self._quit()
+            return False
+        self.out.write(f"\n> {cmd}\n")
+        self.running = cmd
+        self.worker = threading.Thread(target=self._run, args=(cmd,), daemon=True, name=f"slf-cmd-{cmd}")
+        self.worker.start()
+        return False
+
+    def _ask(self, message="", completer=None, complete_while_typing=False, **kwargs) -> str:
+        # Runs on the command thread: show the question, then wait for the next Enter
+        self.asking = str(message)
+        self.call_soon(lambda: self._set_completer(completer, complete_while_typing))
+        answer = self.answers.get()
+        self.asking = None
+        self.call_soon(lambda: self._set_completer(None, False))
+        if answer in (KeyboardInterrupt, EOFError):
+            raise answer()
+        return answer
+
+    def _set_completer(self, completer, complete_while_typing: bool):
+        # Input widget state belongs to the UI loop; _ask hands changes over with call_soon
+        self.input.completer = completer
+        self.input.complete_while_typing = complete_while_typing
+        self.invalidate()
+
+    @contextlib.contextmanager
+    def _routed_io(self):
+        saved_prompt, saved_input = getattr(self.module, "prompt", None), builtins.input
+        self.module.prompt = self._ask
+        builtins.input = self._ask
+        try:
+            with contextlib.redirect_stdout(self.out):
+                yield
+        finally:
+            self.module.prompt = saved_prompt
+            builtins.input = saved_input
+
+    def _run(self, cmd: str):
+        try:
+            with self._routed_io():
+                try:
+                    if not self.module.dispatch(self.engine, cmd):
+                        print("Unknown command.")
+                except (KeyboardInterrupt, EOFError):
+                    print("Cancelled.")
+                self.engine.checkpoint()
+        except Exception as e:
+            logger.exception(f"Command '{cmd}' failed: {e}")
+        finally:
+            self.running = None
+            self.call_soon(self.invalidate)
+
+    def _quit(self):
+        if self.running:
+            # The command still writes to the log and database; closing them under it would lose the step
+            if self.asking is not None:
+                self.answers.put(EOFError)
+            self.out.write(f"Busy with '{self.running}'; quit again when it has finished.\n")
+            return
+        self.app.exit()
+
+    def join(self):
+        if self.worker is not None:
+            self.worker.join()
+
+    def run(self):
+        root = logging.getLogger()
+        saved = root.handlers[:]
+        # Anything written to the terminal behind the layout's back would corrupt the screen
+        root.handlers = [_PaneHandler(self.log_out)]
+        try:
+            self.app.run()
+        finally:
+            root.handlers = saved
+
+
+def run_tui(engine):
+    app = SLFApp(engine)
+    app.run()
+    app.join()
+    engine.close()
+    print("Bye.")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compiled, memory-mapped wordlists for SLF.
+
+Parsing a wordlist (strip, lowercase, dedupe, sort) is done once and the
+result saved next to the source as <name>.slfw:
+
+    header        magic, version, word count, blob size, longest word,
+                  size and mtime of the source text it was built from
+    offsets       uint32[count + 1]   start of each word in the blob
+    first_byte    uint32[257]         id range of words by first UTF-8 byte
+    len_starts    uint32[max_len + 2] range of by_length for each length
+    by_length     uint32[count]       word ids ordered by length
+    blob          sorted words, each followed by '\\n'
+
+The file is opened with mmap, so every process using the same wordlist
+shares one copy of the pages and opening it costs no parsing. The artifact
+is rebuilt whenever the source's size or mtime no longer match the header.
+
+CompiledWordlist is a read-only Sequence[str] in the same sorted order as
+the old list, so the dictionary and anagram indexes accept it unchanged.
+
+Usage:
+    python slf_wordlist.py wordlist.txt            # (re)build and report
+    python slf_wordlist.py wordlist.txt --prefix ab
+"""
+
+from __future__ import annotations
+import argparse
+import bisect
+import logging
+import mmap
+import os
+import pathlib
+import struct
+from collections.abc import Sequence
+import numpy as np
+
+logger = logging.getLogger("SLF-Wordlist")
+
+MAGIC = b"SLFWORDS"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIIqq")
+SUFFIX = ".slfw"
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def compile_words(lines, src_size: int = 0, src_mtime_ns: int = 0) -> bytes:
+    words = sorted({w.strip().lower() for w in lines if w.strip()})
+    encoded = [w.encode("utf-8") + b"\n" for w in words]
+    offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    firsts = np.fromiter((e[0] for e in encoded), dtype=np.uint32, count=len(encoded))
+    first_byte = np.searchsorted(firsts, np.arange(257), side="left").astype(np.uint32)
+    lengths = np.fromiter((len(w) for w in words), dtype=np.uint32, count=len(words))
+    max_len = int(lengths.max()) if len(words) else 0
+    by_length = np.argsort(lengths, kind="stable").astype(np.uint32)
+    len_starts = np.searchsorted(lengths[by_length], np.arange(max_len + 2), side="left").astype(np.uint32)
+    blob = b"".join(encoded)
+
+    parts = [HEADER.pack(MAGIC, VERSION, len(words), len(blob), max_len, src_size, src_mtime_ns)]
+    for arr in (offsets, first_byte, len_starts, by_length):
+        parts.append(b"\0" * (_align(sum(map(len, parts))) - sum(map(len, parts))))
+        parts.append(arr.tobytes())
+    parts.append(blob)
+    return b"".join(parts)
+
+
+class CompiledWordlist(Sequence):
+    def __init__(self, buf, path: pathlib.Path | None = None):
+        self.path = path
+        self._buf = buf
+        magic, version, count, blob_len, max_len, self.src_size, self.src_mtime_ns = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a compiled wordlist (version {VERSION})")
+        pos = HEADER.size
+
+        def take(n: int) -> np.ndarray:
+            nonlocal pos
+            pos = _align(pos)
+            arr = np.frombuffer(buf, dtype=np.uint32, count=n, offset=pos)
+            pos += 4 * n
+            return arr
+
+        self.offsets = take(count + 1)
+        self.first_byte = take(257)
+        self.len_starts = take(max_len + 2)
+        self.by_length = take(count)
+        self.blob = memoryview(buf)[pos:pos + blob_len]
+        self.count = count
+        self.max_len = max_len
+
+    @classmethod
+    def open(cls, path: str | pathlib.Path) -> "CompiledWordlist":
+        path = pathlib.Path(path)
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"{path} is empty")
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf, path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        return str(self.blob[int(self.offsets[i]):int(self.offsets[i + 1]) - 1], "utf-8")
+
+    def __iter__(self):
+        # One decode of the whole blob is far cheaper than count slices
+        if self.count:
+            yield from str(self.blob[:-1], "utf-8").split("\n")
+
+    def __contains__(self, word) -> bool:
+        i = bisect.bisect_left(self, word, *self._bucket(word))
+        return i < self.count and self[i] == word
+
+    def _bucket(self, prefix: str) -> tuple[int, int]:
+        if not prefix:
+            return 0, self.count
+        b = prefix.encode("utf-8")[0]
+        return int(self.first_byte[b]), int(self.first_byte[b + 1])
+
+    def prefix_range(self, prefix: str) -> range:
+        """Ids of the words starting with prefix (a contiguous range, since words are sorted)."""
+        lo, hi = self._bucket(prefix)
+        if not prefix:
+            return range(lo, hi)
+        start = bisect.bisect_left(self, prefix, lo, hi)
+        end = bisect.bisect_left(self, prefix[:-1] + chr(ord(prefix[-1]) + 1), start, hi)
+        return range(start, end)
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        return [self[i] for i in self.prefix_range(prefix)]
+
+    def ids_of_length(self, n: int) -> np.ndarray:
+        if not 0 <= n <= self.max_len:
+            return self.by_length[:0]
+        return self.by_length[self.len_starts[n]:self.len_starts[n + 1]]
+
+    def with_length(self, n: int) -> list[str]:
+        return [self[int(i)] for i in self.ids_of_length(n)]
+
+
+def artifact_path(src: str | pathlib.Path) -> pathlib.Path:
+    src = pathlib.Path(src)
+    return src.with_name(src.name + SUFFIX)
+
+
+def _is_current(art: pathlib.Path, st: os.stat_result) -> bool:
+    try:
+        with art.open("rb") as f:
+            head = f.read(HEADER.size)
+        magic, version, _, _, _, size, mtime_ns = HEADER.unpack(head)
+    except (OSError, struct.error):
+        return False
+    return magic == MAGIC and version == VERSION and size == st.st_size and mtime_ns == st.st_mtime_ns
+
+
+def open_wordlist(src: str | pathlib.Path) -> CompiledWordlist:
+    """Memory-mapped compiled form of src, rebuilding the artifact if src changed."""
+    src = pathlib.Path(src)
+    st = src.stat()
+    art = artifact_path(src)
+    if _is_current(art, st):
+        return CompiledWordlist.open(art)
+    data = compile_words(src.read_text(encoding="utf-8").splitlines(), st.st_size, st.st_mtime_ns)
+    tmp = art.with_name(f"{art.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, art)
+    except OSError as e:
+        # Read-only location: still usable, just not shared or cached
+        logger.warning(f"Cannot write {art}: {e}; using an in-memory wordlist.")
+        tmp.unlink(missing_ok=True)
+        return CompiledWordlist(data)
+    logger.info(f"Compiled {src} -> {art}")
+    return CompiledWordlist.open(art)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Compile a wordlist into a memory-mapped artifact.")
+    ap.add_argument('source', help='Wordlist text file, one word per line')
+    ap.add_argument('--prefix', help='Print the words starting with this prefix')
+    ap.add_argument('--length', type=int, help='Print the words of this length')
+    args = ap.parse_args()
+    wl = open_wordlist(args.source)
+    if args.prefix is not None:
+        print("\n".join(wl.with_prefix(args.prefix.lower())))
+    elif args.length is not None:
+        print("\n".join(wl.with_length(args.length)))
+    else:
+        print(f"{len(wl)} words, longest {wl.max_len}, artifact {artifact_path(args.source)}")